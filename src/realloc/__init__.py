@@ -1,9 +1,13 @@
 from .accounts import Account
 from .allocator import PortfolioAllocator
+from .frame import LabeledMatrix
+from .drift import DriftBand, DriftReport, DriftScanner
 from .models import PortfolioModel
-from .portfolio import PortfolioStateManager
+from .portfolio import NegativePositionError, PortfolioStateManager
+from .array_state import ArrayPortfolioStateManager
 from .trades import (
     Trade,
+    TradeBuffer,
     TradeInfo,
     ScaledPortfolio,
     buy_position,
@@ -17,14 +21,23 @@ from .trades import (
 from .selectors import (
     select_account_for_buy_trade,
     select_account_for_sell_trade,
+    select_accounts_for_trades,
     TaxAwareSelector,
 )
 
 __all__ = [
     "Account",
     "PortfolioModel",
+    "PortfolioAllocator",
+    "LabeledMatrix",
+    "DriftBand",
+    "DriftReport",
+    "DriftScanner",
     "PortfolioStateManager",
+    "ArrayPortfolioStateManager",
+    "NegativePositionError",
     "Trade",
+    "TradeBuffer",
     "ScaledPortfolio",
     "buy_position",
     "calculate_buy_amounts",
@@ -34,6 +47,7 @@ __all__ = [
     "split_trades",
     "select_account_for_buy_trade",
     "select_account_for_sell_trade",
+    "select_accounts_for_trades",
     "is_trade_remaining",
     "TaxAwareSelector",
 ]
@@ -1,9 +1,20 @@
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict, Sequence
+
+import numpy as np
 
 from realloc.trades import compute_portfolio_trades, split_trades
 
 
 class Account:
+    __slots__ = (
+        "label",
+        "account_number",
+        "cash",
+        "positions",
+        "enforce_no_negative_positions",
+        "minimum_trade_value",
+    )
+
     def __init__(
         self,
         label: str,
@@ -11,12 +22,14 @@ class Account:
         cash: float,
         positions: Dict[str, float],
         enforce_no_negative_positions: bool = False,
+        minimum_trade_value: Optional[float] = None,
     ):
         self.label = label
         self.account_number = account_number
         self.cash = cash
         self.positions = positions
         self.enforce_no_negative_positions = enforce_no_negative_positions
+        self.minimum_trade_value = minimum_trade_value
 
         if self.enforce_no_negative_positions:
             for symbol, amount in self.positions.items():
@@ -31,10 +44,91 @@ class Account:
             "label": self.label,
             "account_number": self.account_number,
             "cash": self.cash,
-            "positions": self.positions,
+            "positions": dict(self.positions),
             "enforce_no_negative_positions": self.enforce_no_negative_positions,
         }
 
+    @classmethod
+    def from_columns(
+        cls,
+        account_numbers: Sequence[str],
+        cash: Sequence[float],
+        labels: Optional[Sequence[str]] = None,
+        position_accounts: Optional[Sequence[int]] = None,
+        symbols: Optional[Sequence[str]] = None,
+        shares: Optional[Sequence[float]] = None,
+        enforce_no_negative_positions: bool = False,
+        minimum_trade_value: Optional[float] = None,
+    ) -> List["Account"]:
+        """
+        Build many accounts from columnar data.
+
+        Account-level values are given one per account. Positions are given
+        in long form, one row per position, with ``position_accounts`` holding
+        the index of the owning account. Validation runs once over whole
+        arrays instead of per position, and instances are filled in directly
+        without going through ``__init__``.
+
+        Args:
+            account_numbers: Account number per account
+            cash: Cash per account
+            labels: Label per account (default: the account number)
+            position_accounts: Owning account index per position
+            symbols: Symbol per position
+            shares: Share quantity per position
+            enforce_no_negative_positions: Applied to every account
+            minimum_trade_value: Applied to every account
+
+        Returns:
+            List of accounts in the order of ``account_numbers``
+
+        Raises:
+            ValueError: If column lengths differ, a position refers to an
+                unknown account, or a position is negative while enforced
+        """
+        account_numbers = list(account_numbers)
+        cash = np.asarray(cash, dtype=np.float64)
+        labels = account_numbers if labels is None else list(labels)
+        if not len(account_numbers) == len(cash) == len(labels):
+            raise ValueError("account_numbers, cash and labels must have the same length")
+
+        owners = np.asarray(
+            position_accounts if position_accounts is not None else [], dtype=np.int64
+        )
+        symbols = list(symbols) if symbols is not None else []
+        share_values = np.asarray(shares if shares is not None else [], dtype=np.float64)
+        if not len(owners) == len(symbols) == len(share_values):
+            raise ValueError("position_accounts, symbols and shares must have the same length")
+        if len(owners) and (owners.min() < 0 or owners.max() >= len(account_numbers)):
+            raise ValueError("position_accounts contains an index outside the accounts")
+        if enforce_no_negative_positions:
+            negative = np.flatnonzero(share_values < 0)
+            if len(negative):
+                row = negative[0]
+                raise ValueError(
+                    f"Negative position for {symbols[row]} not allowed in account "
+                    f"{account_numbers[owners[row]]}"
+                )
+
+        positions: List[Dict[str, Any]] = [{} for _ in account_numbers]
+        share_list = shares.tolist() if hasattr(shares, "tolist") else list(shares or [])
+        for owner, symbol, qty in zip(owners.tolist(), symbols, share_list):
+            positions[owner][symbol] = qty
+
+        accounts = []
+        for label, account_number, account_cash, account_positions in zip(
+                labels, account_numbers, cash.tolist(), positions
+        ):
+            account = cls.__new__(cls)
+            account.label = label
+            account.account_number = account_number
+            account.cash = account_cash
+            account.positions = account_positions
+            account.enforce_no_negative_positions = enforce_no_negative_positions
+            account.minimum_trade_value = minimum_trade_value
+            accounts.append(account)
+        return accounts
+
     @classmethod
     def from_dict(cls, data: Dict) -> "Account":
         return cls(
@@ -1,7 +1,13 @@
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
 from realloc.accounts import Account
+from realloc.frame import LabeledMatrix
 from realloc.models import PortfolioModel
 
+CASH_SYMBOL = "CASH"
+
 
 class PortfolioAllocator:
     def __init__(
@@ -13,10 +19,12 @@ class PortfolioAllocator:
     ):
         self.accounts = accounts
         self.model = model
-        self.prices = prices
+        self.prices = dict(prices)
         self.selector = selector
         self._account_values: Optional[Dict[str, float]] = None
         self._total_portfolio_value: Optional[float] = None
+        self._arrays: Optional[Dict[str, np.ndarray]] = None
+        self._holders: Optional[Dict[str, np.ndarray]] = None
 
     def compute_account_values(self) -> Dict[str, float]:
         """
@@ -32,6 +40,66 @@ class PortfolioAllocator:
             }
         return self._account_values
 
+    def _holder_index(self) -> Dict[str, np.ndarray]:
+        """Symbol -> positions in ``self.accounts`` of the accounts holding it."""
+        if self._holders is None:
+            holders: Dict[str, List[int]] = {}
+            for i, acc in enumerate(self.accounts):
+                for sym in acc.positions:
+                    holders.setdefault(sym, []).append(i)
+            self._holders = {
+                sym: np.array(rows, dtype=np.intp) for sym, rows in holders.items()
+            }
+        return self._holders
+
+    def update_prices(self, delta_prices: Dict[str, float]) -> None:
+        """
+        Apply a batch of price changes and revalue only the affected accounts.
+
+        Cached account values, the total portfolio value and the matrix
+        arrays are adjusted in place for the accounts holding the changed
+        symbols; nothing is recomputed for anyone else.
+
+        Args:
+            delta_prices: Dictionary mapping changed symbols to their new prices
+
+        Raises:
+            ValueError: If any price is not positive
+        """
+        if any(price <= 0 for price in delta_prices.values()):
+            raise ValueError("All prices must be positive")
+
+        holders = self._holder_index()
+        account_values = self._account_values
+        arrays = self._arrays
+        columns = {}
+        if arrays is not None:
+            columns = {sym: j for j, sym in enumerate(arrays["symbols"])}
+
+        for symbol, price in delta_prices.items():
+            # While values are cached every held symbol has a price
+            change = price - self.prices.get(symbol, 0.0)
+            self.prices[symbol] = price
+            rows = holders.get(symbol)
+
+            if account_values is not None and rows is not None:
+                total_change = 0.0
+                for i in rows.tolist():
+                    acc = self.accounts[i]
+                    value_change = acc.positions[symbol] * change
+                    account_values[acc.account_number] += value_change
+                    total_change += value_change
+                if self._total_portfolio_value is not None:
+                    self._total_portfolio_value += total_change
+
+            j = columns.get(symbol)
+            if j is not None:
+                arrays["prices"][j] = price
+                if rows is not None:
+                    value_change = arrays["positions"][rows, j] * change
+                    arrays["market_values"][rows, j] += value_change
+                    arrays["account_values"][rows] += value_change
+
     @property
     def total_portfolio_value(self) -> float:
         """Get the total value of all accounts combined."""
@@ -67,12 +135,20 @@ class PortfolioAllocator:
         """
         Compute target percentage allocations for each account.
         Returns dict of account_id -> {symbol: target_weight}
+
+        Each account gets its own dict; use ``shared_target_allocations``
+        to avoid the per-account copies.
+        """
+        normalized = self.model.normalized
+        return {acc.account_number: dict(normalized) for acc in self.accounts}
+
+    def shared_target_allocations(self) -> Dict[str, Mapping[str, float]]:
+        """
+        Like ``compute_target_allocations``, but every account maps to the
+        model's read-only normalized weights instead of its own copy.
         """
-        normalized = self.model.normalize()
-        return {
-            acc.account_number: {sym: weight for sym, weight in normalized.items()}
-            for acc in self.accounts
-        }
+        normalized = self.model.normalized
+        return {acc.account_number: normalized for acc in self.accounts}
 
     def compute_target_positions(self) -> Dict[str, Dict[str, float]]:
         """
@@ -80,7 +156,7 @@ class PortfolioAllocator:
         Returns dict of account_id -> {symbol: target_shares}
         """
         account_values = self.compute_account_values()
-        normalized = self.model.normalize()
+        normalized = self.model.normalized
 
         target_positions = {}
         for acc in self.accounts:
@@ -98,7 +174,7 @@ class PortfolioAllocator:
         Returns dict of account_id -> {symbol: (current_weight, target_weight)}
         """
         current = self.get_current_allocations()
-        target = self.compute_target_allocations()
+        target = self.shared_target_allocations()
 
         differences = {}
         for acc_id in current:
@@ -112,4 +188,117 @@ class PortfolioAllocator:
 
     def get_account_positions(self) -> Dict[str, Dict[str, float]]:
         """Get current positions for each account."""
-        return {acc.account_number: acc.positions for acc in self.accounts}
\ No newline at end of file
+        return {acc.account_number: acc.positions for acc in self.accounts}
+
+    # Matrix API
+
+    def _symbol_axis(self) -> Tuple[str, ...]:
+        """Model symbols, then other held symbols in first-seen order, then CASH."""
+        symbols = dict.fromkeys(self.model.normalized)
+        for acc in self.accounts:
+            symbols.update(dict.fromkeys(acc.positions))
+        symbols.pop(CASH_SYMBOL, None)
+        return tuple(symbols) + (CASH_SYMBOL,)
+
+    def _matrix_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Build (once) the dense arrays behind the matrix methods.
+
+        ``positions`` and ``market_values`` are accounts x symbols over the
+        symbol axis, with the CASH column holding cash.
+        """
+        if self._arrays is None:
+            symbols = self._symbol_axis()
+            column = {sym: j for j, sym in enumerate(symbols)}
+            cash_col = len(symbols) - 1
+
+            positions = np.zeros((len(self.accounts), len(symbols)), dtype=np.float64)
+            for i, acc in enumerate(self.accounts):
+                for sym, qty in acc.positions.items():
+                    if sym not in self.prices:
+                        raise KeyError(sym)
+                    positions[i, column[sym]] = qty
+                positions[i, cash_col] = acc.cash
+
+            # Unpriced columns can only be model symbols nobody holds
+            prices = np.array(
+                [self.prices.get(sym, np.nan) for sym in symbols[:cash_col]] + [1.0],
+                dtype=np.float64,
+            )
+
+            market_values = positions * np.nan_to_num(prices)
+            self._arrays = {
+                "accounts": tuple(acc.account_number for acc in self.accounts),
+                "symbols": symbols,
+                "positions": positions,
+                "prices": prices,
+                "market_values": market_values,
+                "account_values": market_values.sum(axis=1),
+            }
+        return self._arrays
+
+    def _model_columns(self, symbols: Tuple[str, ...]) -> Tuple[np.ndarray, np.ndarray]:
+        """Column of each model symbol on ``symbols`` and its normalized weight."""
+        column = {sym: j for j, sym in enumerate(symbols)}
+        model_symbols, model_weights = self.model.normalized_array()
+        columns = np.array([column[sym] for sym in model_symbols], dtype=np.intp)
+        return columns, model_weights
+
+    def _target_weight_row(self, symbols: Tuple[str, ...]) -> np.ndarray:
+        columns, model_weights = self._model_columns(symbols)
+        weights = np.zeros(len(symbols), dtype=np.float64)
+        weights[columns] = model_weights
+        return weights
+
+    def current_allocations_matrix(self) -> LabeledMatrix:
+        """
+        Matrix form of ``get_current_allocations``.
+
+        Accounts with zero value get a row of zeros.
+        """
+        arrays = self._matrix_arrays()
+        account_values = arrays["account_values"][:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weights = np.where(account_values != 0, arrays["market_values"] / account_values, 0.0)
+        return LabeledMatrix(weights, arrays["accounts"], arrays["symbols"])
+
+    def target_allocations_matrix(self) -> LabeledMatrix:
+        """
+        Matrix form of ``compute_target_allocations``.
+
+        Every row is the same read-only view of the model weights.
+        """
+        arrays = self._matrix_arrays()
+        weights = self._target_weight_row(arrays["symbols"])
+        return LabeledMatrix(
+            np.broadcast_to(weights, (len(arrays["accounts"]), len(weights))),
+            arrays["accounts"],
+            arrays["symbols"],
+        )
+
+    def target_positions_matrix(self) -> LabeledMatrix:
+        """
+        Matrix form of ``compute_target_positions``; non-model columns are 0.
+
+        Raises:
+            KeyError: If a model symbol has no price
+        """
+        arrays = self._matrix_arrays()
+        symbols = arrays["symbols"]
+        columns, model_weights = self._model_columns(symbols)
+        # Like the dict version, every model symbol (CASH included) needs a price
+        prices = np.array([self.prices[symbols[j]] for j in columns], dtype=np.float64)
+
+        shares = np.zeros((len(arrays["accounts"]), len(symbols)), dtype=np.float64)
+        shares[:, columns] = arrays["account_values"][:, None] * (model_weights / prices)
+        return LabeledMatrix(shares, arrays["accounts"], symbols)
+
+    def allocation_differences_matrix(self) -> Tuple[LabeledMatrix, LabeledMatrix]:
+        """
+        Matrix form of ``get_allocation_differences``.
+
+        Returns:
+            Tuple of (current, target) allocation matrices on the same axes;
+            ``current - target`` is the drift
+        """
+        return self.current_allocations_matrix(), self.target_allocations_matrix()
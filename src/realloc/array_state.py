@@ -0,0 +1,376 @@
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from realloc.accounts import Account
+from realloc.indexes import CashIndex
+from realloc.interning import Interner
+from realloc.portfolio import NegativePositionError, PortfolioStateManager, _batch_columns
+from realloc.trades import Trade
+
+
+class _CashView(MutableMapping):
+    """Dict-like view of the cash vector, keyed by account number."""
+
+    def __init__(self, state: "ArrayPortfolioStateManager"):
+        self._state = state
+
+    def __getitem__(self, account_id: str) -> float:
+        return float(self._state._cash[self._state.account_ids[account_id]])
+
+    def __setitem__(self, account_id: str, cash: float) -> None:
+        self._state._cash[self._state.account_ids[account_id]] = cash
+
+    def __delitem__(self, account_id: str) -> None:
+        raise TypeError("Accounts cannot be removed from the cash vector")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._state.account_ids)
+
+    def __len__(self) -> int:
+        return len(self._state.account_ids)
+
+    def copy(self) -> Dict[str, float]:
+        return dict(zip(self._state.account_ids, self._state._cash.tolist()))
+
+    def __repr__(self) -> str:
+        return repr(self.copy())
+
+
+class _PriceView(MutableMapping):
+    """Dict-like view of the price vector; symbols without a price are NaN."""
+
+    def __init__(self, state: "ArrayPortfolioStateManager"):
+        self._state = state
+
+    def _column(self, symbol: str) -> int:
+        col = self._state.symbol_ids.get(symbol)
+        if col is None or np.isnan(self._state._prices[col]):
+            raise KeyError(symbol)
+        return col
+
+    def __getitem__(self, symbol: str) -> float:
+        return float(self._state._prices[self._column(symbol)])
+
+    def __setitem__(self, symbol: str, price: float) -> None:
+        col = self._state._ensure_symbol(symbol)
+        self._state._prices[col] = price
+
+    def __delitem__(self, symbol: str) -> None:
+        self._state._prices[self._column(symbol)] = np.nan
+
+    def __iter__(self) -> Iterator[str]:
+        keys = self._state.symbol_ids.keys
+        for col in np.flatnonzero(~np.isnan(self._state._prices[:len(keys)])).tolist():
+            yield keys[col]
+
+    def __len__(self) -> int:
+        return int((~np.isnan(self._state._prices)).sum())
+
+    def copy(self) -> Dict[str, float]:
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return repr(self.copy())
+
+
+class ArrayPortfolioStateManager(PortfolioStateManager):
+    """
+    PortfolioStateManager that keeps positions, cash and prices in NumPy arrays.
+
+    Account numbers and symbols are interned to integer IDs. Positions are a
+    dense account x symbol float64 matrix, with a boolean mask recording which
+    positions exist (an account can hold a symbol at zero); cash and prices
+    are vectors. Valuations are computed with matrix-vector products instead
+    of walking nested dicts.
+
+    The dict-based API is kept: ``cash_matrix`` and ``prices`` are live
+    mappings over the arrays, and each account's ``positions`` stays the
+    caller's plain dict, updated alongside the matrix by update(),
+    bulk_update() and rollback(). Plugins written against
+    ``PortfolioStateManager`` work unchanged. As with the dict backend,
+    call refresh() after editing ``Account.positions`` directly.
+
+    Example:
+        >>> state = ArrayPortfolioStateManager(accounts, prices)
+        >>> state.get_total_portfolio_value()
+        >>> state.position_matrix  # accounts x symbols
+    """
+
+    def __init__(
+        self,
+        accounts: List[Account],
+        prices: Dict[str, float],
+        portfolio_trades: Optional[Dict[str, int]] = None,
+        min_trade_quantity: float = 0,
+    ):
+        self.account_ids = Interner(a.account_number for a in accounts)
+        self.symbol_ids = Interner()
+        self._positions = np.zeros((len(self.account_ids), 0), dtype=np.float64)
+        self._held = np.zeros((len(self.account_ids), 0), dtype=bool)
+        self._prices = np.zeros(0, dtype=np.float64)
+        self._cash = np.zeros(len(self.account_ids), dtype=np.float64)
+        self._prices_view = _PriceView(self)
+        super().__init__(accounts, prices, portfolio_trades, min_trade_quantity)
+
+    @property
+    def prices(self) -> MutableMapping:
+        return self._prices_view
+
+    @prices.setter
+    def prices(self, value: Dict[str, float]) -> None:
+        value = dict(value)
+        self._prices[:] = np.nan
+        self._market_value = None
+        for symbol, price in value.items():
+            col = self._ensure_symbol(symbol)
+            self._prices[col] = price
+
+    @property
+    def cash_matrix(self) -> Mapping:
+        return self._cash_matrix
+
+    @cash_matrix.setter
+    def cash_matrix(self, value: Dict[str, float]) -> None:
+        self._load_cash(value)
+        self._total_cash = float(self._cash.sum())
+        self.cash_index = CashIndex(self.accounts.values(), self._cash_matrix)
+
+    @property
+    def position_matrix(self) -> np.ndarray:
+        """Accounts x symbols position matrix, indexed by ``account_ids`` and ``symbol_ids``."""
+        return self._positions[:, :len(self.symbol_ids)]
+
+    @property
+    def cash_vector(self) -> np.ndarray:
+        """Cash per account, indexed by ``account_ids``."""
+        return self._cash
+
+    @property
+    def price_vector(self) -> np.ndarray:
+        """Price per symbol, indexed by ``symbol_ids``; NaN where no price is known."""
+        return self._prices[:len(self.symbol_ids)]
+
+    def _ensure_symbol(self, symbol: str) -> int:
+        """Intern ``symbol``, growing the arrays if it is new, and return its column."""
+        col = self.symbol_ids.intern(symbol)
+        capacity = self._positions.shape[1]
+        if col >= capacity:
+            capacity = max(2 * capacity, col + 1, 8)
+            grow = capacity - self._positions.shape[1]
+            self._positions = np.pad(self._positions, ((0, 0), (0, grow)))
+            self._held = np.pad(self._held, ((0, 0), (0, grow)))
+            self._prices = np.pad(self._prices, (0, grow), constant_values=np.nan)
+        return col
+
+    def _load_cash(self, value: Dict[str, float]) -> None:
+        cash = [float(value.get(account_id, 0.0)) for account_id in self.account_ids]
+        self._cash = np.array(cash, dtype=np.float64)
+        self._cash_matrix = _CashView(self)
+
+    def refresh(self) -> None:
+        """Rebuild the arrays and derived aggregates from the accounts."""
+        self._load_cash(self._cash_matrix)
+
+        self._positions[:] = 0.0
+        self._held[:] = False
+        for account in self.accounts.values():
+            row = self.account_ids[account.account_number]
+            for symbol, qty in account.positions.items():
+                col = self._ensure_symbol(symbol)
+                self._positions[row, col] = qty
+                self._held[row, col] = True
+
+        super().refresh()
+
+    def _price_vector_for_valuation(self) -> np.ndarray:
+        prices = self.price_vector
+        missing = np.isnan(prices) & self._held[:, :len(prices)].any(axis=0)
+        if missing.any():
+            raise KeyError(self.symbol_ids.key(int(np.argmax(missing))))
+        return np.nan_to_num(prices)
+
+    def _compute_market_value(self) -> float:
+        return float(self.position_matrix.sum(axis=0) @ self._price_vector_for_valuation())
+
+    def get_account_summary(self) -> List[Dict[str, Any]]:
+        """Get summary of all accounts including positions and cash."""
+        values = self.position_matrix @ self._price_vector_for_valuation() + self._cash
+        summary = []
+        for acc in self.accounts.values():
+            row = self.account_ids[acc.account_number]
+            summary.append({
+                "account_id": acc.account_number,
+                "label": acc.label,
+                "cash": float(self._cash[row]),
+                "positions": acc.positions,
+                "total_value": float(values[row]),
+            })
+        return summary
+
+    def _intern_column(self, values: Any, lookup) -> np.ndarray:
+        """Map a column of keys to integer IDs, looking up each distinct key once."""
+        keys, inverse = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+        ids = np.array([lookup(key) for key in keys.tolist()], dtype=np.int64)
+        return ids[inverse.reshape(-1)]
+
+    def bulk_update(self, account_ids: Any, symbols: Any = None, shares: Any = None) -> None:
+        """
+        Apply a large batch of trades at once.
+
+        Same contract as ``PortfolioStateManager.bulk_update``. Keys are
+        interned once per distinct value, the negative-position check is a
+        grouped cumulative sum over the whole batch, and positions and cash
+        are updated with scatter-adds. The selector indexes are then updated
+        once per distinct (account, symbol) pair.
+        """
+        account_ids, symbols, shares = _batch_columns(account_ids, symbols, shares)
+        shares = np.asarray(shares)
+        # Integer batches keep integer quantities in Account.positions
+        integral = np.issubdtype(shares.dtype, np.integer)
+        shares = shares.astype(np.float64, copy=False)
+        if len(shares) == 0:
+            return
+
+        rows = self._intern_column(account_ids, lambda a: self.account_ids.get(a, -1))
+        if (rows < 0).any():
+            invalid = list(dict.fromkeys(np.asarray(account_ids, dtype=str)[rows < 0].tolist()))
+            raise ValueError(f"Invalid account IDs: {invalid}")
+        cols = self._intern_column(symbols, self._ensure_symbol)
+
+        # One group per distinct (account, symbol) pair
+        n_symbols = len(self.symbol_ids)
+        pairs, group = np.unique(rows * n_symbols + cols, return_inverse=True)
+        group = group.reshape(-1)
+        pair_rows, pair_cols = pairs // n_symbols, pairs % n_symbols
+        old = self._positions[pair_rows, pair_cols]
+
+        # Position after each trade, in batch order within its pair
+        order = np.argsort(group, kind="stable")
+        sorted_shares = shares[order]
+        cumulative = np.cumsum(sorted_shares)
+        counts = np.bincount(group, minlength=len(pairs))
+        starts = np.cumsum(counts) - counts
+        before_group = cumulative[starts] - sorted_shares[starts]
+        running = old[group[order]] + cumulative - np.repeat(before_group, counts)
+
+        enforce = np.array(
+            [self.accounts[a].enforce_no_negative_positions for a in self.account_ids],
+            dtype=bool,
+        )
+        offending = np.sort(order[(running < 0) & enforce[rows[order]]])
+        if len(offending):
+            position_after = np.empty_like(running)
+            position_after[order] = running
+            raise NegativePositionError(
+                offending.tolist(),
+                [
+                    f"row {row} ({self.account_ids.key(rows[row])} "
+                    f"{self.symbol_ids.key(cols[row])} -> {position_after[row]})"
+                    for row in offending.tolist()
+                ],
+            )
+
+        prices = self._prices[cols]
+        unpriced = np.isnan(prices)
+        values = shares * np.where(unpriced, 0.0, prices)
+        old_cash = self._cash.copy()
+        deltas = np.bincount(group, weights=shares, minlength=len(pairs))
+        new = old + deltas
+
+        self._positions[pair_rows, pair_cols] = new
+        self._held[pair_rows, pair_cols] = True
+        self._cash -= np.bincount(rows, weights=values, minlength=len(self._cash))
+
+        account_keys, symbol_keys = self.account_ids.keys, self.symbol_ids.keys
+        changes = []
+        for row, col, delta in zip(pair_rows.tolist(), pair_cols.tolist(), deltas.tolist()):
+            account_id, symbol = account_keys[row], symbol_keys[col]
+            positions = self.accounts[account_id].positions
+            old_qty = positions.get(symbol)
+            new_qty = positions[symbol] = (old_qty or 0) + (int(delta) if integral else delta)
+            changes.append((account_id, symbol, old_qty, new_qty))
+        if self._undo_log is not None:
+            self._undo_log.extend(
+                (account_id, symbol, old_qty, float(old_cash[self.account_ids[account_id]]))
+                for account_id, symbol, old_qty, _ in changes
+            )
+        self.position_index.update_many(changes)
+        self.cash_index.add_holdings(
+            (account_id, symbol) for account_id, symbol, old_qty, _ in changes if old_qty is None
+        )
+        for row in np.unique(rows).tolist():
+            self.cash_index.set_cash(self.account_ids.key(row), float(self._cash[row]))
+
+        symbol_cols, symbol_group = np.unique(cols, return_inverse=True)
+        symbol_deltas = np.bincount(symbol_group.reshape(-1), weights=shares)
+        for col, delta in zip(symbol_cols.tolist(), symbol_deltas.tolist()):
+            symbol = self.symbol_ids.key(col)
+            self._combined_positions[symbol] = self._combined_positions.get(symbol, 0.0) + delta
+            self._dirty_symbols.add(symbol)
+
+        total_value = float(values.sum())
+        self._total_cash -= total_value
+        if self._market_value is not None:
+            self._market_value = None if unpriced.any() else self._market_value + total_value
+
+    def update(self, trades: List[Trade]) -> None:
+        # Validate all account IDs first
+        invalid_accounts = [
+            trade.account_id for trade in trades
+            if trade.account_id not in self.accounts
+        ]
+        if invalid_accounts:
+            raise ValueError(f"Invalid account IDs: {invalid_accounts}")
+
+        # Group trades by account, matching PortfolioStateManager's processing order
+        account_trades: Dict[str, List[Trade]] = {}
+        for trade in trades:
+            account_trades.setdefault(trade.account_id, []).append(trade)
+
+        for account_id, account_trades_list in account_trades.items():
+            account = self.accounts[account_id]
+            row = self.account_ids[account_id]
+
+            for trade in account_trades_list:
+                symbol, qty = trade.symbol, trade.shares
+                col = self._ensure_symbol(symbol)
+                old_position = account.positions.get(symbol)
+                new_position = (old_position or 0) + qty
+                if account.enforce_no_negative_positions and new_position < 0:
+                    raise ValueError(
+                        f"Trade would result in negative position for {symbol} "
+                        f"in account {account_id}"
+                    )
+                self._log_change(account_id, symbol, old_position, float(self._cash[row]))
+                account.positions[symbol] = new_position
+                self._positions[row, col] = new_position
+                self._held[row, col] = True
+                self.position_index.update(account_id, symbol, old_position, float(new_position))
+                if old_position is None:
+                    self.cash_index.add_holding(account_id, symbol)
+
+                price = self._prices[col]
+                trade_value = 0.0 if np.isnan(price) else qty * price
+                self._cash[row] -= trade_value
+                self.cash_index.set_cash(account_id, float(self._cash[row]))
+                self._total_cash -= trade_value
+                if self._market_value is not None:
+                    self._market_value = (
+                        None if np.isnan(price) else self._market_value + trade_value
+                    )
+
+                self._combined_positions[symbol] = (
+                    self._combined_positions.get(symbol, 0.0) + qty
+                )
+                self._dirty_symbols.add(symbol)
+
+    def _undo_change(
+            self, account_id: str, symbol: Optional[str], old_qty: Optional[float], old_cash: float
+    ) -> None:
+        super()._undo_change(account_id, symbol, old_qty, old_cash)
+        if symbol is not None:
+            row, col = self.account_ids[account_id], self.symbol_ids[symbol]
+            self._positions[row, col] = old_qty or 0.0
+            self._held[row, col] = old_qty is not None
@@ -0,0 +1,262 @@
+import logging
+from collections import deque
+from concurrent.futures import BrokenExecutor, Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from realloc.accounts import Account
+from realloc.models import PortfolioModel
+from realloc.portfolio import (
+    PortfolioStateManager,
+    calculate_portfolio_positions,
+    calculate_target_shares,
+    compute_portfolio_trades,
+)
+from realloc.trades import Trade
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Household:
+    """One independent set of accounts to rebalance against a model."""
+    household_id: str
+    accounts: List[Account]
+    model: PortfolioModel
+    prices: Dict[str, float]
+
+
+@dataclass
+class HouseholdResult:
+    """
+    Outcome of rebalancing one household.
+
+    ``error`` is None on success; otherwise it describes the failure and
+    ``trades`` is empty.
+    """
+    household_id: str
+    trades: List[Trade] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# Per-process cache of loaded rebalancers, keyed by (name, options)
+_rebalancers: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], Any] = {}
+
+
+def _load_rebalancer(name: str, options: Dict[str, Any]) -> Any:
+    from realloc.plugins.core.base import RebalancerPlugin
+
+    key = (name, tuple(sorted(options.items())))
+    try:
+        rebalancer = _rebalancers.get(key)
+    except TypeError:
+        # Unhashable options: load a fresh plugin every time
+        return RebalancerPlugin.load_rebalancer(name, **options)
+    if rebalancer is None:
+        rebalancer = _rebalancers[key] = RebalancerPlugin.load_rebalancer(name, **options)
+    return rebalancer
+
+
+def rebalance_household(
+        household: Household,
+        rebalancer: str = "default",
+        max_iterations: int = 100,
+        rebalancer_options: Optional[Dict[str, Any]] = None,
+) -> HouseholdResult:
+    """
+    Rebalance a single household with the named rebalancer plugin.
+
+    Any exception raised while rebalancing is caught and reported in the
+    result, so one bad household cannot abort a batch.
+    """
+    try:
+        plugin = _load_rebalancer(rebalancer, rebalancer_options or {})
+        combined_positions, total_cash = calculate_portfolio_positions(household.accounts)
+        target_shares = calculate_target_shares(
+            combined_positions=combined_positions,
+            total_cash=total_cash,
+            prices=household.prices,
+            model=household.model,
+        )
+        portfolio_trades = compute_portfolio_trades(
+            current_shares=combined_positions,
+            target_shares=target_shares,
+            prices=household.prices,
+        )
+        portfolio_state = PortfolioStateManager(
+            accounts=household.accounts,
+            prices=household.prices,
+            portfolio_trades=portfolio_trades,
+        )
+        trades = plugin.execute_rebalance(portfolio_state, target_shares, max_iterations)
+    except Exception as e:
+        logger.warning(f"Rebalance failed for household {household.household_id}: {e}")
+        return HouseholdResult(household.household_id, error=f"{type(e).__name__}: {e}")
+    return HouseholdResult(household.household_id, list(trades))
+
+
+def _rebalance_chunk(
+        chunk: List[Household],
+        rebalancer: str,
+        max_iterations: int,
+        rebalancer_options: Optional[Dict[str, Any]],
+) -> List[HouseholdResult]:
+    return [
+        rebalance_household(household, rebalancer, max_iterations, rebalancer_options)
+        for household in chunk
+    ]
+
+
+def _chunks(households: Iterable[Household], chunk_size: int) -> Iterator[List[Household]]:
+    iterator = iter(households)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class _WorkerPool:
+    """
+    Submits chunks to an executor, replacing an owned process pool that breaks.
+
+    A caller-supplied executor that breaks is not replaced; every later
+    submission is refused instead.
+    """
+
+    def __init__(self, executor: Optional[Executor], max_workers: Optional[int]):
+        self.owned = executor is None
+        self.max_workers = max_workers
+        self.executor = executor or ProcessPoolExecutor(max_workers=max_workers)
+        self.error: Optional[BaseException] = None
+
+    def submit(self, *args: Any) -> Tuple[Executor, Optional[Future]]:
+        """
+        Submit ``_rebalance_chunk(*args)``.
+
+        Returns:
+            The executor used and the future, which is None if no working
+            executor is left
+        """
+        executor = self.executor
+        for _ in range(2):
+            if self.error is not None:
+                return executor, None
+            executor = self.executor
+            try:
+                return executor, executor.submit(_rebalance_chunk, *args)
+            except BrokenExecutor as e:
+                self.replace(executor, e)
+        return executor, None
+
+    def replace(self, broken: Executor, error: BaseException) -> None:
+        """Swap out ``broken`` unless it was already replaced."""
+        if broken is not self.executor:
+            return
+        if not self.owned:
+            self.error = error
+            return
+        logger.error(f"Worker pool broke, starting a new one: {error}")
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def shutdown(self) -> None:
+        if self.owned:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+# (chunk, executor it was submitted to, future or None if refused, attempt)
+_Pending = Tuple[List[Household], Executor, Optional[Future], int]
+
+
+def rebalance_batch(
+        households: Iterable[Household],
+        rebalancer: str = "default",
+        max_iterations: int = 100,
+        rebalancer_options: Optional[Dict[str, Any]] = None,
+        max_workers: Optional[int] = None,
+        chunk_size: int = 16,
+        executor: Optional[Executor] = None,
+) -> Iterator[HouseholdResult]:
+    """
+    Rebalance many independent households across a process pool.
+
+    Households are sent to workers in chunks of ``chunk_size`` and results
+    are yielded as they finish, in the same order as the input. Only a
+    bounded number of chunks is in flight at once, so ``households`` may be
+    a lazy iterable over a very large book.
+
+    If a worker process dies, the pool is replaced and each chunk that was
+    in flight is retried once, alone, so only the chunk that killed the
+    worker is reported as failed. A caller-supplied ``executor`` is never
+    replaced: once it breaks, every remaining chunk is reported as failed.
+
+    Args:
+        households: Households to rebalance
+        rebalancer: Name of the RebalancerPlugin to run in each worker
+        max_iterations: Passed to ``execute_rebalance``
+        rebalancer_options: Keyword arguments for the rebalancer plugin
+        max_workers: Worker process count (defaults to the CPU count)
+        chunk_size: Households per worker task
+        executor: Existing executor to use instead of creating a process pool
+
+    Yields:
+        HouseholdResult for each household, in input order. A household that
+        fails (or whose worker dies) is reported with ``error`` set.
+
+    Raises:
+        ValueError: If chunk_size is not positive
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    pool = _WorkerPool(executor, max_workers)
+    max_in_flight = 2 * (getattr(pool.executor, "_max_workers", None) or max_workers or 1)
+    args = (rebalancer, max_iterations, rebalancer_options)
+
+    pending: Deque[_Pending] = deque()
+    try:
+        for chunk in _chunks(households, chunk_size):
+            pending.append((chunk, *pool.submit(chunk, *args), 0))
+            if len(pending) >= max_in_flight:
+                yield from _collect(pool, args, pending.popleft())
+        while pending:
+            yield from _collect(pool, args, pending.popleft())
+    finally:
+        for _, _, future, _ in pending:
+            if future is not None:
+                future.cancel()
+        pool.shutdown()
+
+
+def _failed(chunk: List[Household], error: BaseException) -> List[HouseholdResult]:
+    return [
+        HouseholdResult(household.household_id, error=f"{type(error).__name__}: {error}")
+        for household in chunk
+    ]
+
+
+def _collect(pool: _WorkerPool, args: Tuple[Any, ...], entry: _Pending) -> List[HouseholdResult]:
+    chunk, submitted_to, future, attempt = entry
+    if future is None:
+        return _failed(chunk, pool.error or BrokenExecutor("No executor available"))
+    try:
+        return future.result()
+    except BrokenExecutor as e:
+        # Any chunk in flight when a worker dies lands here. Retrying each
+        # one alone on the replacement pool isolates the chunk that killed it.
+        pool.replace(submitted_to, e)
+        if attempt == 0:
+            submitted_to, retry = pool.submit(chunk, *args)
+            if retry is not None:
+                return _collect(pool, args, (chunk, submitted_to, retry, 1))
+        logger.error(f"Worker died on a chunk of {len(chunk)} households: {e}")
+        return _failed(chunk, e)
+    except Exception as e:
+        logger.error(f"Worker failed on a chunk of {len(chunk)} households: {e}")
+        return _failed(chunk, e)
@@ -0,0 +1,11 @@
+from .generator import SyntheticPortfolio, generate_portfolio, write_csv_inputs
+from .runner import benchmark_size, run_benchmarks, time_call
+
+__all__ = [
+    "SyntheticPortfolio",
+    "generate_portfolio",
+    "write_csv_inputs",
+    "benchmark_size",
+    "run_benchmarks",
+    "time_call",
+]
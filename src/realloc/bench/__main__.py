@@ -0,0 +1,3 @@
+from realloc.bench.runner import main
+
+raise SystemExit(main())
@@ -0,0 +1,115 @@
+import csv
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from realloc.accounts import Account
+from realloc.models import PortfolioModel
+
+
+@dataclass
+class SyntheticPortfolio:
+    """Accounts, prices and a model produced by ``generate_portfolio``."""
+    accounts: List[Account]
+    prices: Dict[str, float]
+    model: PortfolioModel
+
+
+def generate_portfolio(
+        n_accounts: int,
+        n_symbols: int,
+        seed: int = 0,
+        cash_skew: float = 1.0,
+        median_cash: float = 10000.0,
+        holder_density: float = 0.1,
+        model_size: Optional[int] = None,
+        price_range: Tuple[float, float] = (5.0, 500.0),
+        max_shares: int = 1000,
+) -> SyntheticPortfolio:
+    """
+    Generate a reproducible household of ``n_accounts`` accounts over ``n_symbols`` symbols.
+
+    Args:
+        n_accounts: Number of accounts
+        n_symbols: Number of symbols in the universe
+        seed: Random seed; the same arguments always produce the same portfolio
+        cash_skew: Sigma of the log-normal cash distribution. 0 gives every
+            account ``median_cash``; larger values concentrate cash in few accounts
+        median_cash: Median cash balance per account (the log-normal median)
+        holder_density: Probability that an account holds any given symbol
+        model_size: Number of symbols in the target model (default: all symbols)
+        price_range: Uniform (low, high) range for prices
+        max_shares: Upper bound for generated share counts
+
+    Returns:
+        SyntheticPortfolio with accounts, prices and a normalized model
+    """
+    rng = np.random.default_rng(seed)
+    symbols = [f"SYM{i:05d}" for i in range(n_symbols)]
+
+    price_values = np.round(rng.uniform(price_range[0], price_range[1], n_symbols), 2)
+    prices = dict(zip(symbols, price_values.tolist()))
+
+    cash = np.round(median_cash * rng.lognormal(0.0, cash_skew, n_accounts), 2)
+    held = rng.random((n_accounts, n_symbols)) < holder_density
+    shares = rng.integers(1, max_shares + 1, (n_accounts, n_symbols))
+
+    owners, columns = np.nonzero(held)
+    accounts = Account.from_columns(
+        account_numbers=[f"ACC{i:06d}" for i in range(n_accounts)],
+        cash=cash,
+        labels=[f"Account {i}" for i in range(n_accounts)],
+        position_accounts=owners,
+        symbols=[symbols[j] for j in columns.tolist()],
+        shares=shares[owners, columns].astype(np.float64),
+    )
+
+    if model_size is None:
+        model_size = n_symbols
+    model_symbols = rng.choice(n_symbols, size=min(model_size, n_symbols), replace=False)
+    weights = rng.random(len(model_symbols)) + 0.05
+    weights /= weights.sum()
+    model = PortfolioModel(
+        "Synthetic",
+        {symbols[j]: float(w) for j, w in zip(model_symbols.tolist(), weights.tolist())},
+    )
+
+    return SyntheticPortfolio(accounts, prices, model)
+
+
+def write_csv_inputs(portfolio: SyntheticPortfolio, directory: Path) -> Dict[str, Path]:
+    """
+    Write a portfolio in the formats read by the bundled CSV importers.
+
+    Returns:
+        Dict with ``positions``, ``prices`` and ``allocations`` file paths
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = {
+        "positions": directory / "positions.csv",
+        "prices": directory / "prices.csv",
+        "allocations": directory / "target_allocation.csv",
+    }
+
+    with open(paths["positions"], "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Account Label", "Account Id", "Symbol", "Shares"])
+        for account in portfolio.accounts:
+            writer.writerow([account.label, account.account_number, "CASH", account.cash])
+            for symbol, qty in account.positions.items():
+                writer.writerow([account.label, account.account_number, symbol, qty])
+
+    with open(paths["prices"], "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Symbol", "Price"])
+        writer.writerows(portfolio.prices.items())
+
+    with open(paths["allocations"], "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Symbol", "Target Weight"])
+        writer.writerows(portfolio.model.targets.items())
+
+    return paths
@@ -0,0 +1,311 @@
+import argparse
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from realloc.bench.generator import SyntheticPortfolio, generate_portfolio, write_csv_inputs
+from realloc.plugins.importers.account.account_csv import CSVAccountImporter
+from realloc.plugins.importers.allocation.allocation_csv import AllocationCSVImporter
+from realloc.plugins.importers.prices.prices_csv import PricesCSVImporter
+from realloc.plugins.rebalancers.default_rebalancer import DefaultRebalancer
+from realloc.portfolio import (
+    PortfolioStateManager,
+    calculate_portfolio_positions,
+    calculate_target_shares,
+)
+from realloc.selectors import select_account_for_buy_trade, select_account_for_sell_trade
+from realloc.trades import compute_portfolio_trades
+
+DEFAULT_SIZES: Tuple[Tuple[int, int], ...] = ((10, 50), (100, 500), (500, 2000))
+
+
+def time_call(
+        func: Callable[..., Any],
+        repeat: int = 3,
+        setup: Optional[Callable[[], tuple]] = None,
+) -> Dict[str, float]:
+    """
+    Time ``func`` over ``repeat`` runs.
+
+    Args:
+        func: Callable to time
+        repeat: Number of timed runs
+        setup: Optional callable run before each timed run; its return value
+            is passed to ``func`` as positional arguments and is not timed
+
+    Returns:
+        Dict with ``best`` and ``mean`` wall-clock seconds and ``repeat``
+    """
+    timings = []
+    for _ in range(repeat):
+        args = setup() if setup is not None else ()
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return {
+        "best": min(timings),
+        "mean": sum(timings) / len(timings),
+        "repeat": repeat,
+    }
+
+
+def _copy_accounts(portfolio: SyntheticPortfolio) -> List:
+    return [
+        type(a)(a.label, a.account_number, a.cash, dict(a.positions))
+        for a in portfolio.accounts
+    ]
+
+
+def benchmark_size(
+        n_accounts: int,
+        n_symbols: int,
+        repeat: int = 3,
+        seed: int = 0,
+        max_iterations: int = 100,
+        **generator_options: Any,
+) -> Dict[str, Any]:
+    """
+    Run every benchmark for one portfolio size.
+
+    Args:
+        n_accounts: Number of accounts to generate
+        n_symbols: Number of symbols to generate
+        repeat: Timed runs per benchmark
+        seed: Generator seed
+        max_iterations: ``max_iterations`` passed to the rebalancer
+        **generator_options: Passed through to ``generate_portfolio``
+
+    Returns:
+        Dict describing the portfolio and the timings of each benchmark
+    """
+    portfolio = generate_portfolio(n_accounts, n_symbols, seed=seed, **generator_options)
+    prices = portfolio.prices
+    model = portfolio.model
+
+    combined_positions, total_cash = calculate_portfolio_positions(portfolio.accounts)
+    target_shares = calculate_target_shares(combined_positions, total_cash, prices, model)
+    portfolio_trades = compute_portfolio_trades(combined_positions, target_shares)
+
+    accounts = portfolio.accounts
+    cash_matrix = {a.account_number: a.cash for a in accounts}
+    buys = [(sym, qty) for sym, qty in portfolio_trades.items() if qty > 0]
+    sells = [(sym, -qty) for sym, qty in portfolio_trades.items() if qty < 0]
+    state = PortfolioStateManager(_copy_accounts(portfolio), prices, portfolio_trades)
+
+    def select_buys(cash_index=None):
+        for sym, qty in buys:
+            select_account_for_buy_trade(
+                sym, qty, accounts, prices, cash_matrix, cash_index=cash_index
+            )
+
+    def select_sells(position_index=None):
+        for sym, qty in sells:
+            select_account_for_sell_trade(sym, qty, accounts, position_index=position_index)
+
+    def rebalance_setup():
+        fresh = PortfolioStateManager(_copy_accounts(portfolio), prices, portfolio_trades)
+        return fresh, target_shares, max_iterations
+
+    rebalancer = DefaultRebalancer()
+    trade_counts = []
+
+    def rebalance(portfolio_state, targets, iterations):
+        trade_counts.append(len(rebalancer.execute_rebalance(portfolio_state, targets, iterations)))
+
+    results = {
+        "calculate_target_shares": time_call(
+            lambda: calculate_target_shares(combined_positions, total_cash, prices, model),
+            repeat,
+        ),
+        "compute_portfolio_trades": time_call(
+            lambda: compute_portfolio_trades(combined_positions, target_shares),
+            repeat,
+        ),
+        "select_buy": time_call(select_buys, repeat),
+        "select_buy_indexed": time_call(lambda: select_buys(state.cash_index), repeat),
+        "select_sell": time_call(select_sells, repeat),
+        "select_sell_indexed": time_call(lambda: select_sells(state.position_index), repeat),
+        "default_rebalance": time_call(rebalance, repeat, setup=rebalance_setup),
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_csv_inputs(portfolio, Path(directory))
+        results["import_accounts_csv"] = time_call(
+            lambda: CSVAccountImporter().account_importer(paths["positions"]), repeat
+        )
+        results["import_prices_csv"] = time_call(
+            lambda: PricesCSVImporter().import_prices(paths["prices"]), repeat
+        )
+        results["import_allocations_csv"] = time_call(
+            lambda: AllocationCSVImporter().import_allocations(paths["allocations"]), repeat
+        )
+
+    return {
+        "accounts": n_accounts,
+        "symbols": n_symbols,
+        "positions": sum(len(a.positions) for a in accounts),
+        "model_symbols": len(model.targets),
+        "buy_trades": len(buys),
+        "sell_trades": len(sells),
+        "rebalance_trades": trade_counts[-1],
+        "timings": results,
+    }
+
+
+def run_benchmarks(
+        sizes: Sequence[Tuple[int, int]] = DEFAULT_SIZES,
+        repeat: int = 3,
+        seed: int = 0,
+        max_iterations: int = 100,
+        output: Optional[Path] = None,
+        **generator_options: Any,
+) -> Dict[str, Any]:
+    """
+    Benchmark every size and optionally write the report as JSON.
+
+    Args:
+        sizes: (accounts, symbols) pairs to benchmark
+        repeat: Timed runs per benchmark
+        seed: Generator seed, shared by all sizes
+        max_iterations: ``max_iterations`` passed to the rebalancer
+        output: Optional path to write the JSON report to
+        **generator_options: Passed through to ``generate_portfolio``
+
+    Returns:
+        The report: environment metadata and one result per size
+    """
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+            "max_iterations": max_iterations,
+            "generator_options": generator_options,
+        },
+        "results": [
+            benchmark_size(
+                n_accounts, n_symbols, repeat, seed, max_iterations, **generator_options
+            )
+            for n_accounts, n_symbols in sizes
+        ],
+    }
+
+    if output is not None:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    return report
+
+
+def parse_sizes(value: str) -> List[Tuple[int, int]]:
+    """Parse ``"10x50,100x500"`` into ``[(10, 50), (100, 500)]``."""
+    sizes = []
+    for item in value.split(","):
+        try:
+            n_accounts, n_symbols = (int(part) for part in item.lower().split("x"))
+        except ValueError:
+            raise argparse.ArgumentTypeError(
+                f"Invalid size {item!r}; expected ACCOUNTSxSYMBOLS"
+            )
+        sizes.append((n_accounts, n_symbols))
+    return sizes
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    """
+    Main entry point for the benchmark CLI.
+
+    Args:
+        args: Command line arguments (optional)
+
+    Returns:
+        Exit code (0 for success)
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark realloc on synthetic portfolios"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=parse_sizes,
+        default=list(DEFAULT_SIZES),
+        help="Comma-separated ACCOUNTSxSYMBOLS sizes (default: 10x50,100x500,500x2000)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--max-iterations",
+        type=int,
+        default=100,
+        help="Maximum number of rebalancing iterations"
+    )
+    parser.add_argument("--cash-skew", type=float, default=1.0, help="Sigma of log-normal cash")
+    parser.add_argument(
+        "--holder-density",
+        type=float,
+        default=0.1,
+        help="Probability that an account holds a given symbol"
+    )
+    parser.add_argument("--model-size", type=int, help="Symbols in the target model")
+    parser.add_argument(
+        "--median-cash",
+        type=float,
+        default=10000.0,
+        help="Median cash balance per account"
+    )
+    parser.add_argument(
+        "--price-range",
+        type=float,
+        nargs=2,
+        metavar=("LOW", "HIGH"),
+        default=(5.0, 500.0),
+        help="Uniform range for generated prices (default: 5 500)"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("bench.json"),
+        help="Path to write the JSON report"
+    )
+
+    parsed_args = parser.parse_args(args)
+    low, high = parsed_args.price_range
+    if not 0 < low <= high:
+        parser.error("--price-range needs 0 < LOW <= HIGH")
+
+    # Per-trade warnings from the rebalancer would otherwise dominate the timings
+    logging.basicConfig(level=logging.ERROR)
+
+    report = run_benchmarks(
+        sizes=parsed_args.sizes,
+        repeat=parsed_args.repeat,
+        seed=parsed_args.seed,
+        max_iterations=parsed_args.max_iterations,
+        output=parsed_args.output,
+        cash_skew=parsed_args.cash_skew,
+        holder_density=parsed_args.holder_density,
+        model_size=parsed_args.model_size,
+        median_cash=parsed_args.median_cash,
+        price_range=(low, high),
+    )
+
+    for result in report["results"]:
+        print(f"{result['accounts']} accounts x {result['symbols']} symbols")
+        for name, timing in result["timings"].items():
+            print(f"  {name:<26} {timing['best'] * 1000:10.2f} ms")
+    print(f"Report written to {parsed_args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
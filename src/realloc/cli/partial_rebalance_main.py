@@ -49,7 +49,7 @@ def main():
     total_value = total_cash + sum(
         qty * prices[sym] for sym, qty in combined_positions.items()
     )
-    normalized = model.normalize()
+    normalized = model.normalized
     target_dollars = {sym: weight * total_value for sym, weight in normalized.items()}
     target_shares = {sym: target_dollars[sym] / prices[sym] for sym in target_dollars}
     all_trades = compute_portfolio_trades(combined_positions, target_shares, prices)
@@ -16,6 +16,7 @@ from realloc.plugins.core.discovery import list_plugins
 from realloc.plugins.core.base import Exporter
 from realloc.plugins.rebalancers.default_rebalancer import DefaultRebalancer
 from realloc.portfolio import calculate_portfolio_positions, calculate_target_shares, compute_portfolio_trades
+from realloc.scheduler import TradeScheduler
 from realloc.selectors import select_account_for_buy_trade, select_account_for_sell_trade
 
 # Constants
@@ -82,12 +83,11 @@ def execute_rebalance(
     """
     iteration = 0
     account_trades = []
+    accounts = list(tam.accounts.values())
+    scheduler = TradeScheduler(tam.portfolio_trades)
 
     while is_trade_remaining(tam.portfolio_trades) and iteration < max_iterations:
-        sorted_trades = sorted(
-            tam.portfolio_trades.items(),
-            key=lambda item: (item[1] > 0, abs(item[1]))
-        )
+        sorted_trades = scheduler.next_pass()
 
         for symbol, qty in sorted_trades:
             if abs(qty) < MIN_TRADE_QTY:
@@ -101,13 +101,17 @@ def execute_rebalance(
                 select_account_for_buy_trade(
                     symbol,
                     qty_remaining,
-                    list(tam.accounts.values()),
+                    accounts,
                     tam.prices,
                     tam.cash_matrix,
+                    cash_index=tam.cash_index,
                 )
                 if direction == "buy"
                 else select_account_for_sell_trade(
-                    symbol, qty_remaining, list(tam.accounts.values())
+                    symbol,
+                    qty_remaining,
+                    accounts,
+                    position_index=tam.position_index,
                 )
             )
 
@@ -137,6 +141,7 @@ def execute_rebalance(
 
             tam.update([single_trade])
             tam.update_portfolio_trades(target_shares)
+            scheduler.refresh(tam.portfolio_trades, (symbol,))
             break  # Re-evaluate after each trade
 
         iteration += 1
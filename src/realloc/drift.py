@@ -0,0 +1,149 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from realloc.allocator import PortfolioAllocator
+from realloc.models import PortfolioModel
+
+
+@dataclass(frozen=True)
+class DriftBand:
+    """
+    Tolerance band for allocation drift.
+
+    An account is out of tolerance when any symbol's weight is more than
+    ``absolute`` away from its target, or, if ``relative`` is set, when a
+    model symbol's drift exceeds ``relative`` times its target weight.
+    """
+    absolute: float = 0.05
+    relative: Optional[float] = None
+
+    def __post_init__(self):
+        if self.absolute < 0:
+            raise ValueError("Absolute tolerance cannot be negative")
+        if self.relative is not None and self.relative < 0:
+            raise ValueError("Relative tolerance cannot be negative")
+
+
+@dataclass
+class DriftReport:
+    """
+    Drift of every account against its model, as accounts x symbols arrays.
+
+    ``absolute`` is ``current - target`` weight. ``relative`` is that drift
+    divided by the target weight; it is 0 where both are 0 and infinite where
+    a symbol is held but not targeted.
+    """
+    accounts: Tuple[str, ...]
+    symbols: Tuple[str, ...]
+    absolute: np.ndarray
+    relative: np.ndarray
+    flagged: np.ndarray
+    band: DriftBand = field(default_factory=DriftBand)
+
+    def account_drift(self) -> Dict[str, float]:
+        """Largest absolute drift of each account."""
+        return dict(zip(self.accounts, self._max_abs(axis=1).tolist()))
+
+    def symbol_drift(self) -> Dict[str, float]:
+        """Largest absolute drift of each symbol across accounts."""
+        return dict(zip(self.symbols, self._max_abs(axis=0).tolist()))
+
+    def flagged_accounts(self) -> List[str]:
+        """IDs of accounts outside the tolerance band, in account order."""
+        return [self.accounts[i] for i in np.flatnonzero(self.flagged).tolist()]
+
+    def _max_abs(self, axis: int) -> np.ndarray:
+        if self.absolute.size == 0:
+            return np.zeros(self.absolute.shape[1 - axis])
+        return np.abs(self.absolute).max(axis=axis)
+
+
+class DriftScanner:
+    """
+    Finds accounts whose allocations have drifted outside tolerance.
+
+    Uses the same current/target weights as
+    ``PortfolioAllocator.get_allocation_differences`` (including the CASH
+    weight), computed on the allocator's matrices rather than nested dicts.
+
+    Example:
+        >>> scanner = DriftScanner(bands={"Growth": DriftBand(absolute=0.03)})
+        >>> for chunk in scanner.iter_flagged(allocators, chunk_size=500):
+        ...     queue_rebalance(chunk)
+    """
+
+    def __init__(
+            self,
+            bands: Optional[Dict[str, DriftBand]] = None,
+            default_band: Optional[DriftBand] = None,
+    ):
+        """
+        Args:
+            bands: Tolerance band per model name
+            default_band: Band for models without an entry in ``bands``
+        """
+        self.bands = dict(bands or {})
+        self.default_band = default_band or DriftBand()
+
+    def band_for(self, model: PortfolioModel) -> DriftBand:
+        return self.bands.get(model.name, self.default_band)
+
+    def scan(self, allocator: PortfolioAllocator) -> DriftReport:
+        """
+        Compute drift for every account of ``allocator``.
+
+        Raises:
+            KeyError: If a held symbol has no price
+        """
+        band = self.band_for(allocator.model)
+        current, target = allocator.allocation_differences_matrix()
+        absolute = current.values - target.values
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            relative = np.divide(absolute, target.values)
+        relative[(target.values == 0) & (absolute == 0)] = 0.0
+        relative[(target.values == 0) & (absolute != 0)] = np.inf
+
+        magnitude = np.abs(absolute)
+        out_of_band = magnitude > band.absolute
+        if band.relative is not None:
+            targeted = target.values > 0
+            out_of_band |= targeted & (magnitude > band.relative * target.values)
+
+        return DriftReport(
+            accounts=current.accounts,
+            symbols=current.symbols,
+            absolute=absolute,
+            relative=relative,
+            flagged=out_of_band.any(axis=1),
+            band=band,
+        )
+
+    def iter_flagged(
+            self,
+            allocators: Iterable[PortfolioAllocator],
+            chunk_size: int = 1000,
+    ) -> Iterator[List[str]]:
+        """
+        Stream IDs of out-of-tolerance accounts in lists of ``chunk_size``.
+
+        Allocators are scanned one at a time, so a book split into model or
+        household groups is never held as a whole. The last chunk may be
+        shorter.
+
+        Raises:
+            ValueError: If chunk_size is not positive
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+
+        pending: List[str] = []
+        for allocator in allocators:
+            pending.extend(self.scan(allocator).flagged_accounts())
+            while len(pending) >= chunk_size:
+                yield pending[:chunk_size]
+                pending = pending[chunk_size:]
+        if pending:
+            yield pending
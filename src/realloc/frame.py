@@ -0,0 +1,93 @@
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class LabeledMatrix:
+    """
+    2-D array with account labels on the rows and symbol labels on the columns.
+
+    A minimal frame for whole-array allocation math: ``values`` is a plain
+    NumPy array, so drift and target computations are ordinary array
+    operations, while ``row``, ``column`` and ``to_dict`` translate back to
+    the nested dict shape used by the rest of the library.
+
+    Example:
+        >>> current, target = allocator.allocation_differences_matrix()
+        >>> drift = current - target
+        >>> drift["A1", "AAPL"]
+        0.05
+    """
+
+    __slots__ = ("values", "accounts", "symbols", "_account_index", "_symbol_index")
+
+    def __init__(self, values: np.ndarray, accounts: Sequence[str], symbols: Sequence[str]):
+        accounts, symbols = tuple(accounts), tuple(symbols)
+        if values.shape != (len(accounts), len(symbols)):
+            raise ValueError(
+                f"Values shape {values.shape} does not match "
+                f"{len(accounts)} accounts x {len(symbols)} symbols"
+            )
+        self.values = values
+        self.accounts = accounts
+        self.symbols = symbols
+        self._account_index: Optional[Dict[str, int]] = None
+        self._symbol_index: Optional[Dict[str, int]] = None
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.values.shape
+
+    def account_index(self, account_id: str) -> int:
+        """Row of ``account_id``."""
+        if self._account_index is None:
+            self._account_index = {a: i for i, a in enumerate(self.accounts)}
+        return self._account_index[account_id]
+
+    def symbol_index(self, symbol: str) -> int:
+        """Column of ``symbol``."""
+        if self._symbol_index is None:
+            self._symbol_index = {s: i for i, s in enumerate(self.symbols)}
+        return self._symbol_index[symbol]
+
+    def __getitem__(self, key: Tuple[str, str]) -> float:
+        account_id, symbol = key
+        return float(self.values[self.account_index(account_id), self.symbol_index(symbol)])
+
+    def row(self, account_id: str) -> Dict[str, float]:
+        """Values for one account, keyed by symbol."""
+        return dict(zip(self.symbols, self.values[self.account_index(account_id)].tolist()))
+
+    def column(self, symbol: str) -> Dict[str, float]:
+        """Values for one symbol, keyed by account."""
+        return dict(zip(self.accounts, self.values[:, self.symbol_index(symbol)].tolist()))
+
+    def to_dict(self, drop_zeros: bool = False) -> Dict[str, Dict[str, float]]:
+        """
+        Nested ``account -> {symbol: value}`` dict.
+
+        Args:
+            drop_zeros: If True, leave out entries whose value is 0
+        """
+        result = {}
+        for account_id, values in zip(self.accounts, self.values.tolist()):
+            if drop_zeros:
+                result[account_id] = {s: v for s, v in zip(self.symbols, values) if v != 0}
+            else:
+                result[account_id] = dict(zip(self.symbols, values))
+        return result
+
+    def _check_aligned(self, other: "LabeledMatrix") -> None:
+        if self.accounts != other.accounts or self.symbols != other.symbols:
+            raise ValueError("Matrices must have the same account and symbol labels")
+
+    def __sub__(self, other: "LabeledMatrix") -> "LabeledMatrix":
+        self._check_aligned(other)
+        return LabeledMatrix(self.values - other.values, self.accounts, self.symbols)
+
+    def __add__(self, other: "LabeledMatrix") -> "LabeledMatrix":
+        self._check_aligned(other)
+        return LabeledMatrix(self.values + other.values, self.accounts, self.symbols)
+
+    def __repr__(self) -> str:
+        return f"LabeledMatrix({len(self.accounts)} accounts x {len(self.symbols)} symbols)"
@@ -0,0 +1,309 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from realloc.accounts import Account
+
+
+class PositionIndex:
+    """
+    Per-symbol index of holding accounts ordered by position size.
+
+    Every account that has a symbol as a key in ``positions`` is kept in a
+    sorted list for that symbol, so sell-side selection can find the largest
+    holder, or the largest holder at or below a quantity, with a binary search
+    instead of scanning and sorting all accounts. Ties are broken by the order
+    in which accounts were given, matching the list-based selectors.
+
+    The index does not watch accounts itself; ``PortfolioStateManager`` calls
+    ``update`` for every position it changes.
+    """
+
+    def __init__(self, accounts: Iterable[Account]):
+        self._account_ids: List[str] = []
+        self._rank: Dict[str, int] = {}
+        # symbol -> sorted [(qty, -rank)]; largest position (earliest account on ties) last
+        self._by_size: Dict[str, List[Tuple[float, int]]] = {}
+        # symbol -> sorted ranks of accounts holding a positive quantity
+        self._positive: Dict[str, List[int]] = {}
+
+        for account in accounts:
+            rank = len(self._account_ids)
+            self._account_ids.append(account.account_number)
+            self._rank[account.account_number] = rank
+            for symbol, qty in account.positions.items():
+                self._by_size.setdefault(symbol, []).append((qty, -rank))
+                if qty > 0:
+                    self._positive.setdefault(symbol, []).append(rank)
+
+        for entries in self._by_size.values():
+            entries.sort()
+
+    def update(
+            self,
+            account_id: str,
+            symbol: str,
+            old_qty: Optional[float],
+            new_qty: Optional[float],
+    ) -> None:
+        """
+        Record a position change.
+
+        Args:
+            account_id: Account whose position changed
+            symbol: Symbol that changed
+            old_qty: Previous quantity, or None if the account did not hold the symbol
+            new_qty: Quantity after the change, or None if the position was removed
+        """
+        self._update_rank(self._rank[account_id], symbol, old_qty, new_qty)
+
+    def update_many(
+            self, changes: Iterable[Tuple[str, str, Optional[float], Optional[float]]]
+    ) -> None:
+        """
+        Record many position changes at once.
+
+        Takes (account_id, symbol, old_qty, new_qty) tuples with the same
+        meaning as ``update``; each (account, symbol) pair may appear once.
+        Symbols with many changes relative to their holder count are re-sorted
+        in one go instead of being updated entry by entry.
+        """
+        by_symbol: Dict[str, List[Tuple[int, Optional[float], Optional[float]]]] = {}
+        for account_id, symbol, old_qty, new_qty in changes:
+            by_symbol.setdefault(symbol, []).append((self._rank[account_id], old_qty, new_qty))
+
+        for symbol, symbol_changes in by_symbol.items():
+            entries = self._by_size.get(symbol, [])
+            if len(symbol_changes) * 4 < len(entries):
+                for rank, old_qty, new_qty in symbol_changes:
+                    self._update_rank(rank, symbol, old_qty, new_qty)
+                continue
+
+            qty_by_rank = {-neg_rank: qty for qty, neg_rank in entries}
+            for rank, _, new_qty in symbol_changes:
+                if new_qty is None:
+                    qty_by_rank.pop(rank, None)
+                else:
+                    qty_by_rank[rank] = new_qty
+            self._by_size[symbol] = sorted((qty, -rank) for rank, qty in qty_by_rank.items())
+            self._positive[symbol] = sorted(rank for rank, qty in qty_by_rank.items() if qty > 0)
+
+    def _update_rank(
+            self, rank: int, symbol: str, old_qty: Optional[float], new_qty: Optional[float]
+    ) -> None:
+        entries = self._by_size.setdefault(symbol, [])
+        if old_qty is not None:
+            del entries[bisect_left(entries, (old_qty, -rank))]
+        if new_qty is not None:
+            insort(entries, (new_qty, -rank))
+
+        was_positive = old_qty is not None and old_qty > 0
+        if was_positive != (new_qty is not None and new_qty > 0):
+            positive = self._positive.setdefault(symbol, [])
+            if was_positive:
+                del positive[bisect_left(positive, rank)]
+            else:
+                insort(positive, rank)
+
+    def has_holders(self, symbol: str) -> bool:
+        """Whether any account has ``symbol`` in its positions, even at zero."""
+        return bool(self._by_size.get(symbol))
+
+    def holders(self, symbol: str) -> Iterator[Tuple[str, float]]:
+        """Yield (account_id, qty) for accounts holding a positive quantity, largest first."""
+        for qty, neg_rank in reversed(self._by_size.get(symbol, ())):
+            if qty <= 0:
+                return
+            yield self._account_ids[-neg_rank], qty
+
+    def largest_holder(self, symbol: str, at_most: Optional[float] = None) -> Optional[str]:
+        """
+        Account with the largest positive position in ``symbol``.
+
+        Args:
+            symbol: Symbol to look up
+            at_most: If given, only positions less than or equal to this are considered
+
+        Returns:
+            Account ID, or None if no account qualifies
+        """
+        entries = self._by_size.get(symbol)
+        if not entries:
+            return None
+        if at_most is None:
+            pos = len(entries)
+        else:
+            pos = bisect_right(entries, (at_most, float("inf")))
+        if pos == 0 or entries[pos - 1][0] <= 0:
+            return None
+        return self._account_ids[-entries[pos - 1][1]]
+
+    def first_holder(self, symbol: str) -> Optional[str]:
+        """First account, in account order, holding a positive quantity of ``symbol``."""
+        positive = self._positive.get(symbol)
+        return self._account_ids[positive[0]] if positive else None
+
+
+class CashIndex:
+    """
+    Buy-side index of accounts ordered by available cash.
+
+    Keeps three structures current as cash and holdings change:
+
+    - all accounts sorted by cash, for walking the richest accounts first
+    - a max-segment tree over account order, for finding the first account
+      (in account order) that can afford a given number of shares
+    - the set of holding accounts per symbol
+
+    ``select_for_buy`` answers ``select_account_for_buy_trade`` with these
+    instead of recomputing affordability for every account on every pass.
+    ``PortfolioStateManager`` calls ``set_cash`` and ``add_holding`` for every
+    change it makes.
+    """
+
+    def __init__(self, accounts: Iterable[Account], cash_matrix: Dict[str, float]):
+        self._accounts: List[Account] = list(accounts)
+        self._rank: Dict[str, int] = {
+            a.account_number: rank for rank, a in enumerate(self._accounts)
+        }
+        self._cash: List[float] = [
+            cash_matrix.get(a.account_number, 0.0) for a in self._accounts
+        ]
+        # sorted [(cash, -rank)]; richest (earliest account on ties) last
+        self._by_cash: List[Tuple[float, int]] = sorted(
+            (cash, -rank) for rank, cash in enumerate(self._cash)
+        )
+
+        self._size = 1
+        while self._size < len(self._accounts):
+            self._size *= 2
+        self._tree: List[float] = [float("-inf")] * (2 * self._size)
+        self._tree[self._size:self._size + len(self._cash)] = self._cash
+        for node in range(self._size - 1, 0, -1):
+            self._tree[node] = max(self._tree[2 * node], self._tree[2 * node + 1])
+
+        self._holders: Dict[str, set] = {}
+        for rank, account in enumerate(self._accounts):
+            for symbol in account.positions:
+                self._holders.setdefault(symbol, set()).add(rank)
+
+    def set_cash(self, account_id: str, cash: float) -> None:
+        """Record a new cash balance for an account."""
+        rank = self._rank[account_id]
+        old = self._cash[rank]
+        if old == cash:
+            return
+        self._cash[rank] = cash
+
+        del self._by_cash[bisect_left(self._by_cash, (old, -rank))]
+        insort(self._by_cash, (cash, -rank))
+
+        node = self._size + rank
+        self._tree[node] = cash
+        node //= 2
+        while node:
+            self._tree[node] = max(self._tree[2 * node], self._tree[2 * node + 1])
+            node //= 2
+
+    def add_holding(self, account_id: str, symbol: str) -> None:
+        """Record that an account now holds ``symbol``."""
+        self._holders.setdefault(symbol, set()).add(self._rank[account_id])
+
+    def add_holdings(self, holdings: Iterable[Tuple[str, str]]) -> None:
+        """Record many (account_id, symbol) holdings at once."""
+        rank_of = self._rank
+        holders = self._holders
+        for account_id, symbol in holdings:
+            ranks = holders.get(symbol)
+            if ranks is None:
+                ranks = holders[symbol] = set()
+            ranks.add(rank_of[account_id])
+
+    def remove_holding(self, account_id: str, symbol: str) -> None:
+        """Record that an account no longer holds ``symbol``."""
+        self._holders.get(symbol, set()).discard(self._rank[account_id])
+
+    def select_for_buy(self, symbol: str, trade_amount: int, price: float) -> Optional[str]:
+        """
+        Select an account for a buy with the same priority as ``select_account_for_buy_trade``:
+
+        1. Holder who can fully fulfill (largest position)
+        2. Holder who can partially fulfill (largest partial)
+        3. Non-holder who can fully fulfill (first in account order)
+        4. Non-holder who can partially fulfill (largest partial)
+        """
+        rank = self._select_holder(symbol, trade_amount, price)
+        if rank is None:
+            # No holder can afford a single share, so anyone who can is a non-holder
+            rank = self._first_affording(trade_amount, price)
+            if rank is None:
+                most_affordable = self._tree[1] // price
+                if most_affordable > 0:
+                    rank = self._first_affording(most_affordable, price)
+        return self._accounts[rank].account_number if rank is not None else None
+
+    def _select_holder(self, symbol: str, trade_amount: int, price: float) -> Optional[int]:
+        holders = self._holders.get(symbol)
+        if not holders:
+            return None
+
+        # Walk whichever is shorter: the holders, or the accounts able to buy a share
+        able = len(self._by_cash) - bisect_left(self._by_cash, (price, float("-inf")))
+        if len(holders) <= able:
+            return self._scan_holders(holders, symbol, trade_amount, price)
+        return self._walk_richest(holders, symbol, trade_amount, price)
+
+    def _scan_holders(
+            self, holders: set, symbol: str, trade_amount: int, price: float
+    ) -> Optional[int]:
+        best_full = None
+        best_partial = None
+        for rank in holders:
+            affordable = self._cash[rank] // price
+            if affordable >= trade_amount:
+                key = (self._accounts[rank].positions.get(symbol, 0), -rank)
+                if best_full is None or key > best_full:
+                    best_full = key
+            elif affordable > 0 and best_full is None:
+                key = (affordable, -rank)
+                if best_partial is None or key > best_partial:
+                    best_partial = key
+        if best_full is not None:
+            return -best_full[1]
+        if best_partial is not None:
+            return -best_partial[1]
+        return None
+
+    def _walk_richest(
+            self, holders: set, symbol: str, trade_amount: int, price: float
+    ) -> Optional[int]:
+        best_full = None
+        partial = None
+        for cash, neg_rank in reversed(self._by_cash):
+            affordable = cash // price
+            if affordable < trade_amount and (best_full is not None or not affordable > 0):
+                break
+            if partial is not None and affordable < partial[0]:
+                break
+            rank = -neg_rank
+            if rank not in holders:
+                continue
+            if affordable >= trade_amount:
+                key = (self._accounts[rank].positions.get(symbol, 0), neg_rank)
+                if best_full is None or key > best_full:
+                    best_full = key
+            elif partial is None or rank < partial[1]:
+                partial = (affordable, rank)
+        if best_full is not None:
+            return -best_full[1]
+        return partial[1] if partial is not None else None
+
+    def _first_affording(self, quantity: float, price: float) -> Optional[int]:
+        """First account, in account order, that can afford ``quantity`` shares."""
+        if not self._tree[1] // price >= quantity:
+            return None
+        node = 1
+        while node < self._size:
+            node *= 2
+            if not self._tree[node] // price >= quantity:
+                node += 1
+        return node - self._size
@@ -0,0 +1,56 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+class Interner:
+    """
+    Assigns dense integer IDs to string keys such as symbols or account numbers.
+
+    IDs are handed out in first-seen order starting at 0, so they can be used
+    directly as row or column indices into NumPy arrays.
+
+    Example:
+        >>> symbols = Interner(["AAPL", "MSFT"])
+        >>> symbols.intern("GOOG")
+        2
+        >>> symbols["MSFT"], symbols.key(0)
+        (1, 'AAPL')
+    """
+
+    def __init__(self, keys: Iterable[str] = ()):
+        self._ids: Dict[str, int] = {}
+        self._keys: List[str] = []
+        for key in keys:
+            self.intern(key)
+
+    def intern(self, key: str) -> int:
+        """ID for ``key``, assigning the next free ID if it is new."""
+        key_id = self._ids.get(key)
+        if key_id is None:
+            key_id = self._ids[key] = len(self._keys)
+            self._keys.append(key)
+        return key_id
+
+    def get(self, key: str, default: Optional[int] = None) -> Optional[int]:
+        """ID for ``key``, or ``default`` if it has not been interned."""
+        return self._ids.get(key, default)
+
+    def key(self, key_id: int) -> str:
+        """Key that was assigned ``key_id``."""
+        return self._keys[key_id]
+
+    @property
+    def keys(self) -> List[str]:
+        """All keys, in ID order."""
+        return self._keys
+
+    def __getitem__(self, key: str) -> int:
+        return self._ids[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
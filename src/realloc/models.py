@@ -1,7 +1,12 @@
-from typing import List, Optional, Dict
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Dict, Sequence, Tuple
+
+import numpy as np
 
 
 class PortfolioModel:
+    __slots__ = ("name", "enforce_long_only", "_targets", "_normalized", "_weight_array")
+
     def __init__(
         self,
         name: str,
@@ -19,22 +24,51 @@ class PortfolioModel:
                         f"Model contains short weight for {symbol}, which is not allowed in long-only mode."
                     )
 
+    @property
+    def targets(self) -> Dict[str, float]:
+        """
+        Raw target weights by symbol.
+
+        Change weights through add_target, update_target and remove_target (or
+        by assigning a new dict) so cached normalized weights stay current.
+        """
+        return self._targets
+
+    @targets.setter
+    def targets(self, value: Dict[str, float]) -> None:
+        self._targets = value
+        self._invalidate()
+
+    def __getstate__(self):
+        # Cached views are rebuilt on demand and cannot be pickled
+        return self.name, self.enforce_long_only, self._targets
+
+    def __setstate__(self, state) -> None:
+        self.name, self.enforce_long_only, self.targets = state
+
+    def _invalidate(self) -> None:
+        self._normalized: Optional[Mapping[str, float]] = None
+        self._weight_array: Optional[Tuple[Tuple[str, ...], np.ndarray]] = None
+
     def add_target(self, symbol: str, weight: float):
         if self.enforce_long_only and weight < 0:
             raise ValueError(
                 f"Cannot add short weight for {symbol} in long-only model."
             )
-        self.targets[symbol] = weight
+        self._targets[symbol] = weight
+        self._invalidate()
 
     def remove_target(self, symbol: str):
-        self.targets.pop(symbol, None)
+        self._targets.pop(symbol, None)
+        self._invalidate()
 
     def update_target(self, symbol: str, weight: float):
         if self.enforce_long_only and weight < 0:
             raise ValueError(
                 f"Cannot update to short weight for {symbol} in long-only model."
             )
-        self.targets[symbol] = weight
+        self._targets[symbol] = weight
+        self._invalidate()
 
     def get_target(self, symbol: str) -> Optional[float]:
         return self.targets.get(symbol)
@@ -48,18 +82,80 @@ class PortfolioModel:
         become {A: 0.4, B: 0.4, C: 0.2}.
 
         Returns:
-            Dict[str, float]: A dictionary mapping symbols to their normalized weights.
-            If the sum of target weights is 0, returns the original targets unchanged.
+            Dict[str, float]: A new dictionary mapping symbols to their normalized weights.
+            If the sum of target weights is 0, the weights are returned unchanged.
 
         Example:
             >>> model = PortfolioModel("Example", {"AAPL": 40, "MSFT": 40, "GOOG": 20})
             >>> model.normalize()
             {'AAPL': 0.4, 'MSFT': 0.4, 'GOOG': 0.2}
         """
-        total = sum(self.targets.values())
-        if total == 0:
-            return self.targets
-        return {symbol: weight / total for symbol, weight in self.targets.items()}
+        return dict(self.normalized)
+
+    @property
+    def normalized(self) -> Mapping[str, float]:
+        """
+        Normalized weights as a read-only mapping.
+
+        Computed once and cached until the targets change, so it can be
+        shared between callers (e.g. one per account) without copying.
+        """
+        if self._normalized is None:
+            total = sum(self._targets.values())
+            if total == 0:
+                normalized = dict(self._targets)
+            else:
+                normalized = {symbol: weight / total for symbol, weight in self._targets.items()}
+            self._normalized = MappingProxyType(normalized)
+        return self._normalized
+
+    def normalized_array(self) -> Tuple[Tuple[str, ...], np.ndarray]:
+        """
+        Normalized weights as parallel symbol and weight columns.
+
+        Returns:
+            Tuple of (symbols, weights); the weight array is cached and read-only
+        """
+        if self._weight_array is None:
+            normalized = self.normalized
+            weights = np.fromiter(normalized.values(), dtype=np.float64, count=len(normalized))
+            weights.flags.writeable = False
+            self._weight_array = (tuple(normalized), weights)
+        return self._weight_array
+
+    @classmethod
+    def from_columns(
+        cls,
+        name: str,
+        symbols: Sequence[str],
+        weights: Sequence[float],
+        enforce_long_only: bool = True,
+    ) -> "PortfolioModel":
+        """
+        Build a model from parallel symbol and weight columns.
+
+        Weights are checked for long-only compliance in one array operation.
+
+        Raises:
+            ValueError: If the columns differ in length or a weight is short while long-only
+        """
+        symbols = list(symbols)
+        weight_values = np.asarray(weights, dtype=np.float64)
+        if len(symbols) != len(weight_values):
+            raise ValueError("symbols and weights must have the same length")
+        if enforce_long_only:
+            short = np.flatnonzero(weight_values < 0)
+            if len(short):
+                raise ValueError(
+                    f"Model contains short weight for {symbols[short[0]]}, "
+                    f"which is not allowed in long-only mode."
+                )
+
+        model = cls.__new__(cls)
+        model.name = name
+        model.enforce_long_only = enforce_long_only
+        model.targets = dict(zip(symbols, weight_values.tolist()))
+        return model
 
     def to_dict(self) -> Dict:
         return {"name": self.name, "targets": self.targets}
@@ -1,3 +1,4 @@
 from .discovery import get_plugin_list, list_plugins
+from .registry import PluginRegistry, plugin_registry
 
-__all__ = ['get_plugin_list', 'list_plugins']
+__all__ = ['get_plugin_list', 'list_plugins', 'PluginRegistry', 'plugin_registry']
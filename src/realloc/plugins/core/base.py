@@ -1,10 +1,15 @@
 import datetime
+import time
 from abc import ABC, abstractmethod
-import importlib.metadata
+from dataclasses import dataclass
+from enum import Enum
 from pathlib import Path
-from typing import TypeVar, Type, Any, List, TYPE_CHECKING, Dict
+from typing import TypeVar, Type, Any, List, TYPE_CHECKING, Dict, Optional
+
+from .registry import plugin_registry
 
 if TYPE_CHECKING:
+    from ...portfolio import PortfolioStateManager
     from ...trades import Trade
 
 
@@ -25,6 +30,9 @@ class Plugin(ABC):
         """
         Generic plugin loader for any plugin type.
 
+        Plugins are looked up in the process-wide ``plugin_registry``, which
+        scans entry points once and caches loaded classes.
+
         Args:
             name: Name of the plugin to load
             **kwargs: Configuration parameters for the plugin
@@ -36,21 +44,7 @@ class Plugin(ABC):
             ValueError: If plugin not found or invalid
         """
         try:
-            entry_points = importlib.metadata.entry_points()
-
-            # Handle different entry_points return types across Python versions
-            if hasattr(entry_points, "select"):
-                matches = list(entry_points.select(group="realloc.plugins", name=name))
-            else:
-                matches = [
-                    ep for ep in entry_points.get("realloc.plugins", [])
-                    if ep.name == name
-                ]
-
-            if not matches:
-                raise ValueError(f"No plugin named '{name}' found")
-
-            plugin_class = matches[0].load()
+            plugin_class = plugin_registry.load(name)
             if not isinstance(plugin_class, type) or not issubclass(plugin_class, cls):
                 raise ValueError(
                     f"Plugin '{name}' is not a valid {cls.__name__}. "
@@ -127,10 +121,93 @@ class Exporter(Plugin):
         return cls.load_plugin(name, **kwargs)
 
 
+class RebalanceStatus(Enum):
+    """Why a rebalance stopped"""
+    COMPLETE = "complete"                # no portfolio trades remain
+    STALLED = "stalled"                  # a pass could not place any trade
+    MAX_ITERATIONS = "max_iterations"    # iteration limit reached
+    DEADLINE = "deadline"                # time budget ran out
+
+
+@dataclass
+class RebalanceResult:
+    """
+    Trades placed by a rebalance and what is left to do.
+
+    ``portfolio_trades`` is the residual symbol -> quantity still to trade.
+    """
+    trades: List["Trade"]
+    portfolio_trades: Dict[str, int]
+    status: RebalanceStatus
+
+    @property
+    def stopped_early(self) -> bool:
+        """True if the rebalance hit its iteration limit or deadline."""
+        return self.status in (RebalanceStatus.MAX_ITERATIONS, RebalanceStatus.DEADLINE)
 
 
 class RebalancerPlugin(Plugin):
-    """Base class for rebalancing plugins"""
+    """
+    Base class for rebalancing plugins
+
+    Args:
+        time_budget: Optional default wall-clock budget in seconds for each
+            rebalance run by this plugin
+    """
+
+    def __init__(self, time_budget: Optional[float] = None):
+        if time_budget is not None and time_budget < 0:
+            raise ValueError("time_budget cannot be negative")
+        self.time_budget = time_budget
+
+    def _resolve_deadline(
+            self,
+            time_budget: Optional[float] = None,
+            deadline: Optional[float] = None,
+    ) -> Optional[float]:
+        """Earliest of ``deadline`` and now + budget, as a ``time.monotonic()`` value."""
+        if time_budget is None:
+            time_budget = getattr(self, "time_budget", None)
+        if time_budget is not None:
+            budget_deadline = time.monotonic() + time_budget
+            deadline = budget_deadline if deadline is None else min(deadline, budget_deadline)
+        return deadline
+
+    def rebalance(
+            self,
+            portfolio_state: "PortfolioStateManager",
+            target_shares: Dict[str, float],
+            max_iterations: int = 100,
+            time_budget: Optional[float] = None,
+            deadline: Optional[float] = None,
+    ) -> RebalanceResult:
+        """
+        Rebalance and report why it stopped.
+
+        Args:
+            portfolio_state: Portfolio state to trade against
+            target_shares: Dictionary of target shares per symbol
+            max_iterations: Maximum number of iterations to attempt
+            time_budget: Seconds allowed for this call; overrides the plugin's
+                ``time_budget``
+            deadline: Absolute ``time.monotonic()`` time to stop at
+
+        Returns:
+            RebalanceResult with the trades placed so far, the residual
+            portfolio trades and a status
+
+        Plugins that only implement ``execute_rebalance`` run to completion
+        regardless of the deadline and report COMPLETE or STALLED.
+        """
+        from ...trades import is_trade_remaining
+
+        trades = self.execute_rebalance(portfolio_state, target_shares, max_iterations)
+        residual = dict(portfolio_state.portfolio_trades)
+        status = (
+            RebalanceStatus.STALLED if is_trade_remaining(residual)
+            else RebalanceStatus.COMPLETE
+        )
+        return RebalanceResult(trades, residual, status)
 
     @abstractmethod
     def execute_rebalance(
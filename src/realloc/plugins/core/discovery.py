@@ -1,34 +1,26 @@
 # src/realloc/plugins/core/discovery.py
+import logging
 from typing import Dict, List
-from importlib.metadata import entry_points
 
+from .registry import plugin_registry
+
+logger = logging.getLogger(__name__)
 
-def get_plugin_list() -> Dict[str, List[str]]:
-    plugins = {"exporters": [], "validators": [], "rebalancers": []}
-
-    discovered_plugins = entry_points().get('realloc.plugins', [])
-    print("DEBUG - All discovered plugins:")
-    for plugin in discovered_plugins:
-        print(f"  {plugin.name}: {plugin.value}")
-
-    for plugin in discovered_plugins:
-        class_name = plugin.value.split(':')[1]
-        if class_name.endswith('Exporter'):
-            plugins["exporters"].append(plugin.name)
-        elif class_name.endswith('Validator'):
-            plugins["validators"].append(plugin.name)
-        elif class_name.endswith('Rebalancer'):
-            plugins["rebalancers"].append(plugin.name)
 
+def get_plugin_list() -> Dict[str, List[str]]:
+    plugins = {
+        plugin_type: plugin_registry.names(plugin_type)
+        for plugin_type in ("exporters", "validators", "rebalancers")
+    }
+    logger.debug(f"Discovered plugins: {plugin_registry.names()}")
     return plugins
 
 
 def get_plugin(name: str):
-    plugins = entry_points().get('realloc.plugins', [])
-    for plugin in plugins:
-        if plugin.name == name:
-            return plugin.load()
-    raise ValueError(f"Plugin {name} not found")
+    try:
+        return plugin_registry.load(name)
+    except ValueError:
+        raise ValueError(f"Plugin {name} not found")
 
 
 
@@ -0,0 +1,118 @@
+import importlib.metadata
+import threading
+from typing import Any, Dict, List, Optional
+
+PLUGIN_GROUP = "realloc.plugins"
+
+# Class-name suffix -> plugin type, used to group plugins for listing
+PLUGIN_TYPES = {
+    "Exporter": "exporters",
+    "Validator": "validators",
+    "Rebalancer": "rebalancers",
+    "Importer": "importers",
+}
+
+
+class PluginRegistry:
+    """
+    Process-wide index of installed realloc plugins.
+
+    Entry points are scanned once, on first use, and kept by name and by
+    plugin type. Plugin classes are imported lazily the first time they are
+    loaded and then cached. Call ``refresh`` after installing plugins or
+    patching entry points (e.g. in tests) to rescan.
+    """
+
+    def __init__(self, group: str = PLUGIN_GROUP):
+        self.group = group
+        self._lock = threading.Lock()
+        self._entry_points: Optional[Dict[str, Any]] = None
+        self._by_type: Dict[str, List[str]] = {}
+        self._classes: Dict[str, Any] = {}
+
+    def refresh(self) -> None:
+        """Forget scanned entry points and loaded classes; the next lookup rescans."""
+        with self._lock:
+            self._entry_points = None
+            self._by_type = {}
+            self._classes = {}
+
+    def _scan(self) -> Dict[str, Any]:
+        entry_points = self._entry_points
+        if entry_points is not None:
+            return entry_points
+
+        with self._lock:
+            if self._entry_points is None:
+                discovered = importlib.metadata.entry_points()
+
+                # Handle different entry_points return types across Python versions
+                if hasattr(discovered, "select"):
+                    group = discovered.select(group=self.group)
+                else:
+                    group = discovered.get(self.group, [])
+
+                by_name: Dict[str, Any] = {}
+                by_type: Dict[str, List[str]] = {t: [] for t in PLUGIN_TYPES.values()}
+                for entry_point in group:
+                    if entry_point.name in by_name:
+                        continue
+                    by_name[entry_point.name] = entry_point
+                    plugin_type = self._plugin_type(entry_point)
+                    if plugin_type is not None:
+                        by_type[plugin_type].append(entry_point.name)
+
+                self._by_type = by_type
+                self._entry_points = by_name
+            return self._entry_points
+
+    @staticmethod
+    def _plugin_type(entry_point: Any) -> Optional[str]:
+        class_name = getattr(entry_point, "value", "").rpartition(":")[2]
+        for suffix, plugin_type in PLUGIN_TYPES.items():
+            if class_name.endswith(suffix):
+                return plugin_type
+        return None
+
+    def names(self, plugin_type: Optional[str] = None) -> List[str]:
+        """
+        Names of registered plugins.
+
+        Args:
+            plugin_type: Optional type such as ``"exporters"`` to filter by
+
+        Returns:
+            Plugin names in discovery order
+        """
+        entry_points = self._scan()
+        if plugin_type is None:
+            return list(entry_points)
+        return list(self._by_type.get(plugin_type, []))
+
+    def get_entry_point(self, name: str) -> Any:
+        """
+        Entry point registered under ``name``.
+
+        Raises:
+            ValueError: If no plugin with that name is registered
+        """
+        entry_point = self._scan().get(name)
+        if entry_point is None:
+            raise ValueError(f"No plugin named '{name}' found")
+        return entry_point
+
+    def load(self, name: str) -> Any:
+        """
+        Import and return the object registered under ``name``.
+
+        Raises:
+            ValueError: If no plugin with that name is registered
+        """
+        loaded = self._classes.get(name)
+        if loaded is None:
+            loaded = self.get_entry_point(name).load()
+            self._classes[name] = loaded
+        return loaded
+
+
+plugin_registry = PluginRegistry()
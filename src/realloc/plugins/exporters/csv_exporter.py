@@ -1,7 +1,8 @@
 from realloc import Trade
+from realloc.trades import TradeBuffer
 from realloc.plugins.core.base import Exporter
 import csv
-from typing import Dict, List
+from typing import Iterable
 
 
 class CSVExporter(Exporter):
@@ -12,13 +13,17 @@ class CSVExporter(Exporter):
     def name(self) -> str:
         return "csv"
 
-    def export(self, trades: List[Trade]) -> None:
+    def export(self, trades: Iterable[Trade]) -> None:
         with open(self.path, mode="w", newline="") as f:
             writer = csv.writer(f)
             writer.writerow(["Account", "Symbol", "Shares"])
+            if isinstance(trades, TradeBuffer):
+                # Write straight from the columns without building Trade objects
+                writer.writerows(trades.rows())
+                return
             for trade in trades:
                 writer.writerow([
                     trade.account_id,
                     trade.symbol,
                     trade.shares
-                ])
\ No newline at end of file
+                ])
@@ -1,7 +1,6 @@
-from collections import defaultdict
 import csv
 from pathlib import Path
-from typing import List, Dict, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 from realloc.accounts import Account
 from realloc.plugins.core.base import AccountImporter
@@ -11,6 +10,7 @@ class CSVAccountImporter(AccountImporter):
     """Importer plugin for account positions from CSV files"""
 
     CASH_SYMBOL = "CASH"
+    REQUIRED_FIELDS = ('Account Label', 'Account Id', 'Symbol', 'Shares')
 
     @property
     def name(self) -> str:
@@ -21,69 +21,145 @@ class CSVAccountImporter(AccountImporter):
         return ['.csv']
 
     def account_importer(self, path: Path, return_dicts: bool = False) -> Union[List[Account], List[Dict]]:
-        """Import account data from a CSV file. Requires a CASH position for each account."""
-        account_positions = defaultdict(dict)
-        account_details = {}  # Store account label and ID
-        account_has_cash = set()  # Track which accounts have CASH position
-        all_accounts = set()  # Track all accounts regardless of positions
+        """
+        Import account data from a CSV file. Requires a CASH position for each account.
+
+        The file is read once. Accounts are returned in the order they first
+        appear; rows for an account do not need to be contiguous.
+        """
+        # account_id -> [label, cash, positions]; cash stays None until a CASH row is seen
+        accounts: Dict[str, list] = {}
+
+        for account_id, label, symbol, shares in self._read_rows(path):
+            entry = accounts.get(account_id)
+            if entry is None:
+                entry = accounts[account_id] = [label, None, {}]
+            else:
+                entry[0] = label
+
+            if symbol == self.CASH_SYMBOL:
+                if entry[1] is None:
+                    entry[1] = shares
+            else:
+                entry[2][symbol] = shares
+
+        # Validate CASH positions
+        accounts_without_cash = [
+            account_id for account_id, entry in accounts.items() if entry[1] is None
+        ]
+        if accounts_without_cash:
+            raise ValueError(
+                "The following accounts are missing required CASH position: "
+                f"{', '.join(accounts_without_cash)}"
+            )
 
+        return [
+            self._build_account(account_id, label, cash, positions, return_dicts)
+            for account_id, (label, cash, positions) in accounts.items()
+        ]
+
+    def iter_accounts(
+            self, path: Path, return_dicts: bool = False
+    ) -> Iterator[Union[Account, Dict]]:
+        """
+        Stream accounts from a CSV file whose rows are grouped by account.
+
+        Each account is yielded as soon as the next account's first row is
+        read, so only one account is held in memory at a time.
+
+        Raises:
+            ValueError: If an account is missing its CASH row, or if an
+                account's rows are not contiguous
+        """
+        current: Optional[str] = None
+        label = ""
+        cash: Optional[float] = None
+        positions: Dict[str, float] = {}
+        finished = set()
+
+        for account_id, row_label, symbol, shares in self._read_rows(path):
+            if account_id != current:
+                if current is not None:
+                    yield self._finish_streamed(current, label, cash, positions, return_dicts)
+                    finished.add(current)
+                if account_id in finished:
+                    raise ValueError(
+                        f"Rows for account {account_id} are not contiguous; "
+                        f"use account_importer for unsorted files"
+                    )
+                current, cash, positions = account_id, None, {}
+            label = row_label
+
+            if symbol == self.CASH_SYMBOL:
+                if cash is None:
+                    cash = shares
+            else:
+                positions[symbol] = shares
+
+        if current is not None:
+            yield self._finish_streamed(current, label, cash, positions, return_dicts)
+
+    def _finish_streamed(
+            self,
+            account_id: str,
+            label: str,
+            cash: Optional[float],
+            positions: Dict[str, float],
+            return_dicts: bool,
+    ) -> Union[Account, Dict]:
+        if cash is None:
+            raise ValueError(
+                f"The following accounts are missing required CASH position: {account_id}"
+            )
+        return self._build_account(account_id, label, cash, positions, return_dicts)
+
+    @staticmethod
+    def _build_account(
+            account_id: str,
+            label: str,
+            cash: float,
+            positions: Dict[str, float],
+            return_dicts: bool,
+    ) -> Union[Account, Dict]:
+        account_data = {
+            "label": label,
+            "account_number": account_id,
+            "cash": cash,
+            "positions": positions,
+            "enforce_no_negative_positions": False
+        }
+        return account_data if return_dicts else Account(**account_data)
+
+    def _read_rows(self, path: Path) -> Iterator[Tuple[str, str, str, float]]:
+        """Yield (account_id, label, symbol, shares) for every data row in the file."""
         with open(path, 'r', newline='', encoding='utf-8-sig') as csvfile:
-            reader = csv.DictReader(csvfile)
+            reader = csv.reader(csvfile)
 
             # Clean up field names to handle BOM and whitespace
-            expected_fields = {'Account Label', 'Account Id', 'Symbol', 'Shares'}
-            actual_fields = {field.strip() for field in reader.fieldnames or []}
+            fieldnames = [field.strip() for field in next(reader, [])]
 
             # Validate required columns
-            if not expected_fields.issubset(actual_fields):
-                missing = expected_fields - actual_fields
+            missing = set(self.REQUIRED_FIELDS) - set(fieldnames)
+            if missing:
                 raise ValueError(f"Missing required columns: {missing}")
 
-            for row in reader:
-                row = {k.strip(): v.strip() for k, v in row.items()}
-                account_id = row['Account Id']
-                symbol = row['Symbol']
+            label_col, id_col, symbol_col, shares_col = (
+                fieldnames.index(field) for field in self.REQUIRED_FIELDS
+            )
+            width = len(fieldnames)
 
-                # Track all accounts encountered
-                all_accounts.add(account_id)
+            for row in reader:
+                if not row:
+                    continue
+                if len(row) < width:
+                    row = row + [''] * (width - len(row))
 
+                symbol = row[symbol_col].strip()
                 try:
-                    shares = float(row['Shares'])
+                    shares = float(row[shares_col])
                 except ValueError:
-                    raise ValueError(f"Invalid share amount for {symbol}: {row['Shares']}")
-
-                if symbol == self.CASH_SYMBOL:
-                    account_has_cash.add(account_id)
-                else:
-                    account_positions[account_id][symbol] = shares
-
-                account_details[account_id] = row['Account Label']
-
-        # Validate CASH positions
-        accounts_without_cash = all_accounts - account_has_cash
-        if accounts_without_cash:
-            raise ValueError(
-                f"The following accounts are missing required CASH position: {', '.join(accounts_without_cash)}"
-            )
-
-        # Create accounts list, now including those with only CASH
-        accounts = []
-        for account_id in all_accounts:
-            account_data = {
-                "label": account_details[account_id],
-                "account_number": account_id,
-                "cash": next(
-                    float(row['Shares'])
-                    for row in csv.DictReader(open(path))
-                    if row['Account Id'].strip() == account_id and row['Symbol'].strip() == self.CASH_SYMBOL
-                ),
-                "positions": account_positions.get(account_id, {}),
-                "enforce_no_negative_positions": False
-            }
-
-            if return_dicts:
-                accounts.append(account_data)
-            else:
-                accounts.append(Account(**account_data))
+                    raise ValueError(
+                        f"Invalid share amount for {symbol}: {row[shares_col].strip()}"
+                    )
 
-        return accounts
\ No newline at end of file
+                yield row[id_col].strip(), row[label_col].strip(), symbol, shares
@@ -1,14 +1,19 @@
 from datetime import datetime
 import csv
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from realloc.plugins.core.base import PriceImporter
+from realloc.price_history import PriceHistory
 
 
 class PricesCSVImporter(PriceImporter):
     """CSV implementation of price importer plugin"""
 
+    def __init__(self):
+        # path -> ((mtime_ns, size), parsed history) for date queries
+        self._histories: Dict[Path, Tuple[Tuple[int, int], PriceHistory]] = {}
+
     @property
     def name(self) -> str:
         return "price_csv"
@@ -21,6 +26,10 @@ class PricesCSVImporter(PriceImporter):
         """
         Import price data from a CSV file
 
+        Dated lookups are answered from a ``PriceHistory`` that is parsed once
+        per file and reused until the file changes, so repeated calls for
+        different dates do not rescan the CSV.
+
         Args:
             path: Path to the CSV file
             date: Optional date for historical prices. If None, uses most recent price.
@@ -28,6 +37,12 @@ class PricesCSVImporter(PriceImporter):
         Returns:
             Dict mapping symbols to their prices
         """
+        if date:
+            prices = self.history(path).prices_on(date)
+            if not prices:
+                raise ValueError("No valid prices found in CSV file")
+            return prices
+
         prices = {}
 
         with open(path, 'r', newline='', encoding='utf-8-sig') as csvfile:
@@ -35,9 +50,6 @@ class PricesCSVImporter(PriceImporter):
 
             # Validate required columns
             expected_fields = {'Symbol', 'Price'}
-            if date:
-                expected_fields.add('Date')
-
             actual_fields = {field.strip() for field in reader.fieldnames or []}
 
             if not expected_fields.issubset(actual_fields):
@@ -48,12 +60,6 @@ class PricesCSVImporter(PriceImporter):
             for row in reader:
                 row = {k.strip(): v.strip() for k, v in row.items()}
 
-                # Skip rows not matching the requested date
-                if date and row.get('Date'):
-                    row_date = datetime.strptime(row['Date'], '%Y-%m-%d')
-                    if row_date.date() != date.date():
-                        continue
-
                 symbol = row['Symbol']
                 try:
                     price = float(row['Price'])
@@ -68,4 +74,20 @@ class PricesCSVImporter(PriceImporter):
         if not prices:
             raise ValueError("No valid prices found in CSV file")
 
-        return prices
\ No newline at end of file
+        return prices
+
+    def history(self, path: Path) -> PriceHistory:
+        """
+        Return the parsed price history for a CSV file with a ``Date`` column.
+
+        The history is cached per path and rebuilt when the file's size or
+        modification time changes.
+        """
+        path = Path(path)
+        stat = path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._histories.get(path)
+        if cached is None or cached[0] != signature:
+            cached = (signature, PriceHistory.from_csv(path))
+            self._histories[path] = cached
+        return cached[1]
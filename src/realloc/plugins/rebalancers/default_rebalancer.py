@@ -1,8 +1,10 @@
 import logging
-from typing import Dict, List
+import time
+from typing import Dict, List, Optional
 
-from realloc import Trade, PortfolioStateManager
-from realloc.plugins.core.base import RebalancerPlugin
+from realloc import Account, Trade, PortfolioStateManager
+from realloc.plugins.core.base import RebalanceResult, RebalanceStatus, RebalancerPlugin
+from realloc.scheduler import TradeScheduler
 from realloc import (
     select_account_for_buy_trade,
     select_account_for_sell_trade,
@@ -13,8 +15,32 @@ logger = logging.getLogger(__name__)
 
 MIN_TRADE_QTY = 1
 
+# Fill strategies: one account per symbol per pass, or as many as it takes
+FILL_SINGLE = "single"
+FILL_EXHAUST = "exhaust"
+FILL_STRATEGIES = (FILL_SINGLE, FILL_EXHAUST)
+
+
 class DefaultRebalancer(RebalancerPlugin):
-    """Default implementation of the rebalancer plugin"""
+    """
+    Default implementation of the rebalancer plugin
+
+    Args:
+        fill_strategy: ``"single"`` (default) places at most one trade per
+            symbol per pass. ``"exhaust"`` keeps filling a symbol from the
+            next account chosen by the same selectors until its quantity is
+            used up or no account can take more, so iterations scale with
+            symbols rather than fills.
+        time_budget: Optional wall-clock budget in seconds
+    """
+
+    def __init__(self, fill_strategy: str = FILL_SINGLE, time_budget: Optional[float] = None):
+        super().__init__(time_budget=time_budget)
+        if fill_strategy not in FILL_STRATEGIES:
+            raise ValueError(
+                f"Unknown fill strategy '{fill_strategy}'; expected one of {FILL_STRATEGIES}"
+            )
+        self.fill_strategy = fill_strategy
 
     @property
     def name(self) -> str:
@@ -26,67 +52,134 @@ class DefaultRebalancer(RebalancerPlugin):
             target_shares: Dict[str, float],
             max_iterations: int
     ) -> List[Trade]:
+        return self.rebalance(portfolio_state, target_shares, max_iterations).trades
+
+    def rebalance(
+            self,
+            portfolio_state: PortfolioStateManager,
+            target_shares: Dict[str, float],
+            max_iterations: int = 100,
+            time_budget: Optional[float] = None,
+            deadline: Optional[float] = None,
+    ) -> RebalanceResult:
+        deadline = self._resolve_deadline(time_budget, deadline)
         iteration = 0
         account_trades = []
+        accounts = list(portfolio_state.accounts.values())
+        scheduler = TradeScheduler(portfolio_state.portfolio_trades)
 
-        while is_trade_remaining(portfolio_state.portfolio_trades) and iteration < max_iterations:
-            sorted_trades = sorted(
-                portfolio_state.portfolio_trades.items(),
-                key=lambda item: (item[1] > 0, abs(item[1]))
-            )
+        while True:
+            if not is_trade_remaining(portfolio_state.portfolio_trades):
+                status = RebalanceStatus.COMPLETE
+                break
+            if iteration >= max_iterations:
+                status = RebalanceStatus.MAX_ITERATIONS
+                logger.warning("Max iterations reached. Some trades may be unresolved.")
+                break
+
+            sorted_trades = scheduler.next_pass()
             made_trade = False
+            timed_out = False
 
             for symbol, qty in sorted_trades:
-                direction = "buy" if qty > 0 else "sell"
-                qty_remaining = abs(qty)
-
-                account_id = (
-                    select_account_for_buy_trade(
-                        symbol,
-                        qty_remaining,
-                        list(portfolio_state.accounts.values()),
-                        portfolio_state.prices,
-                        portfolio_state.cash_matrix,
-                    )
-                    if direction == "buy"
-                    else select_account_for_sell_trade(
-                        symbol, qty_remaining, list(portfolio_state.accounts.values())
-                    )
-                )
-
-                if account_id is None:
-                    logger.warning(f"Cannot find account to {direction} {qty_remaining} {symbol}")
-                    continue
+                if deadline is not None and time.monotonic() >= deadline:
+                    timed_out = True
+                    break
 
-                account = portfolio_state.accounts[account_id]
-                if direction == "buy":
-                    max_affordable = int(portfolio_state.cash_matrix[account_id] // portfolio_state.prices[symbol])
-                    qty_to_trade = min(qty_remaining, max_affordable)
-                else:
-                    qty_to_trade = min(qty_remaining, int(account.positions.get(symbol, 0)))
-
-                if qty_to_trade == 0:
+                trade = self._fill(portfolio_state, accounts, target_shares, symbol, qty)
+                if trade is None:
                     continue
-
-                trade_qty = qty_to_trade if direction == "buy" else -qty_to_trade
-                single_trade = Trade(account_id, symbol, trade_qty)
-                account_trades.append(single_trade)
-
-                logger.info(
-                    f"Executing {direction} of {qty_to_trade} {symbol} in account {account_id}"
-                )
-
-                portfolio_state.update([single_trade])
-                portfolio_state.update_portfolio_trades(target_shares)
+                account_trades.append(trade)
+                scheduler.refresh(portfolio_state.portfolio_trades, (symbol,))
                 made_trade = True
 
+                if self.fill_strategy == FILL_EXHAUST:
+                    # Keep filling the same symbol from the next best account
+                    # until it is done or no account can take more
+                    while True:
+                        remaining = portfolio_state.portfolio_trades.get(symbol, 0)
+                        if remaining == 0 or (remaining > 0) != (qty > 0):
+                            break
+                        if deadline is not None and time.monotonic() >= deadline:
+                            timed_out = True
+                            break
+                        trade = self._fill(
+                            portfolio_state, accounts, target_shares, symbol, remaining
+                        )
+                        if trade is None:
+                            break
+                        account_trades.append(trade)
+                        scheduler.refresh(portfolio_state.portfolio_trades, (symbol,))
+                    if timed_out:
+                        break
+
+            if timed_out:
+                status = RebalanceStatus.DEADLINE
+                logger.warning("Time budget exhausted. Some trades may be unresolved.")
+                break
+
             if not made_trade:
                 # If we couldn't make any trades in this iteration, break to avoid infinite loop
+                status = RebalanceStatus.STALLED
                 break
 
             iteration += 1
 
-        if iteration >= max_iterations:
-            logger.warning("Max iterations reached. Some trades may be unresolved.")
+        return RebalanceResult(account_trades, dict(portfolio_state.portfolio_trades), status)
+
+    @staticmethod
+    def _fill(
+            portfolio_state: PortfolioStateManager,
+            accounts: List[Account],
+            target_shares: Dict[str, float],
+            symbol: str,
+            qty: int,
+    ) -> Optional[Trade]:
+        """Place one trade for ``symbol`` in the selected account; None if none can be made."""
+        direction = "buy" if qty > 0 else "sell"
+        qty_remaining = abs(qty)
+
+        account_id = (
+            select_account_for_buy_trade(
+                symbol,
+                qty_remaining,
+                accounts,
+                portfolio_state.prices,
+                portfolio_state.cash_matrix,
+                cash_index=portfolio_state.cash_index,
+            )
+            if direction == "buy"
+            else select_account_for_sell_trade(
+                symbol,
+                qty_remaining,
+                accounts,
+                position_index=portfolio_state.position_index,
+            )
+        )
+
+        if account_id is None:
+            logger.warning(f"Cannot find account to {direction} {qty_remaining} {symbol}")
+            return None
+
+        account = portfolio_state.accounts[account_id]
+        if direction == "buy":
+            max_affordable = int(
+                portfolio_state.cash_matrix[account_id] // portfolio_state.prices[symbol]
+            )
+            qty_to_trade = min(qty_remaining, max_affordable)
+        else:
+            qty_to_trade = min(qty_remaining, int(account.positions.get(symbol, 0)))
+
+        if qty_to_trade == 0:
+            return None
+
+        trade_qty = qty_to_trade if direction == "buy" else -qty_to_trade
+        single_trade = Trade(account_id, symbol, trade_qty)
+
+        logger.info(
+            f"Executing {direction} of {qty_to_trade} {symbol} in account {account_id}"
+        )
 
-        return account_trades
\ No newline at end of file
+        portfolio_state.update([single_trade])
+        portfolio_state.update_portfolio_trades(target_shares)
+        return single_trade
@@ -0,0 +1,474 @@
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from realloc import Trade, PortfolioStateManager
+from realloc.plugins.core.base import RebalanceResult, RebalanceStatus, RebalancerPlugin
+from realloc.plugins.rebalancers.default_rebalancer import DefaultRebalancer
+from realloc.plugins.rebalancers.vectorized_rebalancer import VectorizedRebalancer
+from realloc import is_trade_remaining
+
+logger = logging.getLogger(__name__)
+
+# Shares within this distance of a whole number are rounded to it instead of down
+ROUNDING_TOLERANCE = 1e-6
+
+
+def _load_scipy():
+    """Return (optimize, sparse) from SciPy, or None if it is not installed."""
+    try:
+        from scipy import optimize, sparse
+    except ImportError:
+        return None
+    return optimize, sparse
+
+
+class OptimalRebalancer(RebalancerPlugin):
+    """
+    Rebalancer that assigns every portfolio trade to accounts in one solve.
+
+    Sells and buys are modelled as a program over (account, symbol) share
+    quantities: each sell is bounded by the account's position, each symbol
+    by its remaining portfolio trade, and each account's buys by its cash
+    plus the proceeds of its own sells. The objective maximizes the traded
+    value, which minimizes the residual ``portfolio_trades``, less a fixed
+    charge for every trade made. The charge is below the value of one share
+    of the cheapest symbol, so it only decides between plans that fill the
+    same value. Buys in accounts that already hold the symbol get a small
+    bonus, mirroring the holder-first tiers of the greedy selectors.
+
+    Small problems are solved as an integer program with one binary per
+    (account, symbol) pair (SciPy's ``milp``); larger ones as its linear
+    relaxation, with the charge spread over each pair's shares (``linprog``).
+    Both run under ``solver_time_limit``. Fills are then rounded down to
+    whole shares and the rounding residue is repaired with the same tiered
+    account selection as ``VectorizedRebalancer``. Without SciPy, the repair
+    step alone is used as a greedy fallback.
+
+    The plan ``DefaultRebalancer`` would make is computed as well, inside a
+    rolled-back transaction, and used instead when it leaves less value
+    unfilled, or the same value with fewer trades.
+
+    Args:
+        holder_bonus: Relative objective bonus for buying in an account that
+            already holds the symbol
+        max_candidates: How many of the largest holders (and, for buys, of
+            the best funded accounts) the solver may use for each symbol;
+            the rest of each trade is left to the greedy repair
+        milp_max_variables: Largest problem (in pairs) solved as an integer
+            program
+        trade_cost: Charge per trade, as a fraction of the value of one
+            share of the cheapest symbol; must be below 1
+        solver_time_limit: Seconds each solve may take (None for no limit);
+            a time budget, if shorter, takes precedence
+        use_scipy: Set False to always use the greedy fallback
+        time_budget: Optional wall-clock budget in seconds
+    """
+
+    def __init__(
+            self,
+            holder_bonus: float = 1e-4,
+            max_candidates: int = 8,
+            milp_max_variables: int = 100,
+            trade_cost: float = 0.5,
+            solver_time_limit: Optional[float] = 0.25,
+            use_scipy: bool = True,
+            time_budget: Optional[float] = None,
+    ):
+        super().__init__(time_budget=time_budget)
+        if holder_bonus < 0:
+            raise ValueError("holder_bonus cannot be negative")
+        if max_candidates < 0:
+            raise ValueError("max_candidates cannot be negative")
+        if not 0 <= trade_cost < 1:
+            raise ValueError("trade_cost must be in [0, 1)")
+        if solver_time_limit is not None and solver_time_limit <= 0:
+            raise ValueError("solver_time_limit must be positive")
+        self.holder_bonus = holder_bonus
+        self.max_candidates = max_candidates
+        self.milp_max_variables = milp_max_variables
+        self.trade_cost = trade_cost
+        self.solver_time_limit = solver_time_limit
+        self.use_scipy = use_scipy
+
+    @property
+    def name(self) -> str:
+        return "optimal"
+
+    def execute_rebalance(
+            self,
+            portfolio_state: PortfolioStateManager,
+            target_shares: Dict[str, float],
+            max_iterations: int
+    ) -> List[Trade]:
+        return self.rebalance(portfolio_state, target_shares, max_iterations).trades
+
+    def rebalance(
+            self,
+            portfolio_state: PortfolioStateManager,
+            target_shares: Dict[str, float],
+            max_iterations: int = 100,
+            time_budget: Optional[float] = None,
+            deadline: Optional[float] = None,
+    ) -> RebalanceResult:
+        """
+        Solve once and apply the resulting trades.
+
+        ``max_iterations`` only matters when it is below 1, in which case
+        nothing is traded.
+        """
+        deadline = self._resolve_deadline(time_budget, deadline)
+
+        def residual(status: RebalanceStatus) -> RebalanceResult:
+            return RebalanceResult([], dict(portfolio_state.portfolio_trades), status)
+
+        if not is_trade_remaining(portfolio_state.portfolio_trades):
+            return residual(RebalanceStatus.COMPLETE)
+        if max_iterations < 1:
+            return residual(RebalanceStatus.MAX_ITERATIONS)
+        if deadline is not None and time.monotonic() >= deadline:
+            return residual(RebalanceStatus.DEADLINE)
+
+        problem = _Problem(portfolio_state)
+        if problem.empty:
+            return residual(RebalanceStatus.STALLED)
+
+        sells = buys = None
+        scipy = _load_scipy() if self.use_scipy else None
+        if scipy is not None:
+            solution = self._solve(problem, scipy, deadline)
+            if solution is not None:
+                sells, buys = problem.round_down(*solution)
+        if sells is None:
+            sells = np.zeros_like(problem.sell_caps)
+            buys = np.zeros((len(problem.account_ids), len(problem.buy_symbols)))
+        problem.repair(sells, buys)
+
+        trades = problem.trades(sells, buys)
+        greedy_trades, greedy_unfilled = self._greedy_plan(
+            portfolio_state, target_shares, max_iterations, deadline
+        )
+        portfolio_state.begin()
+        _apply(portfolio_state, trades, target_shares)
+        if (greedy_unfilled, len(greedy_trades)) < (_unfilled_value(portfolio_state), len(trades)):
+            portfolio_state.rollback()
+            trades = greedy_trades
+            _apply(portfolio_state, trades, target_shares)
+        else:
+            portfolio_state.commit()
+
+        remaining = dict(portfolio_state.portfolio_trades)
+        if not is_trade_remaining(remaining):
+            status = RebalanceStatus.COMPLETE
+        elif deadline is not None and time.monotonic() >= deadline:
+            status = RebalanceStatus.DEADLINE
+        else:
+            status = RebalanceStatus.STALLED
+        return RebalanceResult(trades, remaining, status)
+
+    @staticmethod
+    def _greedy_plan(
+            portfolio_state: PortfolioStateManager,
+            target_shares: Dict[str, float],
+            max_iterations: int,
+            deadline: Optional[float],
+    ) -> Tuple[List[Trade], float]:
+        """Trades DefaultRebalancer would make and the value they leave unfilled, unapplied."""
+        with portfolio_state.transaction():
+            result = DefaultRebalancer().rebalance(
+                portfolio_state, target_shares, max_iterations, deadline=deadline
+            )
+            unfilled = _unfilled_value(portfolio_state)
+            portfolio_state.rollback()
+        return result.trades, unfilled
+
+    def _solve(
+            self,
+            problem: "_Problem",
+            scipy,
+            deadline: Optional[float],
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Solve the relaxed (or, if small enough, integer) program; None on failure."""
+        optimize, sparse = scipy
+        n_accounts = len(problem.account_ids)
+        n_buy = len(problem.buy_symbols)
+        sell_rows, sell_cols = np.nonzero(problem.sell_candidates(self.max_candidates))
+        buy_accounts, buy_cols = np.nonzero(problem.buy_candidates(self.max_candidates))
+        n_sell_vars = len(sell_rows)
+        n_vars = n_sell_vars + len(buy_accounts)
+        if n_vars == 0:
+            return None
+
+        # Variables: one per candidate (account, sell symbol) pair, then one per
+        # candidate (account, buy symbol) pair
+        sell_prices = problem.sell_prices[sell_cols]
+        buy_prices = problem.buy_prices[buy_cols]
+
+        scale = max(
+            float(problem.sell_prices.max(initial=0)),
+            float(problem.buy_prices.max(initial=0)),
+        )
+        bonus = 1 + self.holder_bonus * problem.buy_holders[buy_accounts, buy_cols]
+        cost = -np.concatenate([sell_prices, buy_prices * bonus]) / scale
+
+        n_sell_symbols = len(problem.sell_symbols)
+        sell_vars = np.arange(n_sell_vars)
+        buy_vars = n_sell_vars + np.arange(len(buy_accounts))
+        # Rows: sell symbol totals, buy symbol totals, account cash
+        rows = np.concatenate([
+            sell_cols,
+            n_sell_symbols + buy_cols,
+            n_sell_symbols + n_buy + sell_rows,
+            n_sell_symbols + n_buy + buy_accounts,
+        ])
+        cols = np.concatenate([sell_vars, buy_vars, sell_vars, buy_vars])
+        values = np.concatenate([
+            np.ones(n_sell_vars), np.ones(len(buy_vars)), -sell_prices, buy_prices,
+        ])
+        n_rows = n_sell_symbols + n_buy + n_accounts
+        rhs = np.concatenate([problem.sell_qty, problem.buy_qty, np.maximum(problem.cash, 0)])
+        upper = np.concatenate([problem.sell_caps[sell_rows, sell_cols], problem.buy_qty[buy_cols]])
+
+        # Charge for every trade made, less than the value of one share of the
+        # cheapest symbol so that filling more always beats trading less
+        prices = np.concatenate([problem.sell_prices, problem.buy_prices])
+        charge = self.trade_cost * float(prices.min()) / scale
+
+        # HiGHS logs to stdout unless told otherwise
+        options = {"disp": False}
+        limits = [self.solver_time_limit]
+        if deadline is not None:
+            limits.append(max(deadline - time.monotonic(), 0.0))
+        limits = [limit for limit in limits if limit is not None]
+        if limits:
+            options["time_limit"] = min(limits)
+
+        try:
+            if n_vars <= self.milp_max_variables:
+                # One binary per pair switches its trade on: x <= upper * used
+                variables = np.arange(n_vars)
+                matrix = sparse.csr_array(
+                    (
+                        np.concatenate([values, np.ones(n_vars), -upper]),
+                        (
+                            np.concatenate([rows, n_rows + variables, n_rows + variables]),
+                            np.concatenate([cols, variables, n_vars + variables]),
+                        ),
+                    ),
+                    shape=(n_rows + n_vars, 2 * n_vars),
+                )
+                result = optimize.milp(
+                    np.concatenate([cost, np.full(n_vars, charge)]),
+                    constraints=optimize.LinearConstraint(
+                        matrix, -np.inf, np.concatenate([rhs, np.zeros(n_vars)])
+                    ),
+                    integrality=np.ones(2 * n_vars),
+                    bounds=optimize.Bounds(
+                        np.zeros(2 * n_vars), np.concatenate([upper, np.ones(n_vars)])
+                    ),
+                    options=options,
+                )
+            else:
+                # Linear relaxation of the same charge, spread over each pair's shares
+                matrix = sparse.csr_array((values, (rows, cols)), shape=(n_rows, n_vars))
+                result = optimize.linprog(
+                    cost + charge / np.maximum(upper, 1),
+                    A_ub=matrix,
+                    b_ub=rhs,
+                    bounds=np.column_stack([np.zeros(n_vars), upper]),
+                    method="highs",
+                    options=options,
+                )
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Solver failed, using greedy assignment: {e}")
+            return None
+
+        if result.x is None:
+            logger.warning(f"Solver found no solution, using greedy assignment: {result.message}")
+            return None
+
+        sells = np.zeros_like(problem.sell_caps)
+        sells[sell_rows, sell_cols] = result.x[:n_sell_vars]
+        buys = np.zeros((n_accounts, n_buy))
+        buys[buy_accounts, buy_cols] = result.x[n_sell_vars:n_vars]
+        return sells, buys
+
+
+def _apply(
+        portfolio_state: PortfolioStateManager,
+        trades: List[Trade],
+        target_shares: Dict[str, float],
+) -> None:
+    if trades:
+        portfolio_state.update(trades)
+        portfolio_state.update_portfolio_trades(target_shares)
+
+
+def _unfilled_value(portfolio_state: PortfolioStateManager) -> float:
+    """Market value of the portfolio trades still open, rounded to cents."""
+    prices = portfolio_state.prices
+    return round(sum(
+        abs(qty) * prices.get(symbol, 0.0)
+        for symbol, qty in portfolio_state.portfolio_trades.items()
+    ), 2)
+
+
+class _Problem:
+    """Dense account x symbol view of the trades left in a portfolio state."""
+
+    def __init__(self, portfolio_state: PortfolioStateManager):
+        accounts = list(portfolio_state.accounts.values())
+        prices = portfolio_state.prices
+        self.account_ids = [a.account_number for a in accounts]
+
+        sell_symbols, buy_symbols = [], []
+        for symbol, qty in portfolio_state.portfolio_trades.items():
+            qty = int(qty)
+            if qty == 0:
+                continue
+            if not prices.get(symbol):
+                logger.warning(f"No price for {symbol}; leaving its trade unassigned")
+                continue
+            (buy_symbols if qty > 0 else sell_symbols).append((symbol, abs(qty)))
+
+        self.sell_symbols = [s for s, _ in sell_symbols]
+        self.buy_symbols = [s for s, _ in buy_symbols]
+        self.sell_qty = np.array([q for _, q in sell_symbols], dtype=np.float64)
+        self.buy_qty = np.array([q for _, q in buy_symbols], dtype=np.float64)
+        self.sell_prices = np.array([prices[s] for s in self.sell_symbols], dtype=np.float64)
+        self.buy_prices = np.array([prices[s] for s in self.buy_symbols], dtype=np.float64)
+        self.cash = np.array(
+            [portfolio_state.cash_matrix[a] for a in self.account_ids], dtype=np.float64
+        )
+
+        # Whole shares each account can sell, and current positions in buy symbols
+        self.sell_caps = np.zeros((len(accounts), len(self.sell_symbols)), dtype=np.float64)
+        self.buy_positions = np.zeros((len(accounts), len(self.buy_symbols)), dtype=np.float64)
+        self.buy_holders = np.zeros((len(accounts), len(self.buy_symbols)), dtype=bool)
+        sell_index = {s: j for j, s in enumerate(self.sell_symbols)}
+        buy_index = {s: j for j, s in enumerate(self.buy_symbols)}
+        for i, account in enumerate(accounts):
+            for symbol, qty in account.positions.items():
+                j = sell_index.get(symbol)
+                if j is not None:
+                    self.sell_caps[i, j] = max(np.floor(qty + ROUNDING_TOLERANCE), 0)
+                    continue
+                j = buy_index.get(symbol)
+                if j is not None:
+                    self.buy_positions[i, j] = qty
+                    self.buy_holders[i, j] = True
+
+    @property
+    def empty(self) -> bool:
+        return not self.account_ids or not (self.sell_symbols or self.buy_symbols)
+
+    def sell_candidates(self, max_candidates: int) -> np.ndarray:
+        """
+        Accounts x sell symbols mask of the pairs offered to the solver.
+
+        Each sell may use the ``max_candidates`` largest holders. Pairs left
+        out can still be filled by repair().
+        """
+        return _top_rows(self.sell_caps, max_candidates)
+
+    def buy_candidates(self, max_candidates: int) -> np.ndarray:
+        """
+        Accounts x buy symbols mask of the pairs offered to the solver.
+
+        Each buy may use its ``max_candidates`` largest holders and the
+        ``max_candidates`` accounts with the most cash, including what their
+        sells could raise. Pairs left out can still be filled by repair().
+        """
+        mask = _top_rows(np.where(self.buy_holders, self.buy_positions + 1, 0), max_candidates)
+        funding = self.cash + self.sell_caps @ self.sell_prices
+        mask[_top_indices(funding, max_candidates)] = True
+        return mask
+
+    def round_down(self, sells: np.ndarray, buys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Round fills down to whole shares, then trim buys any account cannot pay for."""
+        sells = np.minimum(np.floor(sells + ROUNDING_TOLERANCE), self.sell_caps)
+        buys = np.maximum(np.floor(buys + ROUNDING_TOLERANCE), 0)
+
+        available = self._available_cash(sells, buys)
+        for i in np.flatnonzero(available < -ROUNDING_TOLERANCE).tolist():
+            # Drop the most expensive buys first until the account is solvent
+            for j in np.argsort(-self.buy_prices).tolist():
+                if available[i] >= -ROUNDING_TOLERANCE:
+                    break
+                if buys[i, j] == 0:
+                    continue
+                drop = min(buys[i, j], np.ceil(-available[i] / self.buy_prices[j]))
+                buys[i, j] -= drop
+                available[i] += drop * self.buy_prices[j]
+        return sells, buys
+
+    def _available_cash(self, sells: np.ndarray, buys: np.ndarray) -> np.ndarray:
+        return self.cash + sells @ self.sell_prices - buys @ self.buy_prices
+
+    def repair(self, sells: np.ndarray, buys: np.ndarray) -> None:
+        """
+        Fill what is left of each trade in place, smallest remaining first.
+
+        Accounts are chosen with the same tiers as the greedy selectors.
+        """
+        remaining = self.sell_qty - sells.sum(axis=0)
+        for j in np.argsort(remaining, kind="stable").tolist():
+            while remaining[j] > 0:
+                position = self.sell_caps[:, j] - sells[:, j]
+                i = VectorizedRebalancer._select_sell(position > 0, position, int(remaining[j]))
+                if i is None:
+                    break
+                qty = min(remaining[j], position[i])
+                sells[i, j] += qty
+                remaining[j] -= qty
+
+        available = self._available_cash(sells, buys)
+        remaining = self.buy_qty - buys.sum(axis=0)
+        for j in np.argsort(remaining, kind="stable").tolist():
+            price = self.buy_prices[j]
+            while remaining[j] > 0:
+                affordable = np.floor_divide(np.maximum(available, 0), price)
+                holders = self.buy_holders[:, j] | (buys[:, j] > 0)
+                i = VectorizedRebalancer._select_buy(
+                    holders, self.buy_positions[:, j] + buys[:, j], affordable, int(remaining[j])
+                )
+                if i is None:
+                    break
+                qty = min(remaining[j], affordable[i])
+                if qty <= 0:
+                    break
+                buys[i, j] += qty
+                available[i] -= qty * price
+                remaining[j] -= qty
+
+    def trades(self, sells: np.ndarray, buys: np.ndarray) -> List[Trade]:
+        """Sells first, then buys, each in account order."""
+        trades = []
+        for matrix, symbols, sign in ((sells, self.sell_symbols, -1), (buys, self.buy_symbols, 1)):
+            rows, cols = np.nonzero(matrix)
+            for i, j in zip(rows.tolist(), cols.tolist()):
+                trades.append(Trade(self.account_ids[i], symbols[j], sign * int(matrix[i, j])))
+        return trades
+
+
+def _top_indices(values: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` largest values (all of them if there are fewer)."""
+    if k >= len(values):
+        return np.arange(len(values))
+    if k <= 0:
+        return np.arange(0)
+    return np.argpartition(-values, k - 1)[:k]
+
+
+def _top_rows(matrix: np.ndarray, k: int) -> np.ndarray:
+    """Mask of the ``k`` largest positive entries in each column."""
+    mask = matrix > 0
+    if k < matrix.shape[0]:
+        keep = np.zeros_like(mask)
+        if k > 0:
+            rows = np.argpartition(-matrix, k - 1, axis=0)[:k]
+            np.put_along_axis(keep, rows, True, axis=0)
+        mask &= keep
+    return mask
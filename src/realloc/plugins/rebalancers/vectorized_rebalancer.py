@@ -0,0 +1,241 @@
+import logging
+import math
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from realloc import Trade, PortfolioStateManager
+from realloc.plugins.core.base import RebalanceResult, RebalanceStatus, RebalancerPlugin
+from realloc.scheduler import TradeScheduler
+from realloc import compute_portfolio_trades, is_trade_remaining
+
+logger = logging.getLogger(__name__)
+
+
+class VectorizedRebalancer(RebalancerPlugin):
+    """
+    Rebalancer that keeps positions, cash and prices in dense NumPy arrays.
+
+    Positions are held as a symbol x account matrix and account selection is
+    done with masked array operations instead of scanning ``Account`` objects,
+    so each fill costs a handful of vector operations over accounts. The
+    priority rules, trade ordering and iteration semantics are the same as
+    ``DefaultRebalancer``, so both plugins produce the same trade list.
+    """
+
+    @property
+    def name(self) -> str:
+        return "vectorized"
+
+    def execute_rebalance(
+            self,
+            portfolio_state: PortfolioStateManager,
+            target_shares: Dict[str, float],
+            max_iterations: int
+    ) -> List[Trade]:
+        return self.rebalance(portfolio_state, target_shares, max_iterations).trades
+
+    def rebalance(
+            self,
+            portfolio_state: PortfolioStateManager,
+            target_shares: Dict[str, float],
+            max_iterations: int = 100,
+            time_budget: Optional[float] = None,
+            deadline: Optional[float] = None,
+    ) -> RebalanceResult:
+        deadline = self._resolve_deadline(time_budget, deadline)
+        accounts = list(portfolio_state.accounts.values())
+        account_ids = [a.account_number for a in accounts]
+
+        symbols = list(dict.fromkeys(
+            [sym for a in accounts for sym in a.positions]
+            + list(target_shares)
+            + list(portfolio_state.portfolio_trades)
+        ))
+        symbol_idx = {sym: i for i, sym in enumerate(symbols)}
+
+        positions = np.zeros((len(symbols), len(accounts)), dtype=np.float64)
+        holders = np.zeros((len(symbols), len(accounts)), dtype=bool)
+        for j, account in enumerate(accounts):
+            for sym, qty in account.positions.items():
+                positions[symbol_idx[sym], j] = qty
+                holders[symbol_idx[sym], j] = True
+
+        cash = np.array(
+            [portfolio_state.cash_matrix[a] for a in account_ids], dtype=np.float64
+        )
+        prices = np.array(
+            [portfolio_state.prices.get(sym, 0) for sym in symbols], dtype=np.float64
+        )
+        targets = np.array(
+            [target_shares.get(sym, 0.0) for sym in symbols], dtype=np.float64
+        )
+        combined = positions.sum(axis=1)
+
+        portfolio_trades = dict(portfolio_state.portfolio_trades)
+        min_trade_quantity = portfolio_state.min_trade_quantity
+        recomputed = False
+
+        scheduler = TradeScheduler(portfolio_trades)
+        iteration = 0
+        account_trades = []
+
+        while True:
+            if not is_trade_remaining(portfolio_trades):
+                status = RebalanceStatus.COMPLETE
+                break
+            if iteration >= max_iterations:
+                status = RebalanceStatus.MAX_ITERATIONS
+                logger.warning("Max iterations reached. Some trades may be unresolved.")
+                break
+
+            sorted_trades = scheduler.next_pass()
+            made_trade = False
+            timed_out = False
+
+            for symbol, qty in sorted_trades:
+                if deadline is not None and time.monotonic() >= deadline:
+                    timed_out = True
+                    break
+
+                direction = "buy" if qty > 0 else "sell"
+                qty_remaining = abs(qty)
+                s = symbol_idx[symbol]
+
+                if direction == "buy":
+                    price = portfolio_state.prices[symbol]
+                    affordable = np.floor_divide(cash, price)
+                    j = self._select_buy(holders[s], positions[s], affordable, qty_remaining)
+                else:
+                    j = self._select_sell(holders[s], positions[s], qty_remaining)
+
+                if j is None:
+                    logger.warning(f"Cannot find account to {direction} {qty_remaining} {symbol}")
+                    continue
+
+                if direction == "buy":
+                    qty_to_trade = min(qty_remaining, int(affordable[j]))
+                else:
+                    qty_to_trade = min(qty_remaining, int(positions[s, j]))
+
+                if qty_to_trade == 0:
+                    continue
+
+                account_id = account_ids[j]
+                trade_qty = qty_to_trade if direction == "buy" else -qty_to_trade
+                account_trades.append(Trade(account_id, symbol, trade_qty))
+
+                logger.info(
+                    f"Executing {direction} of {qty_to_trade} {symbol} in account {account_id}"
+                )
+
+                positions[s, j] += trade_qty
+                holders[s, j] = True
+                cash[j] -= trade_qty * prices[s]
+                combined[s] += trade_qty
+
+                if not recomputed:
+                    # The first trade replaces whatever portfolio_trades were
+                    # supplied with ones derived from target_shares; after that
+                    # only the traded symbol can change.
+                    portfolio_trades = self._recompute_trades(
+                        symbols, combined, target_shares, min_trade_quantity
+                    )
+                    recomputed = True
+                else:
+                    self._refresh_trade(
+                        portfolio_trades, symbol, targets[s] - combined[s], min_trade_quantity
+                    )
+                scheduler.refresh(portfolio_trades, (symbol,))
+                made_trade = True
+
+            if timed_out:
+                status = RebalanceStatus.DEADLINE
+                logger.warning("Time budget exhausted. Some trades may be unresolved.")
+                break
+
+            if not made_trade:
+                # If we couldn't make any trades in this iteration, break to avoid infinite loop
+                status = RebalanceStatus.STALLED
+                break
+
+            iteration += 1
+
+        if account_trades:
+            portfolio_state.update(account_trades)
+            portfolio_state.update_portfolio_trades(target_shares)
+
+        return RebalanceResult(account_trades, dict(portfolio_state.portfolio_trades), status)
+
+    @staticmethod
+    def _select_buy(
+            holder_row: np.ndarray,
+            position_row: np.ndarray,
+            affordable: np.ndarray,
+            trade_amount: int,
+    ) -> Optional[int]:
+        """Array form of ``select_account_for_buy_trade``; returns an account index."""
+        full = affordable >= trade_amount
+        partial = affordable > 0
+
+        holder_full = holder_row & full
+        if holder_full.any():
+            return int(np.argmax(np.where(holder_full, position_row, -np.inf)))
+
+        holder_partial = holder_row & partial
+        if holder_partial.any():
+            return int(np.argmax(np.where(holder_partial, affordable, -np.inf)))
+
+        nonholder_full = ~holder_row & full
+        if nonholder_full.any():
+            return int(np.argmax(nonholder_full))
+
+        nonholder_partial = ~holder_row & partial
+        if nonholder_partial.any():
+            return int(np.argmax(np.where(nonholder_partial, affordable, -np.inf)))
+
+        return None
+
+    @staticmethod
+    def _select_sell(
+            holder_row: np.ndarray,
+            position_row: np.ndarray,
+            trade_amount: int,
+    ) -> Optional[int]:
+        """Array form of ``select_account_for_sell_trade``; returns an account index."""
+        candidates = holder_row & (position_row > 0)
+        if not candidates.any():
+            return None
+
+        full_liquidations = candidates & (position_row <= trade_amount)
+        if full_liquidations.any():
+            return int(np.argmax(np.where(full_liquidations, position_row, -np.inf)))
+
+        return int(np.argmax(candidates))
+
+    @staticmethod
+    def _recompute_trades(
+            symbols: List[str],
+            combined: np.ndarray,
+            target_shares: Dict[str, float],
+            min_trade_quantity: float,
+    ) -> Dict[str, int]:
+        current = {sym: float(combined[i]) for i, sym in enumerate(symbols) if combined[i] != 0}
+        trades = compute_portfolio_trades(
+            current, target_shares, min_trade_quantity=min_trade_quantity
+        )
+        return {sym: qty for sym, qty in trades.items() if abs(qty) > 0}
+
+    @staticmethod
+    def _refresh_trade(
+            portfolio_trades: Dict[str, int],
+            symbol: str,
+            remaining: float,
+            min_trade_quantity: float,
+    ) -> None:
+        qty = int(math.floor(remaining))
+        if qty == 0 or (min_trade_quantity > 0 and abs(qty) < min_trade_quantity):
+            portfolio_trades.pop(symbol, None)
+        else:
+            portfolio_trades[symbol] = qty
@@ -11,7 +11,7 @@ class MinimumValueValidator(TradeValidator):
         if trade.quantity == 0:
             return False, "Zero quantity trade"
 
-        if trade.minimum_value == 0:
+        if not trade.minimum_value:
             return True, ""
 
         trade_value = abs(trade.quantity * trade.price)
@@ -1,11 +1,43 @@
-from typing import List, Optional, Dict, Any, Tuple
+import math
+from contextlib import contextmanager
+from typing import List, Optional, Dict, Any, Iterator, Tuple, Set
 
 from realloc.accounts import Account
+from realloc.indexes import CashIndex, PositionIndex
 from realloc.plugins.core.engine import PluginEngine, ValidationEngine
 from realloc.models import PortfolioModel
 from .trades import compute_portfolio_trades, TradeInfo, Trade
 
 
+class NegativePositionError(ValueError):
+    """
+    Raised by ``bulk_update`` when trades would leave negative positions.
+
+    Attributes:
+        rows: Indices of every offending trade in the batch, ascending
+    """
+
+    def __init__(self, rows: List[int], details: List[str]):
+        self.rows = rows
+        shown = ", ".join(details[:10])
+        if len(details) > 10:
+            shown += f", ... ({len(details) - 10} more)"
+        super().__init__(f"Trades would result in negative positions: {shown}")
+
+
+def _batch_columns(
+        account_ids: Any, symbols: Any = None, shares: Any = None
+) -> Tuple[Any, Any, Any]:
+    """Split a ``bulk_update`` argument list into account, symbol and share columns."""
+    if symbols is None and shares is None:
+        # Structured array (or mapping of columns)
+        account_ids, symbols, shares = (
+            account_ids["account_id"], account_ids["symbol"], account_ids["shares"]
+        )
+    if not len(account_ids) == len(symbols) == len(shares):
+        raise ValueError("account_ids, symbols and shares must have the same length")
+    return account_ids, symbols, shares
+
 
 class PortfolioStateManager:
     def __init__(
@@ -16,12 +48,20 @@ class PortfolioStateManager:
         min_trade_quantity: float = 0,
     ):
         self.accounts = {a.account_number: a for a in accounts}
+        # (account_id, symbol, old_qty, old_cash); symbol is None for cash-only changes
+        self._undo_log: Optional[List[Tuple[str, Optional[str], Optional[float], float]]] = None
+        # (symbol, old_qty) for single-symbol changes,
+        # (None, old_trades, old_basis) for replacements
+        self._trade_undo_log: List[Tuple[Any, ...]] = []
+        self._savepoints: List[Tuple[int, int, Set[str]]] = []
         if any(price <= 0 for price in prices.values()):
             raise ValueError("All prices must be positive")
+        self._market_value: Optional[float] = None
         self.prices = prices.copy()
         self.min_trade_quantity = min_trade_quantity
+        self._trade_basis: Optional[Tuple[Dict[str, float], bool]] = None
         self.portfolio_trades = portfolio_trades.copy() if portfolio_trades else {}
-        self.cash_matrix: Dict[str, float] = {
+        self._cash_matrix: Dict[str, float] = {
             a.account_number: a.cash for a in accounts
         }
         self.model_only: Dict[str, int] = {
@@ -31,6 +71,19 @@ class PortfolioStateManager:
         }
         self.plugin_engine = PluginEngine()
         self.validation_engine = ValidationEngine()
+        self._combined_positions: Dict[str, float] = {}
+        self._dirty_symbols: Set[str] = set()
+        self._total_cash = 0.0
+        self.refresh()
+
+    @property
+    def prices(self) -> Dict[str, float]:
+        return self._prices
+
+    @prices.setter
+    def prices(self, value: Dict[str, float]) -> None:
+        self._prices = value
+        self._market_value = None
 
     @property
     def portfolio_trades(self) -> Dict[str, int]:
@@ -38,7 +91,92 @@ class PortfolioStateManager:
 
     @portfolio_trades.setter
     def portfolio_trades(self, value: Dict[str, int]) -> None:
+        self._log_trades_replaced()
         self._portfolio_trades = value.copy() if value else {}
+        # Trades no longer derive from a known target, next update recomputes them all
+        self._trade_basis = None
+
+    @property
+    def cash_matrix(self) -> Dict[str, float]:
+        return self._cash_matrix
+
+    @cash_matrix.setter
+    def cash_matrix(self, value: Dict[str, float]) -> None:
+        self._cash_matrix = value
+        self._total_cash = sum(value.values())
+        self.cash_index = CashIndex(self.accounts.values(), value)
+
+    @property
+    def combined_positions(self) -> Dict[str, float]:
+        """Positions summed across all accounts, kept current by update()."""
+        return self._combined_positions
+
+    @property
+    def total_cash(self) -> float:
+        """Cash summed across all accounts, kept current by update() and adjust_cash()."""
+        return self._total_cash
+
+    @property
+    def market_value(self) -> float:
+        """
+        Value of all positions at current prices.
+
+        Kept current by update() and update_prices(); it is only recomputed
+        from scratch after ``prices`` is reassigned or refresh() is called.
+
+        Raises:
+            KeyError: If a held symbol has no price
+        """
+        if self._market_value is None:
+            self._market_value = self._compute_market_value()
+        return self._market_value
+
+    def _compute_market_value(self) -> float:
+        return sum(
+            qty * self.prices[sym] for sym, qty in self._combined_positions.items()
+        )
+
+    def update_prices(self, prices: Dict[str, float]) -> None:
+        """
+        Change some prices and revalue only the affected symbols.
+
+        Args:
+            prices: Dictionary mapping symbols to their new prices
+
+        Raises:
+            ValueError: If any price is not positive
+        """
+        if any(price <= 0 for price in prices.values()):
+            raise ValueError("All prices must be positive")
+        for symbol, price in prices.items():
+            old_price = self.prices.get(symbol, 0.0)
+            self.prices[symbol] = price
+            if self._market_value is not None:
+                # While the value is known every held symbol has a price, so a
+                # symbol without an old price contributes nothing
+                self._market_value += (
+                    self._combined_positions.get(symbol, 0.0) * (price - old_price)
+                )
+
+    def refresh(self) -> None:
+        """
+        Rebuild derived aggregates from the accounts.
+
+        Only needed when account positions or cash were changed without going
+        through update() or adjust_cash(), e.g. by editing ``Account.positions``
+        or ``cash_matrix`` entries directly.
+        """
+        combined = {}
+        for account in self.accounts.values():
+            for sym, qty in account.positions.items():
+                combined[sym] = combined.get(sym, 0.0) + qty
+        self._combined_positions = combined
+        self._dirty_symbols.clear()
+        self._trade_basis = None
+        self._total_cash = sum(self._cash_matrix.values())
+        self._market_value = None
+        self.position_index = PositionIndex(self.accounts.values())
+        self.cash_index = CashIndex(self.accounts.values(), self._cash_matrix)
 
     def add_validator(self, name: str, **kwargs: Any) -> None:
         """Add a validator to the portfolio manager"""
@@ -46,13 +184,7 @@ class PortfolioStateManager:
 
     def get_total_portfolio_value(self) -> float:
         """Calculate total portfolio value including cash across all accounts."""
-        total_cash = sum(self.cash_matrix.values())
-        total_positions = sum(
-            qty * self.prices[sym]
-            for acc in self.accounts.values()
-            for sym, qty in acc.positions.items()
-        )
-        return total_cash + total_positions
+        return self._total_cash + self.market_value
 
     def is_trade_feasible(self, account_id: str, symbol: str, quantity: float) -> bool:
         """Check if a trade can be executed given current account state."""
@@ -64,15 +196,61 @@ class PortfolioStateManager:
 
     def reconcile_positions(self) -> Dict[str, float]:
         """Compare portfolio-level positions with sum of account positions."""
-        combined = {}
-        for acc in self.accounts.values():
-            for sym, qty in acc.positions.items():
-                combined[sym] = combined.get(sym, 0) + qty
+        combined = self._combined_positions
         return {
             sym: combined.get(sym, 0) - self.portfolio_trades.get(sym, 0)
             for sym in set(combined) | set(self.portfolio_trades)
         }
 
+    def bulk_update(self, account_ids: Any, symbols: Any = None, shares: Any = None) -> None:
+        """
+        Apply a large batch of trades at once.
+
+        Trades are given as parallel sequences or arrays, or as one structured
+        NumPy array with ``account_id``, ``symbol`` and ``shares`` fields. The
+        whole batch is validated before anything is applied: if any trade
+        would take a position below zero in an account that enforces
+        ``enforce_no_negative_positions``, nothing changes and every offending
+        row is reported.
+
+        Args:
+            account_ids: Account ID per trade, or a structured array of trades
+            symbols: Symbol per trade
+            shares: Signed share quantity per trade
+
+        Raises:
+            ValueError: If an account ID is unknown or the columns differ in length
+            NegativePositionError: If any trade would leave a negative position
+        """
+        account_ids, symbols, shares = _batch_columns(account_ids, symbols, shares)
+        account_ids = [str(a) for a in account_ids]
+        symbols = [str(s) for s in symbols]
+        shares = shares.tolist() if hasattr(shares, "tolist") else list(shares)
+
+        invalid_accounts = list(dict.fromkeys(a for a in account_ids if a not in self.accounts))
+        if invalid_accounts:
+            raise ValueError(f"Invalid account IDs: {invalid_accounts}")
+
+        running: Dict[Tuple[str, str], float] = {}
+        offending, details = [], []
+        for row, (account_id, symbol, qty) in enumerate(zip(account_ids, symbols, shares)):
+            key = (account_id, symbol)
+            position = running.get(key)
+            if position is None:
+                position = self.accounts[account_id].positions.get(symbol, 0)
+            position += qty
+            running[key] = position
+            if position < 0 and self.accounts[account_id].enforce_no_negative_positions:
+                offending.append(row)
+                details.append(f"row {row} ({account_id} {symbol} -> {position})")
+        if offending:
+            raise NegativePositionError(offending, details)
+
+        self.update([
+            Trade(account_id, symbol, qty)
+            for account_id, symbol, qty in zip(account_ids, symbols, shares)
+        ])
+
     def update(self, trades: List[Trade]) -> None:
         # Validate all account IDs first
         invalid_accounts = [
@@ -95,14 +273,31 @@ class PortfolioStateManager:
 
             # Update positions and cash for each trade
             for symbol, qty in account_trades_list:
-                new_position = account.positions.get(symbol, 0) + qty
+                old_position = account.positions.get(symbol)
+                new_position = (old_position or 0) + qty
                 if account.enforce_no_negative_positions and new_position < 0:
                     raise ValueError(
                         f"Trade would result in negative position for {symbol} in account {account_id}"
                     )
+                self._log_change(account_id, symbol, old_position, self.cash_matrix[account_id])
                 account.positions[symbol] = new_position
-                trade_value = qty * self.prices.get(symbol, 0)
+                self.position_index.update(account_id, symbol, old_position, new_position)
+                if old_position is None:
+                    self.cash_index.add_holding(account_id, symbol)
+                price = self.prices.get(symbol)
+                trade_value = qty * (price or 0)
                 self.cash_matrix[account_id] -= trade_value
+                self.cash_index.set_cash(account_id, self.cash_matrix[account_id])
+                self._total_cash -= trade_value
+                if self._market_value is not None:
+                    self._market_value = (
+                        None if price is None else self._market_value + trade_value
+                    )
+
+                self._combined_positions[symbol] = (
+                    self._combined_positions.get(symbol, 0.0) + qty
+                )
+                self._dirty_symbols.add(symbol)
 
     def get_account_summary(self) -> List[Dict[str, Any]]:
         """Get summary of all accounts including positions and cash."""
@@ -130,23 +325,50 @@ class PortfolioStateManager:
         """
         Update portfolio trades using current positions and target shares.
 
+        When called again with the same ``target_shares`` object, only the
+        symbols traded through update() since the previous call are
+        recomputed. Passing a different target (or assigning
+        ``portfolio_trades`` directly) recomputes every symbol. Mutating
+        ``target_shares`` in place between calls is not detected.
+
         Args:
             target_shares: Dictionary mapping symbols to their target shares
             cleanup_zeros: If True (default), removes trades with zero quantity
         """
-        combined_current = {}
-        for account in self.accounts.values():
-            for sym, qty in account.positions.items():
-                combined_current[sym] = combined_current.get(sym, 0.0) + qty
-
-        self.portfolio_trades = compute_portfolio_trades(
-            combined_current,
-            target_shares,
-            min_trade_quantity=self.min_trade_quantity
-        )
-
-        if cleanup_zeros:
-            self.cleanup_zero_trades()
+        basis = self._trade_basis
+        if basis is not None and basis[0] is target_shares and basis[1] == cleanup_zeros:
+            for symbol in self._dirty_symbols:
+                self._refresh_symbol_trade(symbol, target_shares, cleanup_zeros)
+        else:
+            trades = compute_portfolio_trades(
+                self._combined_positions,
+                target_shares,
+                min_trade_quantity=self.min_trade_quantity
+            )
+            if cleanup_zeros:
+                trades = {symbol: qty for symbol, qty in trades.items() if abs(qty) > 0}
+            self._log_trades_replaced()
+            self._portfolio_trades = trades
+            self._trade_basis = (target_shares, cleanup_zeros)
+
+        self._dirty_symbols.clear()
+
+    def _refresh_symbol_trade(
+            self, symbol: str, target_shares: Dict[str, float], cleanup_zeros: bool
+    ) -> None:
+        """Recompute the remaining portfolio trade for a single symbol."""
+        qty = int(math.floor(
+            target_shares.get(symbol, 0.0) - self._combined_positions.get(symbol, 0.0)
+        ))
+        if self._undo_log is not None:
+            self._trade_undo_log.append((symbol, self._portfolio_trades.get(symbol)))
+        if (
+                (self.min_trade_quantity > 0 and abs(qty) < self.min_trade_quantity)
+                or (cleanup_zeros and qty == 0)
+        ):
+            self._portfolio_trades.pop(symbol, None)
+        else:
+            self._portfolio_trades[symbol] = qty
 
     def validate_trade(self, account_id: str, symbol: str, quantity: float) -> tuple[bool, str]:
         account = self.accounts[account_id]
@@ -174,15 +396,156 @@ class PortfolioStateManager:
         new_balance = self.cash_matrix[account_id] + amount
         if new_balance < 0:
             raise ValueError(f"Insufficient funds in account {account_id}")
+        self._log_change(account_id, None, None, self.cash_matrix[account_id])
         self.cash_matrix[account_id] = new_balance
+        self.cash_index.set_cash(account_id, new_balance)
+        self._total_cash += amount
+
+    # Transactions
+
+    @property
+    def in_transaction(self) -> bool:
+        """Whether begin() has been called without a matching commit() or rollback()."""
+        return bool(self._savepoints)
+
+    def begin(self) -> None:
+        """
+        Start a transaction, or a nested savepoint inside the current one.
+
+        Until the matching commit() or rollback(), every change made through
+        update(), adjust_cash(), update_portfolio_trades() or by assigning
+        ``portfolio_trades`` is recorded in an undo log. Prices, and direct
+        edits to ``Account.positions`` or ``cash_matrix``, are not recorded.
+        """
+        if self._undo_log is None:
+            self._undo_log = []
+            self._trade_undo_log = []
+        self._savepoints.append(
+            (len(self._undo_log), len(self._trade_undo_log), set(self._dirty_symbols))
+        )
+
+    def commit(self) -> None:
+        """
+        Keep the changes made since the matching begin().
+
+        Committing the outermost transaction discards the undo log.
+
+        Raises:
+            RuntimeError: If no transaction is in progress
+        """
+        if not self._savepoints:
+            raise RuntimeError("No transaction in progress")
+        self._savepoints.pop()
+        if not self._savepoints:
+            self._undo_log = None
+            self._trade_undo_log = []
+
+    def rollback(self) -> None:
+        """
+        Undo every change made since the matching begin().
+
+        Positions, cash, portfolio trades, the selector indexes and the
+        running totals are restored by replaying the undo log backwards.
+
+        Raises:
+            RuntimeError: If no transaction is in progress
+        """
+        if not self._savepoints:
+            raise RuntimeError("No transaction in progress")
+        log_length, trade_log_length, dirty_symbols = self._savepoints.pop()
+
+        undo_log = self._undo_log
+        while len(undo_log) > log_length:
+            self._undo_change(*undo_log.pop())
+
+        trade_log = self._trade_undo_log
+        while len(trade_log) > trade_log_length:
+            entry = trade_log.pop()
+            if entry[0] is None:
+                self._portfolio_trades, self._trade_basis = entry[1], entry[2]
+            elif entry[1] is None:
+                self._portfolio_trades.pop(entry[0], None)
+            else:
+                self._portfolio_trades[entry[0]] = entry[1]
+        self._dirty_symbols = dirty_symbols
+
+        if not self._savepoints:
+            self._undo_log = None
+
+    @contextmanager
+    def transaction(self) -> Iterator["PortfolioStateManager"]:
+        """
+        Context manager around begin()/commit()/rollback().
+
+        Commits when the block exits normally and rolls back if it raises.
+        Calling commit() or rollback() inside the block ends the transaction
+        early.
+
+        Example:
+            >>> with state.transaction():
+            ...     state.update([Trade("A1", "AAPL", 10)])
+            ...     value = state.get_total_portfolio_value()
+            ...     state.rollback()
+        """
+        self.begin()
+        depth = len(self._savepoints)
+        try:
+            yield self
+        except BaseException:
+            if len(self._savepoints) >= depth:
+                del self._savepoints[depth:]
+                self.rollback()
+            raise
+        if len(self._savepoints) >= depth:
+            del self._savepoints[depth:]
+            self.commit()
+
+    def _log_change(
+            self, account_id: str, symbol: Optional[str], old_qty: Optional[float], old_cash: float
+    ) -> None:
+        if self._undo_log is not None:
+            self._undo_log.append((account_id, symbol, old_qty, old_cash))
+
+    def _log_trades_replaced(self) -> None:
+        if self._undo_log is not None:
+            self._trade_undo_log.append((None, self._portfolio_trades, self._trade_basis))
+
+    def _undo_change(
+            self, account_id: str, symbol: Optional[str], old_qty: Optional[float], old_cash: float
+    ) -> None:
+        """Restore one undo log entry, keeping indexes and running totals consistent."""
+        cash = self.cash_matrix[account_id]
+        self.cash_matrix[account_id] = old_cash
+        self.cash_index.set_cash(account_id, old_cash)
+        self._total_cash += old_cash - cash
+        if symbol is None:
+            return
+
+        positions = self.accounts[account_id].positions
+        qty = positions[symbol]
+        if old_qty is None:
+            del positions[symbol]
+            self.cash_index.remove_holding(account_id, symbol)
+        else:
+            positions[symbol] = old_qty
+        self.position_index.update(account_id, symbol, qty, old_qty)
+
+        delta = (old_qty or 0) - qty
+        if old_qty is None and not self.position_index.has_holders(symbol):
+            del self._combined_positions[symbol]
+        else:
+            self._combined_positions[symbol] += delta
+        if self._market_value is not None:
+            price = self.prices.get(symbol)
+            self._market_value = None if price is None else self._market_value + delta * price
 
 
     def to_dict(self) -> Dict:
         return {
-            "portfolio_trades": self.portfolio_trades,
-            "prices": self.prices,
-            "cash_matrix": self.cash_matrix,
-            "model_only": self.model_only,
+            "portfolio_trades": dict(self.portfolio_trades),
+            "prices": dict(self.prices),
+            "cash_matrix": dict(self.cash_matrix),
+            "model_only": dict(self.model_only),
         }
 
     @classmethod
@@ -268,7 +631,7 @@ def calculate_target_shares(
     total_value = total_cash + sum(
         qty * prices[sym] for sym, qty in combined_positions.items()
     )
-    normalized_model = model.normalize()
+    normalized_model = model.normalized
     target_dollars = {
         sym: weight * total_value for sym, weight in normalized_model.items()
     }
@@ -306,7 +669,7 @@ def calculate_target_shares_from_accounts(
     )
 
     # Calculate target shares using normalized model weights
-    normalized_model = model.normalize()
+    normalized_model = model.normalized
     target_dollars = {
         sym: weight * total_value for sym, weight in normalized_model.items()
     }
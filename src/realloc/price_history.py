@@ -0,0 +1,222 @@
+import csv
+from datetime import date as Date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+DateLike = Union[Date, datetime, str, np.datetime64]
+
+
+def _to_day(value: DateLike) -> np.datetime64:
+    if isinstance(value, datetime):
+        value = value.date()
+    return np.datetime64(value, 'D')
+
+
+class PriceHistory:
+    """
+    Columnar, date-sorted store of historical prices.
+
+    Rows are kept as parallel NumPy arrays (day, symbol id, price, file row)
+    sorted by day, so a single date or a date range is found with a binary
+    search instead of scanning the source file. Rows with a blank date apply
+    to every date. Among the rows used for a date, a later row in the file
+    wins for the same symbol.
+
+    Prices are validated only when a lookup uses them, so a bad price on one
+    date does not break lookups for the others.
+
+    Example:
+        >>> history = PriceHistory.from_csv("prices.csv")
+        >>> history.prices_on("2025-08-24")
+        {'AAPL': 150.5, 'GOOG': 2750.25}
+    """
+
+    def __init__(self, days: np.ndarray, symbol_ids: np.ndarray, prices: np.ndarray,
+                 symbols: List[str], rows: Optional[np.ndarray] = None,
+                 errors: Optional[Dict[int, str]] = None):
+        """
+        Args:
+            days: Day of each row; NaT for undated rows
+            symbol_ids: Index into ``symbols`` of each row
+            prices: Price of each row; ignored for rows listed in ``errors``
+            symbols: Distinct symbols
+            rows: Position of each row in the source (default: array order)
+            errors: Row position -> message for rows with an invalid price
+        """
+        if rows is None:
+            rows = np.arange(len(days))
+        invalid = np.isin(rows, np.fromiter(errors or (), dtype=rows.dtype))
+        undated = np.isnat(days)
+        order = np.flatnonzero(~undated)
+        order = order[np.argsort(days[order], kind='stable')]
+        self._days = days[order]
+        self._symbol_ids = symbol_ids[order]
+        self._prices = prices[order]
+        self._rows = rows[order]
+        self._invalid = invalid[order]
+        self._undated_symbol_ids = symbol_ids[undated]
+        self._undated_prices = prices[undated]
+        self._undated_rows = rows[undated]
+        self._undated_invalid = invalid[undated]
+        self._symbols = np.array(symbols, dtype=object)
+        self._errors = dict(errors or {})
+
+    @classmethod
+    def from_csv(cls, path: Path) -> "PriceHistory":
+        """
+        Parse a CSV file with ``Symbol``, ``Price`` and ``Date`` columns.
+
+        Dates must be ``YYYY-MM-DD`` (as read by ``datetime.strptime``) or
+        blank. Invalid prices are kept and reported by the lookups that use
+        them.
+
+        Raises:
+            ValueError: If columns are missing or a date is invalid
+        """
+        symbol_index: Dict[str, int] = {}
+        day_strings: List[str] = []
+        symbol_ids: List[int] = []
+        prices: List[float] = []
+        errors: Dict[int, str] = {}
+
+        with open(path, 'r', newline='', encoding='utf-8-sig') as csvfile:
+            reader = csv.reader(csvfile)
+            fieldnames = [field.strip() for field in next(reader, [])]
+
+            missing = {'Symbol', 'Price', 'Date'} - set(fieldnames)
+            if missing:
+                raise ValueError(f"Missing required columns: {missing}")
+
+            symbol_col = fieldnames.index('Symbol')
+            price_col = fieldnames.index('Price')
+            date_col = fieldnames.index('Date')
+
+            for row in reader:
+                if not row:
+                    continue
+                symbol = row[symbol_col].strip()
+                try:
+                    price = float(row[price_col])
+                except ValueError:
+                    errors[len(prices)] = f"Invalid price for {symbol}: {row[price_col].strip()}"
+                    price = np.nan
+                if price <= 0:
+                    errors[len(prices)] = f"Price must be positive for {symbol}: {price}"
+                    price = np.nan
+
+                symbol_ids.append(symbol_index.setdefault(symbol, len(symbol_index)))
+                day_strings.append(row[date_col].strip())
+                prices.append(price)
+
+        # Files repeat few distinct dates, so each one is parsed only once
+        parsed: Dict[str, np.datetime64] = {'': np.datetime64('NaT')}
+        for day in day_strings:
+            if day not in parsed:
+                parsed[day] = np.datetime64(cls._parse_day(day), 'D')
+        all_days = np.array([parsed[day] for day in day_strings], dtype='datetime64[D]')
+        return cls(
+            all_days,
+            np.array(symbol_ids, dtype=np.int32),
+            np.array(prices, dtype=np.float64),
+            list(symbol_index),
+            errors=errors,
+        )
+
+    @staticmethod
+    def _parse_day(value: str) -> Date:
+        try:
+            return datetime.strptime(value, '%Y-%m-%d').date()
+        except ValueError:
+            raise ValueError(f"Invalid date: {value!r}")
+
+    def __len__(self) -> int:
+        return len(self._days) + len(self._undated_rows)
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    @property
+    def dates(self) -> List[Date]:
+        """Distinct dates in the store, ascending."""
+        return np.unique(self._days).astype(object).tolist()
+
+    def prices_on(self, day: DateLike) -> Dict[str, float]:
+        """
+        Prices for every symbol quoted on ``day``, including undated rows.
+
+        Returns:
+            Symbol -> price mapping; empty if no row applies
+
+        Raises:
+            ValueError: If a row used for ``day`` has an invalid price
+        """
+        target = _to_day(day)
+        lo = np.searchsorted(self._days, target, side='left')
+        hi = np.searchsorted(self._days, target, side='right')
+        return self._slice_to_dict(lo, hi)
+
+    def prices_between(self, start: DateLike, end: DateLike) -> Dict[Date, Dict[str, float]]:
+        """
+        Prices for each date from ``start`` to ``end`` inclusive.
+
+        Returns:
+            Dict mapping each date that has dated prices, in ascending order,
+            to its symbol -> price mapping (undated rows included)
+
+        Raises:
+            ValueError: If a row used for one of the dates has an invalid price
+        """
+        lo = np.searchsorted(self._days, _to_day(start), side='left')
+        hi = np.searchsorted(self._days, _to_day(end), side='right')
+        if lo >= hi:
+            return {}
+
+        days, starts = np.unique(self._days[lo:hi], return_index=True)
+        bounds = np.append(starts + lo, hi)
+        return {
+            day: self._slice_to_dict(bounds[i], bounds[i + 1])
+            for i, day in enumerate(days.astype(object).tolist())
+        }
+
+    def latest(self) -> Dict[str, float]:
+        """
+        Most recent price for every symbol.
+
+        Symbols quoted only on undated rows use their last undated price.
+
+        Raises:
+            ValueError: If any row has an invalid price
+        """
+        return self._to_dict(
+            np.concatenate([self._undated_rows, self._rows]),
+            np.concatenate([self._undated_symbol_ids, self._symbol_ids]),
+            np.concatenate([self._undated_prices, self._prices]),
+            np.concatenate([self._undated_invalid, self._invalid]),
+        )
+
+    def _slice_to_dict(self, lo: int, hi: int) -> Dict[str, float]:
+        """Rows ``lo:hi`` of the dated arrays merged with the undated rows in file order."""
+        if not len(self._undated_rows):
+            # Rows of one day are already in file order
+            return self._to_dict(
+                self._rows[lo:hi], self._symbol_ids[lo:hi], self._prices[lo:hi],
+                self._invalid[lo:hi],
+            )
+        rows = np.concatenate([self._rows[lo:hi], self._undated_rows])
+        order = np.argsort(rows, kind='stable')
+        return self._to_dict(
+            rows[order],
+            np.concatenate([self._symbol_ids[lo:hi], self._undated_symbol_ids])[order],
+            np.concatenate([self._prices[lo:hi], self._undated_prices])[order],
+            np.concatenate([self._invalid[lo:hi], self._undated_invalid])[order],
+        )
+
+    def _to_dict(self, rows: np.ndarray, symbol_ids: np.ndarray, prices: np.ndarray,
+                 invalid: np.ndarray) -> Dict[str, float]:
+        if invalid.any():
+            row = int(rows[invalid].min())
+            raise ValueError(self._errors.get(row, f"Invalid price in row {row}"))
+        return dict(zip(self._symbols[symbol_ids].tolist(), prices.tolist()))
@@ -0,0 +1,105 @@
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+# (is_buy, abs_qty, seq, symbol, qty); seq is unique, so symbol and qty never
+# take part in comparisons
+_Entry = Tuple[bool, int, int, str, int]
+
+
+class TradeScheduler:
+    """
+    Keeps portfolio trades in rebalance order between passes.
+
+    Rebalancers visit symbols sells first, then by increasing quantity, with
+    ties in ``portfolio_trades`` insertion order -- the order given by
+    ``sorted(portfolio_trades.items(), key=lambda item: (item[1] > 0, abs(item[1])))``.
+    Instead of re-sorting every pass, the schedule is kept as a sorted run
+    and only symbols reported through ``refresh`` are moved, each with a
+    binary search, when the next pass starts. Updates made during a pass
+    only take effect in the next one, just like iterating a sorted snapshot.
+
+    Example:
+        >>> scheduler = TradeScheduler(portfolio_state.portfolio_trades)
+        >>> for symbol, qty in scheduler.next_pass():
+        ...     # trade, then
+        ...     scheduler.refresh(portfolio_state.portfolio_trades, [symbol])
+    """
+
+    def __init__(self, portfolio_trades: Mapping[str, int]):
+        self.reset(portfolio_trades)
+
+    def reset(self, portfolio_trades: Mapping[str, int]) -> None:
+        """Rebuild the schedule from ``portfolio_trades``."""
+        self._source = portfolio_trades
+        self._entries: Dict[str, _Entry] = {}
+        self._next_seq = 0
+        for symbol, qty in portfolio_trades.items():
+            self._entries[symbol] = self._entry(symbol, qty)
+        self._run: List[_Entry] = sorted(self._entries.values())
+        # symbol -> entry the run held for it before its first pending change
+        self._pending: Dict[str, Optional[_Entry]] = {}
+        self._rebuild = False
+
+    def _entry(self, symbol: str, qty: int, seq: Optional[int] = None) -> _Entry:
+        if seq is None:
+            seq = self._next_seq
+            self._next_seq += 1
+        return (qty > 0, abs(qty), seq, symbol, qty)
+
+    def refresh(self, portfolio_trades: Mapping[str, int], symbols: Iterable[str]) -> None:
+        """
+        Record that ``symbols`` may have changed in ``portfolio_trades``.
+
+        If ``portfolio_trades`` is a different mapping than the one last seen
+        (e.g. ``PortfolioStateManager`` replaced it with a full recompute),
+        the whole schedule is rebuilt at the start of the next pass.
+        """
+        if portfolio_trades is not self._source or self._rebuild:
+            self._source = portfolio_trades
+            self._rebuild = True
+            return
+
+        for symbol in symbols:
+            old = self._entries.get(symbol)
+            if symbol not in portfolio_trades:
+                new = None
+            elif old is not None:
+                # Updating an existing key keeps its place among ties
+                new = self._entry(symbol, portfolio_trades[symbol], seq=old[2])
+            else:
+                new = self._entry(symbol, portfolio_trades[symbol])
+            if new == old:
+                continue
+            if symbol not in self._pending:
+                self._pending[symbol] = old
+            if new is None:
+                del self._entries[symbol]
+            else:
+                self._entries[symbol] = new
+
+    def _apply_pending(self) -> None:
+        if self._rebuild:
+            self.reset(self._source)
+            return
+
+        run = self._run
+        for symbol, old in self._pending.items():
+            if old is not None:
+                del run[bisect_left(run, old)]
+            new = self._entries.get(symbol)
+            if new is not None:
+                insort(run, new)
+        self._pending.clear()
+
+    def next_pass(self) -> List[Tuple[str, int]]:
+        """
+        Trades for the next pass, in order, as (symbol, qty) pairs.
+
+        The returned list is a snapshot; refreshes during the pass do not
+        change it.
+        """
+        self._apply_pending()
+        return [entry[3:] for entry in self._run]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,6 +1,15 @@
-from typing import List, Optional, Dict
+from typing import (
+    Callable, Dict, List, NamedTuple, Optional, Tuple, TYPE_CHECKING
+)
 
 from realloc.accounts import Account
+from realloc.indexes import CashIndex, PositionIndex
+
+if TYPE_CHECKING:
+    from realloc.portfolio import PortfolioStateManager
+
+
+FillPlan = Dict[str, List[Tuple[str, int]]]
 
 
 def select_account_for_buy_trade(
@@ -9,6 +18,7 @@ def select_account_for_buy_trade(
     accounts: List[Account],
     prices: Dict[str, float],
     cash_matrix: Dict[str, float],
+    cash_index: Optional[CashIndex] = None,
 ) -> Optional[str]:
     """
     Select the most appropriate account for a buy trade based on strict priority:
@@ -16,56 +26,52 @@ def select_account_for_buy_trade(
     2. Holder who can partially fulfill (largest partial)
     3. Non-holder who can fully fulfill
     4. Non-holder who can partially fulfill (largest partial)
+
+    If ``cash_index`` is given it must describe ``accounts`` and ``cash_matrix``;
+    the answer is then looked up in the index instead of scanning the accounts.
     """
     price = prices[symbol]
+    if cash_index is not None:
+        return cash_index.select_for_buy(symbol, trade_amount, price)
 
-    # Step 1: Holder who can fully fulfill
-    holder_full = [
-        a
-        for a in accounts
-        if symbol in a.positions
-           and int(cash_matrix[a.account_number] // price) >= trade_amount
-    ]
-    if holder_full:
-        # Sort by position size to concentrate positions
-        holder_full.sort(key=lambda a: a.positions.get(symbol, 0), reverse=True)
-        return holder_full[0].account_number
+    # Running best per tier, classified in one pass over the accounts.
+    # Ties keep the earliest account, as the original sort/max calls did.
+    holder_full = None  # (account, position) with the largest position
+    holder_partial = None  # (account, affordable) with the largest partial
+    nonholder_full = None  # first account
+    nonholder_partial = None  # (account, affordable) with the largest partial
 
-    # Step 2: Holder who can partially fulfill
-    holder_partials = [
-        (a, int(cash_matrix[a.account_number] // price))
-        for a in accounts
-        if symbol in a.positions and int(cash_matrix[a.account_number] // price) > 0
-    ]
-    if holder_partials:
-        best = max(holder_partials, key=lambda x: x[1])
-        return best[0].account_number
-
-    # Step 3: Non-holder who can fully fulfill
-    nonholder_full = [
-        a
-        for a in accounts
-        if symbol not in a.positions
-        and int(cash_matrix[a.account_number] // price) >= trade_amount
-    ]
-    if nonholder_full:
-        return nonholder_full[0].account_number
-
-    # Step 4: Non-holder who can partially fulfill
-    nonholder_partials = [
-        (a, int(cash_matrix[a.account_number] // price))
-        for a in accounts
-        if symbol not in a.positions and int(cash_matrix[a.account_number] // price) > 0
-    ]
-    if nonholder_partials:
-        best = max(nonholder_partials, key=lambda x: x[1])
-        return best[0].account_number
+    for a in accounts:
+        affordable = int(cash_matrix[a.account_number] // price)
+        if symbol in a.positions:
+            if affordable >= trade_amount:
+                position = a.positions[symbol]
+                if holder_full is None or position > holder_full[1]:
+                    holder_full = (a, position)
+            elif affordable > 0 and (holder_partial is None or affordable > holder_partial[1]):
+                holder_partial = (a, affordable)
+        elif affordable >= trade_amount:
+            if nonholder_full is None:
+                nonholder_full = a
+        elif affordable > 0 and (nonholder_partial is None or affordable > nonholder_partial[1]):
+            nonholder_partial = (a, affordable)
 
+    if holder_full is not None:
+        return holder_full[0].account_number
+    if holder_partial is not None:
+        return holder_partial[0].account_number
+    if nonholder_full is not None:
+        return nonholder_full.account_number
+    if nonholder_partial is not None:
+        return nonholder_partial[0].account_number
     return None
 
 
 def select_account_for_sell_trade(
-    symbol: str, trade_amount: int, accounts: List[Account]
+    symbol: str,
+    trade_amount: int,
+    accounts: List[Account],
+    position_index: Optional[PositionIndex] = None,
 ) -> Optional[str]:
     """
     Select the most appropriate account for a given sell trade.
@@ -74,34 +80,117 @@ def select_account_for_sell_trade(
     1. Accounts where the position will be fully liquidated (position <= trade_amount)
     2. Accounts that can fulfill the full sell with remaining position
     3. Account with the largest position if no complete fills are possible
+
+    If ``position_index`` is given it must describe ``accounts``; the answer is
+    then looked up in the index instead of scanning the accounts.
     """
-    candidates = [
-        a for a in accounts if symbol in a.positions and a.positions[symbol] > 0
-    ]
-    if not candidates:
-        return None
+    if position_index is not None:
+        account_id = position_index.largest_holder(symbol, at_most=trade_amount)
+        if account_id is None:
+            # Every holder has more than trade_amount, so the first one can fill it
+            account_id = position_index.first_holder(symbol)
+        return account_id
 
-    # First priority: accounts where position will be fully liquidated
-    full_liquidations = [
-        account for account in candidates
-        if account.positions[symbol] <= trade_amount
-    ]
-    if full_liquidations:
-        # Among full liquidations, prefer the largest position
-        full_liquidations.sort(key=lambda a: a.positions[symbol], reverse=True)
-        return full_liquidations[0].account_number
-
-    # Second priority: accounts that can fulfill the full sell
-    full_sellers = [
-        account for account in candidates
-        if account.positions[symbol] >= trade_amount
+    # Largest position that the sell fully liquidates (earliest account on ties)
+    liquidation = None
+    # First holder in account order; only used when no position can be liquidated,
+    # in which case every holder has more than trade_amount and can fill the sell
+    first_holder = None
+
+    for a in accounts:
+        position = a.positions.get(symbol)
+        if position is None or not position > 0:
+            continue
+        if first_holder is None:
+            first_holder = a
+        if position <= trade_amount and (liquidation is None or position > liquidation[1]):
+            liquidation = (a, position)
+
+    if liquidation is not None:
+        return liquidation[0].account_number
+    return first_holder.account_number if first_holder is not None else None
+
+
+class _LedgerAccount(NamedTuple):
+    """Account stand-in whose positions can be changed while planning fills."""
+    account_number: str
+    positions: Dict[str, float]
+
+
+def _plan_fills(
+    trades: Dict[str, int],
+    portfolio_state: "PortfolioStateManager",
+    select_buy: Callable[..., Optional[str]],
+    select_sell: Callable[..., Optional[str]],
+) -> FillPlan:
+    """
+    Assign every pending trade to accounts against a private cash and position ledger.
+
+    Trades are taken sells first, then smallest quantity first, so proceeds
+    from sells are available to later buys. Each symbol is filled account by
+    account until it is complete or no account can take more.
+    """
+    ledger = [
+        _LedgerAccount(a.account_number, dict(a.positions))
+        for a in portfolio_state.accounts.values()
     ]
-    if full_sellers:
-        return full_sellers[0].account_number
+    by_id = {a.account_number: a for a in ledger}
+    cash = dict(portfolio_state.cash_matrix)
+    prices = portfolio_state.prices
+
+    plan: FillPlan = {}
+    for symbol, qty in sorted(trades.items(), key=lambda item: (item[1] > 0, abs(item[1]))):
+        if qty == 0:
+            continue
+        fills = []
+        remaining = abs(qty)
+        while remaining > 0:
+            if qty > 0:
+                account_id = select_buy(symbol, remaining, ledger, prices, cash)
+                capacity = int(cash[account_id] // prices[symbol]) if account_id is not None else 0
+            else:
+                account_id = select_sell(symbol, remaining, ledger)
+                capacity = (
+                    int(by_id[account_id].positions.get(symbol, 0))
+                    if account_id is not None else 0
+                )
+            fill = min(remaining, capacity)
+            if fill <= 0:
+                break
+
+            shares = fill if qty > 0 else -fill
+            positions = by_id[account_id].positions
+            positions[symbol] = positions.get(symbol, 0) + shares
+            cash[account_id] -= shares * prices.get(symbol, 0)
+            fills.append((account_id, shares))
+            remaining -= fill
+        plan[symbol] = fills
+
+    return plan
+
+
+def select_accounts_for_trades(
+    trades: Dict[str, int], portfolio_state: "PortfolioStateManager"
+) -> FillPlan:
+    """
+    Plan account fills for all pending portfolio trades in one call.
+
+    Uses the same priorities as ``select_account_for_buy_trade`` and
+    ``select_account_for_sell_trade``, applied repeatedly against a running
+    ledger of cash and positions. ``portfolio_state`` is not modified.
+
+    Args:
+        trades: Portfolio-level trades, symbol -> shares (negative to sell)
+        portfolio_state: Current accounts, cash and prices
 
-    # Fallback: account with largest position
-    candidates.sort(key=lambda a: a.positions[symbol], reverse=True)
-    return candidates[0].account_number if candidates else None
+    Returns:
+        Dict mapping each symbol to a list of (account_id, shares) fills,
+        with negative shares for sells. Symbols that could not be (fully)
+        filled have fewer shares planned than requested.
+    """
+    return _plan_fills(
+        trades, portfolio_state, select_account_for_buy_trade, select_account_for_sell_trade
+    )
 
 
 class TaxAwareSelector:
@@ -109,15 +198,26 @@ class TaxAwareSelector:
         self.tax_deferred = set(tax_deferred_accounts)
 
     def select_account_for_sell_trade(
-        self, symbol: str, trade_amount: int, accounts: List[Account]
+        self,
+        symbol: str,
+        trade_amount: int,
+        accounts: List[Account],
+        position_index: Optional[PositionIndex] = None,
     ) -> Optional[str]:
         """
-        S
-        :param symbol:
-        :param trade_amount:
-        :param accounts:
-        :return:
+        Select an account for a sell, preferring taxable accounts.
+
+        Priority:
+        1. Largest taxable holder, if it can fill the whole sell
+        2. Largest tax-deferred holder, if it can fill the whole sell
+        3. Largest holder overall (taxable first on ties)
+
+        If ``position_index`` is given it must describe ``accounts``; holders
+        are then walked from the largest down instead of scanning all accounts.
         """
+        if position_index is not None:
+            return self._select_sell_from_index(symbol, trade_amount, position_index)
+
         taxable = [
             a
             for a in accounts
@@ -150,6 +250,32 @@ class TaxAwareSelector:
 
         return None
 
+    def _select_sell_from_index(
+        self, symbol: str, trade_amount: int, position_index: PositionIndex
+    ) -> Optional[str]:
+        largest_taxable = None
+        largest_deferred = None
+        for account_id, qty in position_index.holders(symbol):
+            if account_id in self.tax_deferred:
+                if largest_deferred is None:
+                    largest_deferred = (account_id, qty)
+            elif largest_taxable is None:
+                largest_taxable = (account_id, qty)
+            if largest_taxable is not None and largest_deferred is not None:
+                break
+
+        if largest_taxable is not None and largest_taxable[1] >= trade_amount:
+            return largest_taxable[0]
+        if largest_deferred is not None and largest_deferred[1] >= trade_amount:
+            return largest_deferred[0]
+        if largest_taxable is None and largest_deferred is None:
+            return None
+        if largest_deferred is None or (
+            largest_taxable is not None and largest_taxable[1] >= largest_deferred[1]
+        ):
+            return largest_taxable[0]
+        return largest_deferred[0]
+
     def select_account_for_buy_trade(
         self,
         symbol: str,
@@ -190,3 +316,18 @@ class TaxAwareSelector:
             return max(all_partial, key=lambda x: x[1])[0].account_number
 
         return None
+
+    def select_accounts_for_trades(
+        self, trades: Dict[str, int], portfolio_state: "PortfolioStateManager"
+    ) -> FillPlan:
+        """
+        Plan account fills for all pending portfolio trades using tax-aware priorities.
+
+        See ``select_accounts_for_trades`` for the shape of the result.
+        """
+        return _plan_fills(
+            trades,
+            portfolio_state,
+            self.select_account_for_buy_trade,
+            self.select_account_for_sell_trade,
+        )
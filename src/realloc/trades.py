@@ -1,8 +1,11 @@
-from dataclasses import dataclass, asdict
-from typing import List, Optional, Dict, TYPE_CHECKING, Any
+from array import array
+from dataclasses import dataclass
+from typing import List, Optional, Dict, TYPE_CHECKING, Any, Iterable, Iterator, Tuple, Union
 import math
 
+import numpy as np
 
+from realloc.interning import Interner
 from realloc.utils import normalize_symbol_sets
 
 if TYPE_CHECKING:
@@ -12,20 +15,126 @@ if TYPE_CHECKING:
 
 @dataclass
 class Trade:
+    # Slotted to keep per-trade memory down when runs emit millions of trades
+    __slots__ = ("account_id", "symbol", "shares")
+
     account_id: str
     symbol: str
     shares: float
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialize the dataclass to a dictionary"""
-        return asdict(self)
+        return {"account_id": self.account_id, "symbol": self.symbol, "shares": self.shares}
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'TradeInfo':
+    def from_dict(cls, data: Dict[str, Any]) -> 'Trade':
         """Deserialize from a dictionary to create a new instance"""
         return cls(**data)
 
 
+def _shares_value(shares: float) -> Union[int, float]:
+    return int(shares) if shares.is_integer() else shares
+
+
+class TradeBuffer:
+    """
+    Columnar, append-only store of trades.
+
+    Each trade is kept as an interned account index, an interned symbol index
+    and a share quantity in three typed arrays, roughly 24 bytes per trade
+    (8 + 8 + 8) instead of a ``Trade`` object. Iterating yields ``Trade``
+    objects on demand; ``rows``, ``to_dicts`` and ``to_arrays`` serialize
+    without creating them, and ``to_structured`` feeds ``bulk_update``
+    directly. Whole-number share quantities come back as ``int``.
+
+    Example:
+        >>> buffer = TradeBuffer()
+        >>> buffer.append("A1", "AAPL", 10)
+        >>> list(buffer)
+        [Trade(account_id='A1', symbol='AAPL', shares=10)]
+    """
+
+    def __init__(self, trades: Iterable[Trade] = ()):
+        self.accounts = Interner()
+        self.symbols = Interner()
+        self._account_idx = array("l")
+        self._symbol_idx = array("l")
+        self._shares = array("d")
+        self.extend(trades)
+
+    def append(self, account_id: str, symbol: str, shares: float) -> None:
+        """Add one trade."""
+        self._account_idx.append(self.accounts.intern(account_id))
+        self._symbol_idx.append(self.symbols.intern(symbol))
+        self._shares.append(shares)
+
+    def append_trade(self, trade: Trade) -> None:
+        """Add a ``Trade``."""
+        self.append(trade.account_id, trade.symbol, trade.shares)
+
+    def extend(self, trades: Iterable[Trade]) -> None:
+        """Add every trade in ``trades``."""
+        for trade in trades:
+            self.append(trade.account_id, trade.symbol, trade.shares)
+
+    def __len__(self) -> int:
+        return len(self._shares)
+
+    def __getitem__(self, index: int) -> Trade:
+        return Trade(
+            self.accounts.key(self._account_idx[index]),
+            self.symbols.key(self._symbol_idx[index]),
+            _shares_value(self._shares[index]),
+        )
+
+    def rows(self) -> Iterator[Tuple[str, str, Union[int, float]]]:
+        """Yield (account_id, symbol, shares) tuples in insertion order."""
+        account_keys = self.accounts.keys
+        symbol_keys = self.symbols.keys
+        for account, symbol, shares in zip(self._account_idx, self._symbol_idx, self._shares):
+            yield account_keys[account], symbol_keys[symbol], _shares_value(shares)
+
+    def __iter__(self) -> Iterator[Trade]:
+        for row in self.rows():
+            yield Trade(*row)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Trades as ``Trade.to_dict`` style dictionaries."""
+        return [
+            {"account_id": account_id, "symbol": symbol, "shares": shares}
+            for account_id, symbol, shares in self.rows()
+        ]
+
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        The columns as NumPy arrays.
+
+        The arrays are copies, so the buffer can keep growing while they are in use.
+
+        Returns:
+            Tuple of (account index, symbol index, shares) arrays; indices
+            resolve through ``accounts`` and ``symbols``
+        """
+        return (
+            np.frombuffer(self._account_idx, dtype=f"i{self._account_idx.itemsize}").copy(),
+            np.frombuffer(self._symbol_idx, dtype=f"i{self._symbol_idx.itemsize}").copy(),
+            np.frombuffer(self._shares, dtype=np.float64).copy(),
+        )
+
+    def to_structured(self) -> np.ndarray:
+        """Trades as a structured array with ``account_id``, ``symbol`` and ``shares`` fields."""
+        account_idx, symbol_idx, shares = self.to_arrays()
+        accounts = np.array(self.accounts.keys or [""], dtype=str)
+        symbols = np.array(self.symbols.keys or [""], dtype=str)
+        records = np.empty(len(shares), dtype=[
+            ("account_id", accounts.dtype), ("symbol", symbols.dtype), ("shares", np.float64)
+        ])
+        records["account_id"] = accounts[account_idx]
+        records["symbol"] = symbols[symbol_idx]
+        records["shares"] = shares
+        return records
+
+
 @dataclass
 class TradeInfo:
     """Information about a trade for validation purposes"""
@@ -1,7 +1,9 @@
 import pytest
+import numpy as np
 from realloc.accounts import Account
 from realloc.models import PortfolioModel
 from realloc.allocator import PortfolioAllocator
+from realloc.frame import LabeledMatrix
 
 
 @pytest.fixture
@@ -91,6 +93,22 @@ def test_compute_target_allocations(allocator):
         assert target[acc_id]["GOOG"] == 0.5
 
 
+def test_compute_target_allocations_returns_own_dicts(allocator):
+    target = allocator.compute_target_allocations()
+    assert type(target["A1"]) is dict
+    target["A1"]["AAPL"] = 0.9
+    assert target["A2"]["AAPL"] == 0.5
+    assert allocator.model.normalized["AAPL"] == 0.5
+
+
+def test_shared_target_allocations(allocator):
+    target = allocator.shared_target_allocations()
+    assert target["A1"] is target["A2"] is allocator.model.normalized
+    assert target == allocator.compute_target_allocations()
+    with pytest.raises(TypeError):
+        target["A1"]["AAPL"] = 0.9
+
+
 def test_compute_target_positions(allocator):
     positions = allocator.compute_target_positions()
     assert isinstance(positions, dict)
@@ -136,4 +154,148 @@ def test_allocator_with_missing_price(sample_accounts, sample_model, sample_pric
     bad_model = PortfolioModel(name="BadModel", targets={"XYZ": 1.0})
     allocator = PortfolioAllocator(sample_accounts, bad_model, sample_prices)
     with pytest.raises(KeyError):
-        allocator.compute_target_positions()
\ No newline at end of file
+        allocator.compute_target_positions()
+
+def test_matrix_axes(allocator):
+    current = allocator.current_allocations_matrix()
+    assert isinstance(current, LabeledMatrix)
+    assert current.accounts == ("A1", "A2")
+    assert current.symbols == ("AAPL", "GOOG", "CASH")
+    assert current.shape == (2, 3)
+
+
+def test_current_allocations_matrix_matches_dict(allocator):
+    current = allocator.current_allocations_matrix()
+    for acc_id, weights in allocator.get_current_allocations().items():
+        for sym, weight in weights.items():
+            assert current[acc_id, sym] == pytest.approx(weight)
+    assert current["A1", "GOOG"] == 0.0
+
+
+def test_target_allocations_matrix(allocator):
+    target = allocator.target_allocations_matrix()
+    assert target.row("A1") == {"AAPL": 0.5, "GOOG": 0.5, "CASH": 0.0}
+    assert not target.values.flags.writeable
+
+
+def test_target_positions_matrix_matches_dict(allocator):
+    target = allocator.target_positions_matrix()
+    for acc_id, positions in allocator.compute_target_positions().items():
+        for sym, shares in positions.items():
+            assert target[acc_id, sym] == pytest.approx(shares)
+
+
+def test_allocation_differences_matrix_matches_dict(allocator):
+    current, target = allocator.allocation_differences_matrix()
+    drift = current - target
+    for acc_id, diffs in allocator.get_allocation_differences().items():
+        for sym, (curr, tgt) in diffs.items():
+            assert drift[acc_id, sym] == pytest.approx(curr - tgt)
+
+
+def test_matrix_with_cash_in_the_model(sample_accounts, sample_prices):
+    # CASH sits last on the symbol axis even when the model lists it first
+    model = PortfolioModel(name="Cash", targets={"AAPL": 0.3, "CASH": 0.2, "GOOG": 0.5})
+    allocator = PortfolioAllocator(sample_accounts, model, {**sample_prices, "CASH": 1.0})
+    current, target = allocator.allocation_differences_matrix()
+    assert target.symbols == ("AAPL", "GOOG", "CASH")
+
+    for acc_id, diffs in allocator.get_allocation_differences().items():
+        for sym, (curr, tgt) in diffs.items():
+            assert current[acc_id, sym] == pytest.approx(curr)
+            assert target[acc_id, sym] == pytest.approx(tgt)
+
+    positions = allocator.target_positions_matrix()
+    for acc_id, shares in allocator.compute_target_positions().items():
+        for sym, qty in shares.items():
+            assert positions[acc_id, sym] == pytest.approx(qty)
+
+
+def test_matrix_includes_held_non_model_symbols(sample_prices):
+    accounts = [
+        Account(label="A", account_number="A1", cash=0, positions={"MSFT": 2}),
+        Account(label="B", account_number="A2", cash=0, positions={}),
+    ]
+    model = PortfolioModel(name="M", targets={"AAPL": 1.0})
+    allocator = PortfolioAllocator(accounts, model, {**sample_prices, "MSFT": 50})
+    current = allocator.current_allocations_matrix()
+    assert current.symbols == ("AAPL", "MSFT", "CASH")
+    assert current.row("A1") == {"AAPL": 0.0, "MSFT": 1.0, "CASH": 0.0}
+    # Zero-value accounts get a zero row, like the empty dict of the dict API
+    assert current.row("A2") == {"AAPL": 0.0, "MSFT": 0.0, "CASH": 0.0}
+    assert current.column("MSFT") == {"A1": 1.0, "A2": 0.0}
+
+
+def test_matrix_missing_prices(sample_accounts, sample_model, sample_prices):
+    with pytest.raises(KeyError):
+        PortfolioAllocator(sample_accounts, sample_model, {}).current_allocations_matrix()
+
+    bad_model = PortfolioModel(name="BadModel", targets={"XYZ": 1.0})
+    allocator = PortfolioAllocator(sample_accounts, bad_model, sample_prices)
+    allocator.current_allocations_matrix()
+    with pytest.raises(KeyError):
+        allocator.target_positions_matrix()
+
+
+def test_labeled_matrix_validation():
+    with pytest.raises(ValueError):
+        LabeledMatrix(np.zeros((2, 2)), ["A1"], ["AAPL", "GOOG"])
+    a = LabeledMatrix(np.ones((1, 2)), ["A1"], ["AAPL", "GOOG"])
+    b = LabeledMatrix(np.ones((1, 2)), ["A1"], ["GOOG", "AAPL"])
+    with pytest.raises(ValueError):
+        a - b
+    assert a.to_dict() == {"A1": {"AAPL": 1.0, "GOOG": 1.0}}
+    assert (a - a).to_dict(drop_zeros=True) == {"A1": {}}
+
+
+def test_update_prices_revalues_holders(allocator):
+    allocator.compute_account_values()
+    allocator.update_prices({"AAPL": 110})
+    # A1 holds 5 AAPL: $1000 + 5 * $110; A2 holds none
+    assert allocator.compute_account_values() == {"A1": 1550, "A2": 2600}
+    assert allocator.total_portfolio_value == 4150
+    assert allocator.get_current_allocations()["A1"]["AAPL"] == pytest.approx(550 / 1550)
+
+
+def test_update_prices_matches_fresh_allocator(sample_accounts, sample_model, sample_prices):
+    allocator = PortfolioAllocator(sample_accounts, sample_model, dict(sample_prices))
+    allocator.total_portfolio_value
+    allocator.current_allocations_matrix()
+
+    new_prices = {"AAPL": 95.5, "GOOG": 210}
+    allocator.update_prices(new_prices)
+    fresh = PortfolioAllocator(sample_accounts, sample_model, {**sample_prices, **new_prices})
+
+    assert allocator.compute_account_values() == pytest.approx(fresh.compute_account_values())
+    assert allocator.total_portfolio_value == pytest.approx(fresh.total_portfolio_value)
+    np.testing.assert_allclose(
+        allocator.current_allocations_matrix().values,
+        fresh.current_allocations_matrix().values,
+    )
+    np.testing.assert_allclose(
+        allocator.target_positions_matrix().values,
+        fresh.target_positions_matrix().values,
+    )
+
+
+def test_update_prices_leaves_shared_price_dict_alone(sample_accounts, sample_model, sample_prices):
+    first = PortfolioAllocator(sample_accounts, sample_model, sample_prices)
+    second = PortfolioAllocator(sample_accounts, sample_model, sample_prices)
+    first.compute_account_values()
+    second.compute_account_values()
+
+    first.update_prices({"AAPL": 110})
+    assert sample_prices == {"AAPL": 100, "GOOG": 200}
+    assert first.compute_account_values() == {"A1": 1550, "A2": 2600}
+    second.update_prices({"AAPL": 110})
+    assert second.compute_account_values() == first.compute_account_values()
+
+
+def test_update_prices_before_any_valuation(allocator):
+    allocator.update_prices({"GOOG": 250, "MSFT": 10})
+    assert allocator.compute_account_values() == {"A1": 1500, "A2": 2750}
+
+
+def test_update_prices_rejects_non_positive(allocator):
+    with pytest.raises(ValueError):
+        allocator.update_prices({"AAPL": 0})
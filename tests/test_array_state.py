@@ -0,0 +1,189 @@
+import json
+
+import pytest
+
+from realloc import Account, ArrayPortfolioStateManager, PortfolioStateManager, Trade
+from realloc.bench import generate_portfolio
+from realloc.interning import Interner
+from realloc.plugins.rebalancers.default_rebalancer import DefaultRebalancer
+from realloc.portfolio import (
+    calculate_portfolio_positions,
+    calculate_target_shares,
+    compute_portfolio_trades,
+)
+
+
+@pytest.fixture
+def sample_accounts():
+    return [
+        Account("IRA", "A1", 1000.0, {"AAPL": 5, "MSFT": 0}),
+        Account("Taxable", "A2", 500.0, {"GOOG": 2}),
+    ]
+
+
+@pytest.fixture
+def prices():
+    return {"AAPL": 100.0, "GOOG": 200.0, "MSFT": 50.0}
+
+
+@pytest.fixture
+def state(sample_accounts, prices):
+    return ArrayPortfolioStateManager(sample_accounts, prices, {"AAPL": 5, "GOOG": -2})
+
+
+def copy_accounts(accounts):
+    return [Account(a.label, a.account_number, a.cash, dict(a.positions)) for a in accounts]
+
+
+# ------------------------------------------------------------------------------
+# 🔥 Interner
+# ------------------------------------------------------------------------------
+
+def test_interner_assigns_dense_ids_in_first_seen_order():
+    interner = Interner(["B", "A", "B"])
+    assert interner.intern("C") == 2
+    assert interner["A"] == 1
+    assert interner.key(0) == "B"
+    assert list(interner) == ["B", "A", "C"]
+    assert len(interner) == 3
+    assert "D" not in interner
+    assert interner.get("D") is None
+
+
+# ------------------------------------------------------------------------------
+# 🔥 Dict views
+# ------------------------------------------------------------------------------
+
+def test_account_positions_stay_plain_dicts(state, sample_accounts):
+    positions = sample_accounts[0].positions
+    assert type(positions) is dict
+    assert positions == {"AAPL": 5, "MSFT": 0}
+
+    # Direct edits are picked up by refresh(), as with the dict backend
+    positions["TSLA"] = 3
+    del positions["MSFT"]
+    state.refresh()
+    assert sample_accounts[0].positions is positions
+    assert state.position_matrix[state.account_ids["A1"], state.symbol_ids["TSLA"]] == 3
+    assert not state._held[state.account_ids["A1"], state.symbol_ids["MSFT"]]
+
+
+def test_updates_and_rollback_keep_positions_in_sync(state, sample_accounts):
+    state.prices["TSLA"] = 10.0
+    with state.transaction():
+        state.update([Trade("A1", "AAPL", 2)])
+        state.bulk_update(["A2", "A2"], ["TSLA", "GOOG"], [4, -1])
+        assert sample_accounts[0].positions == {"AAPL": 7, "MSFT": 0}
+        assert sample_accounts[1].positions == {"GOOG": 1, "TSLA": 4}
+        assert all(type(qty) is int for qty in sample_accounts[1].positions.values())
+        state.rollback()
+
+    assert sample_accounts[0].positions == {"AAPL": 5, "MSFT": 0}
+    assert sample_accounts[1].positions == {"GOOG": 2}
+    assert state.position_matrix[state.account_ids["A2"], state.symbol_ids["TSLA"]] == 0
+    assert state.combined_positions == {"AAPL": 5, "MSFT": 0, "GOOG": 2}
+
+
+def test_to_dict_round_trips_through_json(state, sample_accounts, prices):
+    state.update([Trade("A1", "AAPL", 1)])
+    account_data = json.loads(json.dumps([a.to_dict() for a in sample_accounts]))
+    state_data = json.loads(json.dumps(state.to_dict()))
+
+    assert account_data[0]["positions"] == {"AAPL": 6, "MSFT": 0}
+    assert type(account_data[0]["positions"]["AAPL"]) is int
+    accounts = [Account.from_dict(data) for data in account_data]
+    restored = ArrayPortfolioStateManager.from_dict(state_data, accounts)
+    assert restored.to_dict() == state.to_dict()
+    assert restored.get_total_portfolio_value() == state.get_total_portfolio_value()
+
+
+def test_cash_and_price_views(state, prices):
+    assert state.cash_matrix == {"A1": 1000.0, "A2": 500.0}
+    state.cash_matrix["A1"] -= 100
+    assert state.cash_vector.tolist() == [900.0, 500.0]
+
+    assert state.prices == prices
+    assert "TSLA" not in state.prices
+    with pytest.raises(KeyError):
+        state.cash_matrix["missing"]
+
+
+def test_update_grows_matrix_for_new_symbols(state, sample_accounts):
+    for i in range(20):
+        state.prices[f"NEW{i}"] = 1.0
+    state.update([Trade("A2", "NEW19", 10), Trade("A2", "AAPL", 1)])
+
+    assert sample_accounts[1].positions == {"GOOG": 2, "NEW19": 10, "AAPL": 1}
+    assert state.cash_matrix["A2"] == pytest.approx(500 - 10 - 100)
+    assert state.combined_positions["AAPL"] == 6
+    assert state.position_index.largest_holder("NEW19") == "A2"
+
+
+def test_update_rejects_negative_positions():
+    account = Account("Test", "001", 1000.0, {"AAPL": 5}, enforce_no_negative_positions=True)
+    state = ArrayPortfolioStateManager([account], {"AAPL": 100.0})
+    with pytest.raises(ValueError):
+        state.update([Trade("001", "AAPL", -10)])
+
+
+def test_refresh_absorbs_replaced_positions(state, sample_accounts):
+    sample_accounts[1].positions = {"MSFT": 4}
+    state.refresh()
+    assert sample_accounts[1].positions == {"MSFT": 4}
+    assert state.combined_positions == {"AAPL": 5, "MSFT": 4}
+
+
+# ------------------------------------------------------------------------------
+# 🔥 Equivalence with PortfolioStateManager
+# ------------------------------------------------------------------------------
+
+def test_valuations_match_dict_backend(sample_accounts, prices):
+    dict_state = PortfolioStateManager(copy_accounts(sample_accounts), prices, {"AAPL": 5})
+    array_state = ArrayPortfolioStateManager(sample_accounts, prices, {"AAPL": 5})
+
+    assert array_state.get_total_portfolio_value() == dict_state.get_total_portfolio_value()
+    assert array_state.reconcile_positions() == dict_state.reconcile_positions()
+    assert array_state.get_account_summary() == dict_state.get_account_summary()
+
+
+def test_valuation_requires_prices_for_held_symbols():
+    state = ArrayPortfolioStateManager([Account("Test", "A1", 0.0, {"XYZ": 1})], {"AAPL": 1.0})
+    with pytest.raises(KeyError):
+        state.get_total_portfolio_value()
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_default_rebalancer_matches_dict_backend(seed):
+    portfolio = generate_portfolio(15, 30, seed=seed, holder_density=0.3)
+    combined, total_cash = calculate_portfolio_positions(portfolio.accounts)
+    targets = calculate_target_shares(combined, total_cash, portfolio.prices, portfolio.model)
+    trades = compute_portfolio_trades(combined, targets)
+
+    dict_state = PortfolioStateManager(
+        copy_accounts(portfolio.accounts), portfolio.prices, trades
+    )
+    array_state = ArrayPortfolioStateManager(
+        copy_accounts(portfolio.accounts), portfolio.prices, trades
+    )
+
+    rebalancer = DefaultRebalancer()
+    expected = rebalancer.execute_rebalance(dict_state, targets, 100)
+    actual = rebalancer.execute_rebalance(array_state, targets, 100)
+
+    assert actual == expected
+    assert array_state.cash_matrix == pytest.approx(dict(dict_state.cash_matrix))
+    assert array_state.portfolio_trades == dict_state.portfolio_trades
+    assert array_state.get_total_portfolio_value() == pytest.approx(
+        dict_state.get_total_portfolio_value()
+    )
+
+
+def test_running_totals_match_recompute(state):
+    state.get_total_portfolio_value()
+    state.update([Trade("A1", "GOOG", 1), Trade("A2", "MSFT", 2)])
+    state.adjust_cash("A1", 100)
+    state.update_prices({"GOOG": 150.0})
+
+    expected = state.cash_vector.sum() + state.position_matrix.sum(axis=0) @ state.price_vector
+    assert state.get_total_portfolio_value() == pytest.approx(expected)
+    assert state.total_cash == pytest.approx(state.cash_vector.sum())
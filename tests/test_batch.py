@@ -0,0 +1,106 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from realloc import Account, PortfolioModel
+from realloc.batch import Household, rebalance_batch, rebalance_household
+
+
+def make_household(i, prices=None):
+    accounts = [
+        Account(label="IRA", account_number=f"H{i}-1", cash=1000 + 100 * i, positions={"AAPL": 10}),
+        Account(label="Taxable", account_number=f"H{i}-2", cash=500, positions={"GOOG": 2 + i % 3}),
+    ]
+    model = PortfolioModel(name="Balanced", targets={"AAPL": 0.4, "GOOG": 0.4, "BND": 0.2})
+    return Household(f"H{i}", accounts, model, prices or {"AAPL": 100, "GOOG": 200, "BND": 50})
+
+
+def trade_tuples(result):
+    return [(t.account_id, t.symbol, t.shares) for t in result.trades]
+
+
+def test_rebalance_household():
+    result = rebalance_household(make_household(0))
+    assert result.ok
+    assert result.household_id == "H0"
+    assert {t.symbol for t in result.trades} >= {"BND"}
+
+
+def test_rebalance_household_isolates_errors():
+    result = rebalance_household(make_household(0, prices={"AAPL": 100}))
+    assert not result.ok
+    assert result.error.startswith("KeyError")
+    assert result.trades == []
+
+
+def test_unknown_rebalancer_reported():
+    result = rebalance_household(make_household(0), rebalancer="no_such_plugin")
+    assert not result.ok
+
+
+def test_batch_matches_sequential_and_keeps_order():
+    households = [make_household(i) for i in range(7)]
+    households[3] = make_household(3, prices={"AAPL": 100})
+    expected = [rebalance_household(make_household(i)) for i in range(7)]
+
+    results = list(rebalance_batch(iter(households), max_workers=2, chunk_size=2))
+
+    assert [r.household_id for r in results] == [f"H{i}" for i in range(7)]
+    assert not results[3].ok
+    for i, result in enumerate(results):
+        if i != 3:
+            assert result.ok
+            assert trade_tuples(result) == trade_tuples(expected[i])
+
+
+def test_batch_with_given_executor():
+    households = [make_household(i) for i in range(5)]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(rebalance_batch(households, executor=executor, chunk_size=3,
+                                       rebalancer="vectorized"))
+    assert [r.household_id for r in results] == [f"H{i}" for i in range(5)]
+    assert all(r.ok for r in results)
+
+
+def test_batch_rejects_bad_chunk_size():
+    with pytest.raises(ValueError):
+        list(rebalance_batch([make_household(0)], chunk_size=0))
+
+
+class ExitingModel(PortfolioModel):
+    """Model that kills the worker process as soon as it is read."""
+
+    @property
+    def normalized(self):
+        os._exit(1)
+
+
+def exiting_household(i):
+    household = make_household(i)
+    household.model = ExitingModel(name="Exit", targets={"AAPL": 1.0})
+    return household
+
+
+def test_batch_survives_a_dead_worker():
+    households = [make_household(i) for i in range(6)]
+    households[1] = exiting_household(1)
+
+    results = list(rebalance_batch(households, max_workers=2, chunk_size=1))
+
+    assert [r.household_id for r in results] == [f"H{i}" for i in range(6)]
+    assert not results[1].ok
+    assert results[1].error.startswith("BrokenProcessPool")
+    assert all(r.ok for i, r in enumerate(results) if i != 1)
+
+
+def test_broken_caller_executor_fails_remaining_chunks():
+    households = [make_household(i) for i in range(6)]
+    households[1] = exiting_household(1)
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        results = list(rebalance_batch(households, executor=executor, chunk_size=1))
+
+    assert [r.household_id for r in results] == [f"H{i}" for i in range(6)]
+    assert not results[1].ok
+    assert not results[-1].ok
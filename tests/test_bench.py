@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+from realloc.bench import generate_portfolio, run_benchmarks, write_csv_inputs
+from realloc.bench import runner
+from realloc.bench.runner import main, parse_sizes
+from realloc.plugins.importers.account.account_csv import CSVAccountImporter
+from realloc.plugins.importers.allocation.allocation_csv import AllocationCSVImporter
+from realloc.plugins.importers.prices.prices_csv import PricesCSVImporter
+
+
+# ------------------------------------------------------------------------------
+# 🔥 Generator
+# ------------------------------------------------------------------------------
+
+def test_generator_is_deterministic():
+    first = generate_portfolio(20, 40, seed=7)
+    second = generate_portfolio(20, 40, seed=7)
+
+    assert [a.to_dict() for a in first.accounts] == [a.to_dict() for a in second.accounts]
+    assert first.prices == second.prices
+    assert first.model.targets == second.model.targets
+
+
+def test_generator_respects_knobs():
+    portfolio = generate_portfolio(
+        50, 100, seed=1, cash_skew=0.0, median_cash=2500.0,
+        holder_density=0.0, model_size=10, price_range=(10.0, 20.0),
+    )
+
+    assert len(portfolio.accounts) == 50
+    assert all(a.cash == 2500.0 for a in portfolio.accounts)
+    assert all(not a.positions for a in portfolio.accounts)
+    assert len(portfolio.model.targets) == 10
+    assert sum(portfolio.model.targets.values()) == pytest.approx(1.0)
+    assert all(10.0 <= p <= 20.0 for p in portfolio.prices.values())
+
+
+def test_csv_inputs_round_trip(tmp_path):
+    portfolio = generate_portfolio(5, 20, seed=3, holder_density=0.5)
+    paths = write_csv_inputs(portfolio, tmp_path)
+
+    accounts = CSVAccountImporter().account_importer(paths["positions"])
+    prices = PricesCSVImporter().import_prices(paths["prices"])
+    model = AllocationCSVImporter().import_allocations(paths["allocations"])
+
+    assert [a.to_dict() for a in accounts] == [a.to_dict() for a in portfolio.accounts]
+    assert prices == portfolio.prices
+    assert model.targets == pytest.approx(portfolio.model.targets)
+
+
+# ------------------------------------------------------------------------------
+# 🔥 Runner
+# ------------------------------------------------------------------------------
+
+def test_run_benchmarks_writes_report(tmp_path):
+    output = tmp_path / "bench.json"
+    report = run_benchmarks(sizes=[(3, 10), (5, 20)], repeat=1, output=output)
+
+    assert json.loads(output.read_text()) == report
+    assert [(r["accounts"], r["symbols"]) for r in report["results"]] == [(3, 10), (5, 20)]
+    timings = report["results"][0]["timings"]
+    assert {
+        "calculate_target_shares",
+        "compute_portfolio_trades",
+        "select_buy",
+        "select_sell",
+        "default_rebalance",
+        "import_accounts_csv",
+        "import_prices_csv",
+        "import_allocations_csv",
+    } <= set(timings)
+    assert all(t["best"] >= 0 and t["repeat"] == 1 for t in timings.values())
+
+
+def test_parse_sizes():
+    assert parse_sizes("10x50,100X500") == [(10, 50), (100, 500)]
+    with pytest.raises(Exception):
+        parse_sizes("10by50")
+
+
+def test_main(tmp_path, capsys):
+    output = tmp_path / "report.json"
+    assert main(["--sizes", "3x8", "--repeat", "1", "--output", str(output)]) == 0
+    assert output.exists()
+    assert "3 accounts x 8 symbols" in capsys.readouterr().out
+
+
+def test_main_generator_options(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        runner, "run_benchmarks", lambda **kwargs: calls.append(kwargs) or {"results": []}
+    )
+    assert main([
+        "--sizes", "3x8", "--model-size", "4", "--median-cash", "500",
+        "--price-range", "10", "20", "--output", str(tmp_path / "report.json"),
+    ]) == 0
+    assert calls[0]["model_size"] == 4
+    assert calls[0]["median_cash"] == 500.0
+    assert calls[0]["price_range"] == (10.0, 20.0)
+
+
+def test_main_rejects_inverted_price_range(tmp_path):
+    with pytest.raises(SystemExit):
+        main(["--price-range", "20", "10", "--output", str(tmp_path / "report.json")])
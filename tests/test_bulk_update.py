@@ -0,0 +1,123 @@
+import copy
+
+import numpy as np
+import pytest
+
+from realloc import (
+    Account,
+    ArrayPortfolioStateManager,
+    NegativePositionError,
+    PortfolioStateManager,
+    Trade,
+)
+from realloc.bench import generate_portfolio
+
+
+@pytest.fixture(params=[PortfolioStateManager, ArrayPortfolioStateManager], ids=lambda c: c.__name__)
+def state_class(request):
+    return request.param
+
+
+def make_accounts():
+    return [
+        Account("IRA", "A1", 1000.0, {"AAPL": 5}, enforce_no_negative_positions=True),
+        Account("Taxable", "A2", 500.0, {"GOOG": 2}),
+    ]
+
+
+PRICES = {"AAPL": 100.0, "GOOG": 200.0, "MSFT": 50.0}
+
+
+def state_snapshot(state):
+    return (
+        {a.account_number: dict(a.positions) for a in state.accounts.values()},
+        {k: round(v, 6) for k, v in state.cash_matrix.items()},
+        {k: round(v, 6) for k, v in state.combined_positions.items()},
+        round(state.get_total_portfolio_value(), 6),
+    )
+
+
+# ------------------------------------------------------------------------------
+# 🔥 Equivalence with update()
+# ------------------------------------------------------------------------------
+
+@pytest.mark.parametrize("seed", range(5))
+def test_bulk_update_matches_sequential_update(state_class, seed):
+    portfolio = generate_portfolio(20, 40, seed=seed, holder_density=0.2)
+    rng = np.random.default_rng(seed)
+    n = 500
+    account_ids = rng.choice([a.account_number for a in portfolio.accounts], n)
+    symbols = rng.choice(list(portfolio.prices), n)
+    shares = rng.integers(1, 20, n).astype(float)
+
+    expected = state_class(copy.deepcopy(portfolio.accounts), portfolio.prices)
+    expected.update([Trade(a, s, q) for a, s, q in zip(account_ids, symbols, shares)])
+    target = {sym: 100.0 for sym in portfolio.prices}
+    expected.update_portfolio_trades(target)
+
+    actual = state_class(copy.deepcopy(portfolio.accounts), portfolio.prices)
+    actual.bulk_update(account_ids, symbols, shares)
+    actual.update_portfolio_trades(target)
+
+    assert state_snapshot(actual) == state_snapshot(expected)
+    assert actual.portfolio_trades == expected.portfolio_trades
+    for sym in portfolio.prices:
+        assert list(actual.position_index.holders(sym)) == list(expected.position_index.holders(sym))
+        assert actual.cash_index.select_for_buy(sym, 5, portfolio.prices[sym]) == \
+            expected.cash_index.select_for_buy(sym, 5, portfolio.prices[sym])
+
+
+def test_bulk_update_accepts_structured_array(state_class):
+    state = state_class(make_accounts(), PRICES)
+    trades = np.array(
+        [("A1", "AAPL", 2.0), ("A2", "MSFT", 4.0), ("A1", "AAPL", -3.0)],
+        dtype=[("account_id", "U8"), ("symbol", "U8"), ("shares", "f8")],
+    )
+    state.bulk_update(trades)
+
+    assert state.accounts["A1"].positions == {"AAPL": 4}
+    assert state.accounts["A2"].positions == {"GOOG": 2, "MSFT": 4}
+    assert state.cash_matrix["A1"] == 1100.0
+    assert state.cash_matrix["A2"] == 300.0
+
+
+# ------------------------------------------------------------------------------
+# 🔥 Validation
+# ------------------------------------------------------------------------------
+
+def test_bulk_update_reports_every_negative_row(state_class):
+    state = state_class(make_accounts(), PRICES)
+    before = state_snapshot(state)
+
+    with pytest.raises(NegativePositionError) as excinfo:
+        state.bulk_update(
+            ["A1", "A1", "A2", "A1", "A1"],
+            ["AAPL", "AAPL", "GOOG", "MSFT", "AAPL"],
+            [-3, -3, -5, -1, 10],
+        )
+
+    # A2 does not enforce no-negative positions; A1's AAPL recovers on row 4
+    assert excinfo.value.rows == [1, 3]
+    assert "row 1 (A1 AAPL" in str(excinfo.value)
+    assert state_snapshot(state) == before
+
+
+def test_bulk_update_rejects_unknown_accounts(state_class):
+    state = state_class(make_accounts(), PRICES)
+    with pytest.raises(ValueError, match="Invalid account IDs"):
+        state.bulk_update(["A1", "ZZ"], ["AAPL", "AAPL"], [1, 1])
+
+
+def test_bulk_update_requires_equal_lengths(state_class):
+    state = state_class(make_accounts(), PRICES)
+    with pytest.raises(ValueError, match="same length"):
+        state.bulk_update(["A1"], ["AAPL", "GOOG"], [1, 1])
+
+
+def test_bulk_update_can_be_rolled_back(state_class):
+    state = state_class(make_accounts(), PRICES)
+    before = state_snapshot(state)
+    with state.transaction():
+        state.bulk_update(["A1", "A2", "A2"], ["AAPL", "MSFT", "GOOG"], [1, 2, -1])
+        state.rollback()
+    assert state_snapshot(state) == before
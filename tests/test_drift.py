@@ -0,0 +1,128 @@
+import pytest
+
+from realloc import Account, PortfolioAllocator, PortfolioModel
+from realloc.drift import DriftBand, DriftScanner
+
+
+@pytest.fixture
+def model():
+    return PortfolioModel(name="Balanced", targets={"AAPL": 0.5, "GOOG": 0.5})
+
+
+@pytest.fixture
+def prices():
+    return {"AAPL": 100, "GOOG": 100, "MSFT": 100}
+
+
+@pytest.fixture
+def allocator(model, prices):
+    accounts = [
+        # On target
+        Account(label="A", account_number="A1", cash=0, positions={"AAPL": 5, "GOOG": 5}),
+        # 60/40
+        Account(label="B", account_number="A2", cash=0, positions={"AAPL": 6, "GOOG": 4}),
+        # 52/48
+        Account(label="C", account_number="A3", cash=0, positions={"AAPL": 52, "GOOG": 48}),
+    ]
+    return PortfolioAllocator(accounts, model, prices)
+
+
+# ---------------------------------------------------------------------------
+# 📏 Drift values
+# ---------------------------------------------------------------------------
+
+def test_scan_matches_allocation_differences(allocator):
+    report = DriftScanner().scan(allocator)
+    for acc_id, diffs in allocator.get_allocation_differences().items():
+        row = report.accounts.index(acc_id)
+        for sym, (current, target) in diffs.items():
+            col = report.symbols.index(sym)
+            assert report.absolute[row, col] == pytest.approx(current - target)
+
+
+def test_scan_with_cash_in_the_model(prices):
+    model = PortfolioModel(name="Cash", targets={"AAPL": 0.3, "CASH": 0.2, "GOOG": 0.5})
+    accounts = [
+        Account(label="A", account_number="A1", cash=200, positions={"AAPL": 3, "GOOG": 5}),
+        Account(label="B", account_number="A2", cash=0, positions={"AAPL": 6, "GOOG": 4}),
+    ]
+    allocator = PortfolioAllocator(accounts, model, prices)
+    report = DriftScanner().scan(allocator)
+    for acc_id, diffs in allocator.get_allocation_differences().items():
+        row = report.accounts.index(acc_id)
+        for sym, (current, target) in diffs.items():
+            col = report.symbols.index(sym)
+            assert report.absolute[row, col] == pytest.approx(current - target)
+    # A1 is exactly on its 30/20/50 target
+    assert report.flagged_accounts() == ["A2"]
+
+
+def test_relative_drift(allocator):
+    report = DriftScanner().scan(allocator)
+    row, col = report.accounts.index("A2"), report.symbols.index("AAPL")
+    assert report.relative[row, col] == pytest.approx(0.2)
+    assert report.relative[row, report.symbols.index("CASH")] == 0.0
+
+
+def test_account_and_symbol_drift(allocator):
+    report = DriftScanner().scan(allocator)
+    assert report.account_drift() == pytest.approx({"A1": 0.0, "A2": 0.1, "A3": 0.02})
+    assert report.symbol_drift() == pytest.approx({"AAPL": 0.1, "GOOG": 0.1, "CASH": 0.0})
+
+
+# ---------------------------------------------------------------------------
+# 🚦 Tolerance bands
+# ---------------------------------------------------------------------------
+
+def test_default_band_flags_outside_accounts(allocator):
+    assert DriftScanner().scan(allocator).flagged_accounts() == ["A2"]
+
+
+def test_per_model_bands(allocator):
+    scanner = DriftScanner(bands={"Balanced": DriftBand(absolute=0.01)})
+    assert scanner.scan(allocator).flagged_accounts() == ["A2", "A3"]
+
+    scanner = DriftScanner(bands={"Other": DriftBand(absolute=0.01)})
+    assert scanner.scan(allocator).flagged_accounts() == ["A2"]
+
+
+def test_relative_band(allocator):
+    scanner = DriftScanner(default_band=DriftBand(absolute=1.0, relative=0.03))
+    assert scanner.scan(allocator).flagged_accounts() == ["A2", "A3"]
+
+
+def test_off_model_holding_flagged_by_absolute_band(model, prices):
+    accounts = [Account(label="A", account_number="A1", cash=0,
+                        positions={"AAPL": 45, "GOOG": 45, "MSFT": 10})]
+    report = DriftScanner().scan(PortfolioAllocator(accounts, model, prices))
+    assert report.flagged_accounts() == ["A1"]
+    assert report.relative[0, report.symbols.index("MSFT")] == float("inf")
+
+
+def test_invalid_band():
+    with pytest.raises(ValueError):
+        DriftBand(absolute=-0.1)
+    with pytest.raises(ValueError):
+        DriftBand(relative=-0.1)
+
+
+# ---------------------------------------------------------------------------
+# 🌊 Streaming
+# ---------------------------------------------------------------------------
+
+def test_iter_flagged_chunks_across_allocators(model, prices):
+    def book(prefix, n):
+        accounts = [
+            Account(label=prefix, account_number=f"{prefix}{i}", cash=0,
+                    positions={"AAPL": 6 if i % 2 else 5, "GOOG": 4 if i % 2 else 5})
+            for i in range(n)
+        ]
+        return PortfolioAllocator(accounts, model, prices)
+
+    chunks = list(DriftScanner().iter_flagged([book("X", 6), book("Y", 5)], chunk_size=2))
+    assert chunks == [["X1", "X3"], ["X5", "Y1"], ["Y3"]]
+
+
+def test_iter_flagged_rejects_bad_chunk_size(allocator):
+    with pytest.raises(ValueError):
+        list(DriftScanner().iter_flagged([allocator], chunk_size=0))
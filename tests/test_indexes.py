@@ -0,0 +1,184 @@
+import pytest
+from hypothesis import given, strategies as st
+
+from realloc import (
+    Account,
+    PortfolioStateManager,
+    Trade,
+    TaxAwareSelector,
+    select_account_for_buy_trade,
+    select_account_for_sell_trade,
+)
+from realloc.indexes import CashIndex, PositionIndex
+
+
+@pytest.fixture
+def accounts():
+    return [
+        Account("A", "A001", 1000, {"AAPL": 5, "GOOG": 0}),
+        Account("B", "A002", 2000, {"AAPL": 20}),
+        Account("C", "A003", 500, {"AAPL": 5, "MSFT": 3}),
+    ]
+
+
+# --------------------------------------------------------
+# 🔥 PositionIndex
+# --------------------------------------------------------
+
+
+def test_holders_largest_first(accounts):
+    index = PositionIndex(accounts)
+    assert list(index.holders("AAPL")) == [("A002", 20), ("A001", 5), ("A003", 5)]
+    assert list(index.holders("GOOG")) == []
+
+
+def test_largest_holder_at_most(accounts):
+    index = PositionIndex(accounts)
+    assert index.largest_holder("AAPL") == "A002"
+    assert index.largest_holder("AAPL", at_most=10) == "A001"
+    assert index.largest_holder("AAPL", at_most=4) is None
+    assert index.largest_holder("TSLA") is None
+
+
+def test_first_holder_skips_zero_positions(accounts):
+    index = PositionIndex(accounts)
+    assert index.first_holder("AAPL") == "A001"
+    assert index.first_holder("GOOG") is None
+    assert index.first_holder("MSFT") == "A003"
+
+
+def test_update_moves_account(accounts):
+    index = PositionIndex(accounts)
+    index.update("A001", "AAPL", 5, 0)
+    index.update("A003", "GOOG", None, 7)
+
+    assert index.first_holder("AAPL") == "A002"
+    assert list(index.holders("AAPL")) == [("A002", 20), ("A003", 5)]
+    assert index.largest_holder("GOOG") == "A003"
+
+
+def test_state_manager_keeps_index_current(accounts):
+    tam = PortfolioStateManager(accounts, {"AAPL": 100, "GOOG": 50, "MSFT": 10})
+    tam.update([Trade("A002", "AAPL", -18), Trade("A001", "GOOG", 4)])
+
+    assert tam.position_index.largest_holder("AAPL") == "A001"
+    assert tam.position_index.largest_holder("GOOG") == "A001"
+
+
+# --------------------------------------------------------
+# 💵 CashIndex
+# --------------------------------------------------------
+
+
+def test_cash_index_prefers_largest_holder_that_can_fill(accounts):
+    index = CashIndex(accounts, {"A001": 1000, "A002": 2000, "A003": 500})
+    assert index.select_for_buy("AAPL", 5, 100) == "A002"
+    assert index.select_for_buy("AAPL", 15, 100) == "A002"
+    assert index.select_for_buy("MSFT", 8, 50) == "A003"
+
+
+def test_cash_index_falls_back_to_first_nonholder(accounts):
+    index = CashIndex(accounts, {"A001": 1000, "A002": 2000, "A003": 0})
+    assert index.select_for_buy("MSFT", 5, 100) == "A001"
+    assert index.select_for_buy("MSFT", 15, 100) == "A002"
+    assert index.select_for_buy("MSFT", 1, 5000) is None
+
+
+def test_cash_index_tracks_cash_and_holdings(accounts):
+    index = CashIndex(accounts, {"A001": 1000, "A002": 2000, "A003": 500})
+    index.set_cash("A002", 0)
+    index.add_holding("A003", "TSLA")
+
+    assert index.select_for_buy("AAPL", 50, 100) == "A001"
+    assert index.select_for_buy("TSLA", 1, 100) == "A003"
+
+
+def test_state_manager_keeps_cash_index_current(accounts):
+    tam = PortfolioStateManager(accounts, {"AAPL": 100, "GOOG": 50, "MSFT": 10})
+    tam.update([Trade("A002", "AAPL", 20)])
+    tam.adjust_cash("A003", 5000)
+
+    assert tam.cash_index.select_for_buy("MSFT", 100, 10) == "A003"
+    assert tam.cash_index.select_for_buy("TSLA", 5, 100) == "A001"
+
+
+# --------------------------------------------------------
+# ✨ Indexed selectors agree with list-based selectors
+# --------------------------------------------------------
+
+SYMBOLS = ["AAPL", "GOOG", "MSFT"]
+
+
+@given(
+    positions=st.lists(
+        st.dictionaries(st.sampled_from(SYMBOLS), st.integers(min_value=0, max_value=30)),
+        min_size=1,
+        max_size=6,
+    ),
+    trades=st.lists(
+        st.tuples(
+            st.integers(min_value=0, max_value=5),
+            st.sampled_from(SYMBOLS),
+            st.integers(min_value=-10, max_value=10),
+        ),
+        max_size=15,
+    ),
+    deferred=st.sets(st.integers(min_value=0, max_value=5)),
+    symbol=st.sampled_from(SYMBOLS),
+    trade_amount=st.integers(min_value=1, max_value=40),
+)
+def test_indexed_sell_selection_matches_scan(positions, trades, deferred, symbol, trade_amount):
+    accounts = [
+        Account(f"Acct{i}", f"A{i}", 1000, dict(held)) for i, held in enumerate(positions)
+    ]
+    tam = PortfolioStateManager(accounts, {sym: 10 for sym in SYMBOLS})
+    for idx, sym, qty in trades:
+        if idx < len(accounts):
+            tam.update([Trade(f"A{idx}", sym, qty)])
+
+    assert select_account_for_sell_trade(
+        symbol, trade_amount, accounts, position_index=tam.position_index
+    ) == select_account_for_sell_trade(symbol, trade_amount, accounts)
+
+    selector = TaxAwareSelector([f"A{i}" for i in deferred])
+    assert selector.select_account_for_sell_trade(
+        symbol, trade_amount, accounts, position_index=tam.position_index
+    ) == selector.select_account_for_sell_trade(symbol, trade_amount, accounts)
+
+
+@given(
+    accounts_data=st.lists(
+        st.tuples(
+            st.floats(min_value=0, max_value=5000),
+            st.dictionaries(st.sampled_from(SYMBOLS), st.integers(min_value=0, max_value=30)),
+        ),
+        min_size=1,
+        max_size=12,
+    ),
+    trades=st.lists(
+        st.tuples(
+            st.integers(min_value=0, max_value=11),
+            st.sampled_from(SYMBOLS + ["TSLA"]),
+            st.integers(min_value=-10, max_value=10),
+        ),
+        max_size=15,
+    ),
+    symbol=st.sampled_from(SYMBOLS + ["TSLA"]),
+    trade_amount=st.integers(min_value=1, max_value=40),
+    price=st.floats(min_value=1, max_value=1000),
+)
+def test_indexed_buy_selection_matches_scan(accounts_data, trades, symbol, trade_amount, price):
+    accounts = [
+        Account(f"Acct{i}", f"A{i}", cash, dict(held))
+        for i, (cash, held) in enumerate(accounts_data)
+    ]
+    prices = {sym: 37.5 for sym in SYMBOLS + ["TSLA"]}
+    tam = PortfolioStateManager(accounts, prices)
+    for idx, sym, qty in trades:
+        if idx < len(accounts):
+            tam.update([Trade(f"A{idx}", sym, qty)])
+
+    prices[symbol] = price
+    assert select_account_for_buy_trade(
+        symbol, trade_amount, accounts, prices, tam.cash_matrix, cash_index=tam.cash_index
+    ) == select_account_for_buy_trade(symbol, trade_amount, accounts, prices, tam.cash_matrix)
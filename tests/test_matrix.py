@@ -145,3 +145,112 @@ def test_trade_account_matrix_handles_missing_price_gracefully():
     tam.update([trade])
     assert acc.positions["AAPL"] == 6
     # Cash won't change because price was missing (defaults to 0)
+
+
+# --------------------------------------------------------
+# ⚡ Incremental portfolio trades
+# --------------------------------------------------------
+
+
+def full_recompute(tam, target_shares):
+    combined = {}
+    for account in tam.accounts.values():
+        for sym, qty in account.positions.items():
+            combined[sym] = combined.get(sym, 0.0) + qty
+    trades = compute_portfolio_trades(combined, target_shares)
+    return {sym: qty for sym, qty in trades.items() if abs(qty) > 0}
+
+
+def test_update_maintains_combined_positions(tam):
+    tam.update([Trade("A1", "AAPL", 3), Trade("A2", "AAPL", 1), Trade("A2", "GOOG", -2)])
+    assert tam.combined_positions == {"AAPL": 9, "GOOG": 0}
+
+
+def test_incremental_portfolio_trades_match_full_recompute(sample_accounts, sample_prices):
+    tam = PortfolioStateManager(sample_accounts, sample_prices)
+    target_shares = {"AAPL": 12.5, "GOOG": 1.2, "MSFT": 4}
+    tam.update_portfolio_trades(target_shares)
+
+    for trade in [
+        Trade("A1", "AAPL", 4),
+        Trade("A2", "GOOG", -1),
+        Trade("A1", "MSFT", 4),
+        Trade("A2", "AAPL", 3),
+        Trade("A2", "TSLA", 1),
+    ]:
+        tam.update([trade])
+        tam.update_portfolio_trades(target_shares)
+        assert tam.portfolio_trades == full_recompute(tam, target_shares)
+
+
+def test_new_target_triggers_full_recompute(tam):
+    tam.update_portfolio_trades({"AAPL": 10, "GOOG": 2})
+    assert tam.portfolio_trades == {"AAPL": 5}
+
+    tam.update_portfolio_trades({"AAPL": 5, "GOOG": 4})
+    assert tam.portfolio_trades == {"GOOG": 2}
+
+
+def test_assigning_portfolio_trades_resets_incremental_basis(tam):
+    target_shares = {"AAPL": 10, "GOOG": 2}
+    tam.update_portfolio_trades(target_shares)
+    tam.portfolio_trades = {"MSFT": 7}
+
+    tam.update_portfolio_trades(target_shares)
+    assert tam.portfolio_trades == {"AAPL": 5}
+
+
+def test_refresh_picks_up_direct_position_edits(tam, sample_accounts):
+    sample_accounts[0].positions["AAPL"] = 8
+    tam.refresh()
+    assert tam.combined_positions["AAPL"] == 8
+
+
+# --------------------------------------------------------
+# ⚡ Running totals
+# --------------------------------------------------------
+
+
+def full_value(tam):
+    return sum(tam.cash_matrix.values()) + sum(
+        qty * tam.prices[sym]
+        for account in tam.accounts.values()
+        for sym, qty in account.positions.items()
+    )
+
+
+def test_running_totals_follow_updates_and_cash_adjustments(tam):
+    assert tam.total_cash == 1500
+    assert tam.market_value == 5 * 100 + 2 * 200
+
+    tam.update([Trade("A1", "AAPL", 3), Trade("A2", "GOOG", -1)])
+    tam.adjust_cash("A2", 250)
+
+    assert tam.total_cash == sum(tam.cash_matrix.values())
+    assert tam.get_total_portfolio_value() == pytest.approx(full_value(tam))
+
+
+def test_update_prices_revalues_changed_symbols(tam):
+    tam.get_total_portfolio_value()
+    tam.update_prices({"AAPL": 110, "MSFT": 50})
+
+    assert tam.prices["AAPL"] == 110
+    assert tam.market_value == 5 * 110 + 2 * 200
+    with pytest.raises(ValueError):
+        tam.update_prices({"AAPL": 0})
+
+
+def test_reassigning_prices_triggers_revaluation(tam):
+    tam.get_total_portfolio_value()
+    tam.prices = {"AAPL": 1, "GOOG": 1}
+    assert tam.market_value == 7
+
+
+def test_market_value_requires_prices_for_held_symbols():
+    acc = Account("Test", "001", 1000.0, {"AAPL": 5})
+    tam = PortfolioStateManager([acc], {})
+    with pytest.raises(KeyError):
+        tam.get_total_portfolio_value()
+
+    tam.update_prices({"AAPL": 10})
+    assert tam.get_total_portfolio_value() == 1050
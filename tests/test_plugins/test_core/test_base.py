@@ -7,6 +7,14 @@ from realloc.trades import TradeInfo
 from realloc.plugins.core.engine import PluginEngine, ValidationEngine
 from realloc.plugins.core.base import Exporter
 from realloc.plugins.exporters.csv_exporter import CSVExporter
+from realloc.plugins.core.registry import plugin_registry
+
+
+@pytest.fixture
+def fresh_registry():
+    plugin_registry.refresh()
+    yield plugin_registry
+    plugin_registry.refresh()
 
 
 class SimpleValidator(TradeValidator):
@@ -67,7 +75,7 @@ def test_load_export_plugin_nonexistent():
     assert "No plugin named 'nonexistent' found" in str(exc_info.value)
 
 
-def test_load_export_plugin_invalid(monkeypatch):
+def test_load_export_plugin_invalid(monkeypatch, fresh_registry):
     def mock_entry_points():
         class MockEntryPoint:
             def __init__(self):
@@ -77,8 +85,8 @@ def test_load_export_plugin_invalid(monkeypatch):
                 return type("InvalidPlugin", (), {})
 
         class MockEntryPoints(dict):
-            def select(self, group, name):
-                if name == "invalid":
+            def select(self, group, name=None):
+                if name in (None, "invalid"):
                     return [MockEntryPoint()]
                 return []
 
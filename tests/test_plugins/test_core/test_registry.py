@@ -0,0 +1,66 @@
+import importlib.metadata
+
+import pytest
+
+from realloc.plugins.core.discovery import get_plugin, get_plugin_list
+from realloc.plugins.core.registry import PluginRegistry
+from realloc.plugins.exporters.csv_exporter import CSVExporter
+from realloc.plugins.rebalancers.default_rebalancer import DefaultRebalancer
+
+
+@pytest.fixture
+def counting_entry_points(monkeypatch):
+    calls = []
+    real_entry_points = importlib.metadata.entry_points
+
+    def entry_points():
+        calls.append(1)
+        return real_entry_points()
+
+    monkeypatch.setattr(importlib.metadata, "entry_points", entry_points)
+    return calls
+
+
+def test_scans_entry_points_once(counting_entry_points):
+    registry = PluginRegistry()
+
+    assert registry.load("csv") is CSVExporter
+    assert registry.load("default") is DefaultRebalancer
+    registry.names()
+    registry.get_entry_point("max_position")
+
+    assert len(counting_entry_points) == 1
+
+
+def test_refresh_rescans(counting_entry_points):
+    registry = PluginRegistry()
+    registry.names()
+    registry.refresh()
+    registry.names()
+
+    assert len(counting_entry_points) == 2
+
+
+def test_names_by_type():
+    registry = PluginRegistry()
+
+    assert "csv" in registry.names("exporters")
+    assert {"default", "vectorized"} <= set(registry.names("rebalancers"))
+    assert {"max_position", "minimum_value"} <= set(registry.names("validators"))
+    assert {"csv_account", "price_csv", "allocation_csv"} <= set(registry.names("importers"))
+
+
+def test_unknown_plugin():
+    registry = PluginRegistry()
+    with pytest.raises(ValueError, match="No plugin named 'missing' found"):
+        registry.load("missing")
+
+
+def test_discovery_uses_registry(capsys):
+    plugins = get_plugin_list()
+
+    assert "csv" in plugins["exporters"]
+    assert get_plugin("default") is DefaultRebalancer
+    assert capsys.readouterr().out == ""
+    with pytest.raises(ValueError, match="Plugin missing not found"):
+        get_plugin("missing")
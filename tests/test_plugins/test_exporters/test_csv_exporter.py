@@ -2,7 +2,7 @@ import pytest
 import csv
 import os
 
-from realloc import Trade
+from realloc import Trade, TradeBuffer
 from realloc.plugins.exporters.csv_exporter import CSVExporter
 
 
@@ -70,4 +70,16 @@ def test_csv_exporter_invalid_path(tmp_path):
     exporter = CSVExporter(invalid_path)
 
     with pytest.raises(FileNotFoundError):
-        exporter.export([{'account': 'account1', 'symbol': 'AAPL', 'shares': 100}])
\ No newline at end of file
+        exporter.export([{'account': 'account1', 'symbol': 'AAPL', 'shares': 100}])
+
+def test_csv_export_trade_buffer(temp_csv_path, sample_data):
+    trades = [Trade.from_dict(single_trade) for single_trade in sample_data]
+    CSVExporter(temp_csv_path).export(TradeBuffer(trades))
+
+    with open(temp_csv_path, 'r', newline='') as f:
+        rows = list(csv.reader(f))
+
+    assert rows[1:] == [
+        ["account1", "AAPL", "100"],
+        ["account2", "MSFT", "-50"]
+    ]
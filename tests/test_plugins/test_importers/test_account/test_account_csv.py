@@ -84,4 +84,66 @@ IRA,CASH,1000.50'''
     csv_file.write_text(content)
 
     with pytest.raises(ValueError, match="Missing required columns"):
-        importer.account_importer(csv_file)
\ No newline at end of file
+        importer.account_importer(csv_file)
+
+def test_importer_dicts_in_file_order(importer, sample_csv):
+    accounts = importer.account_importer(sample_csv, return_dicts=True)
+
+    assert [acc["account_number"] for acc in accounts] == ["E123", "T456"]
+    assert accounts[0]["cash"] == 1000.50
+    assert accounts[1]["positions"] == {"AAA": 10, "DDD": 25}
+
+
+def test_importer_unsorted_rows(importer, tmp_path):
+    content = '''Account Label,Account Id,Symbol,Shares
+IRA,E123,AAA,45
+Taxable,T456,CASH,2500.75
+IRA,E123,CASH,1000.50
+Taxable,T456,AAA,10'''
+    csv_file = tmp_path / "accounts.csv"
+    csv_file.write_text(content)
+
+    accounts = importer.account_importer(csv_file)
+
+    assert [(acc.account_number, acc.cash) for acc in accounts] == [
+        ("E123", 1000.50), ("T456", 2500.75)
+    ]
+    assert accounts[0].positions == {"AAA": 45}
+
+
+def test_iter_accounts_streams_grouped_file(importer, sample_csv):
+    stream = importer.iter_accounts(sample_csv)
+
+    first = next(stream)
+    assert isinstance(first, Account)
+    assert first.account_number == "E123"
+    assert first.cash == 1000.50
+    assert first.positions == {"AAA": 45, "BBB": 6.6}
+
+    rest = list(stream)
+    assert [acc.account_number for acc in rest] == ["T456"]
+
+
+def test_iter_accounts_rejects_interleaved_rows(importer, tmp_path):
+    content = '''Account Label,Account Id,Symbol,Shares
+IRA,E123,CASH,1000.50
+Taxable,T456,CASH,2500.75
+IRA,E123,AAA,45'''
+    csv_file = tmp_path / "accounts.csv"
+    csv_file.write_text(content)
+
+    with pytest.raises(ValueError, match="not contiguous"):
+        list(importer.iter_accounts(csv_file))
+
+
+def test_iter_accounts_missing_cash(importer, tmp_path):
+    content = '''Account Label,Account Id,Symbol,Shares
+IRA,E123,CASH,1000.50
+Taxable,T456,AAA,10'''
+    csv_file = tmp_path / "accounts.csv"
+    csv_file.write_text(content)
+
+    stream = importer.iter_accounts(csv_file)
+    assert next(stream).account_number == "E123"
+    with pytest.raises(ValueError, match="missing required CASH position: T456"):
+        next(stream)
@@ -108,4 +108,68 @@ AAPL,150.50'''
     csv_file.write_text(content)
 
     with pytest.raises(ValueError, match="Missing required columns"):
-        importer.import_prices(csv_file, date=datetime(2025, 8, 24))
\ No newline at end of file
+        importer.import_prices(csv_file, date=datetime(2025, 8, 24))
+
+
+def test_dated_imports_reuse_history(importer, tmp_path):
+    content = '''Symbol,Price,Date
+AAPL,150.50,2025-08-24
+AAPL,151.50,2025-08-25'''
+    csv_file = tmp_path / "prices.csv"
+    csv_file.write_text(content)
+
+    assert importer.import_prices(csv_file, date=datetime(2025, 8, 24)) == {"AAPL": 150.50}
+    history = importer.history(csv_file)
+    assert importer.import_prices(csv_file, date=datetime(2025, 8, 25)) == {"AAPL": 151.50}
+    assert importer.history(csv_file) is history
+
+
+def test_history_reloads_when_file_changes(importer, tmp_path):
+    csv_file = tmp_path / "prices.csv"
+    csv_file.write_text("Symbol,Price,Date\nAAPL,150.50,2025-08-24")
+    importer.import_prices(csv_file, date=datetime(2025, 8, 24))
+
+    csv_file.write_text("Symbol,Price,Date\nAAPL,150.50,2025-08-24\nAAPL,160.00,2025-08-25")
+
+    assert importer.import_prices(csv_file, date=datetime(2025, 8, 25)) == {"AAPL": 160.00}
+
+
+def test_dated_import_includes_undated_rows(importer, tmp_path):
+    content = '''Symbol,Price,Date
+CASH,1.00,
+AAPL,150.50,2025-08-24
+AAPL,151.50,2025-08-25
+AAPL,149.00,'''
+    csv_file = tmp_path / "prices.csv"
+    csv_file.write_text(content)
+
+    # Undated rows apply to every date; the later row in the file wins
+    assert importer.import_prices(csv_file, date=datetime(2025, 8, 24)) == {
+        "CASH": 1.00, "AAPL": 149.00
+    }
+    assert importer.import_prices(csv_file, date=datetime(2025, 8, 26)) == {
+        "CASH": 1.00, "AAPL": 149.00
+    }
+
+
+def test_invalid_price_only_fails_its_own_date(importer, tmp_path):
+    content = '''Symbol,Price,Date
+AAPL,150.50,2025-08-24
+AAPL,invalid,2025-08-25'''
+    csv_file = tmp_path / "prices.csv"
+    csv_file.write_text(content)
+
+    assert importer.import_prices(csv_file, date=datetime(2025, 8, 24)) == {"AAPL": 150.50}
+    with pytest.raises(ValueError, match="Invalid price for AAPL: invalid"):
+        importer.import_prices(csv_file, date=datetime(2025, 8, 25))
+
+
+def test_dated_import_accepts_unpadded_dates(importer, tmp_path):
+    content = '''Symbol,Price,Date
+AAPL,150.50,2025-08-24
+AAPL,151.50,2025-8-25'''
+    csv_file = tmp_path / "prices.csv"
+    csv_file.write_text(content)
+
+    assert importer.import_prices(csv_file, date=datetime(2025, 8, 24)) == {"AAPL": 150.50}
+    assert importer.import_prices(csv_file, date=datetime(2025, 8, 25)) == {"AAPL": 151.50}
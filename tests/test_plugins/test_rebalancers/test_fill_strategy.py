@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from realloc import Account, PortfolioModel, PortfolioStateManager
+from realloc.plugins.core.base import RebalanceStatus, RebalancerPlugin
+from realloc.plugins.rebalancers.default_rebalancer import DefaultRebalancer
+from realloc.portfolio import (
+    calculate_portfolio_positions,
+    calculate_target_shares,
+    compute_portfolio_trades,
+)
+
+
+def build_state(accounts, prices, model):
+    combined, total_cash = calculate_portfolio_positions(accounts)
+    target_shares = calculate_target_shares(combined, total_cash, prices, model)
+    portfolio_trades = compute_portfolio_trades(combined, target_shares, prices)
+    return PortfolioStateManager(accounts, prices, portfolio_trades), target_shares
+
+
+def split_buy_state():
+    # One 10,000-share buy that no single account can afford
+    accounts = [Account(f"Acct{i}", f"A{i}", 25000, {}) for i in range(40)]
+    return build_state(accounts, {"BND": 100}, PortfolioModel("Bonds", {"BND": 1.0}))
+
+
+def random_state(seed):
+    rng = random.Random(seed)
+    symbols = [f"S{i}" for i in range(rng.randint(2, 10))]
+    prices = {sym: round(rng.uniform(5, 500), 2) for sym in symbols}
+    accounts = [
+        Account(f"Acct{i}", f"A{i}", round(rng.uniform(0, 20000), 2),
+                {sym: rng.randint(0, 200) for sym in rng.sample(symbols, rng.randint(0, len(symbols)))})
+        for i in range(rng.randint(1, 10))
+    ]
+    model_symbols = rng.sample(symbols, rng.randint(1, len(symbols)))
+    model = PortfolioModel("Random", {sym: rng.uniform(0.1, 1) for sym in model_symbols})
+    return build_state(accounts, prices, model)
+
+
+def test_exhaust_fills_split_buy_in_one_pass():
+    state, target_shares = split_buy_state()
+    result = DefaultRebalancer(fill_strategy="exhaust").rebalance(state, target_shares, max_iterations=1)
+
+    assert result.status is RebalanceStatus.COMPLETE
+    assert len(result.trades) == 40
+    assert sum(t.shares for t in result.trades) == 10000
+
+
+def test_single_needs_one_pass_per_fill():
+    state, target_shares = split_buy_state()
+    result = DefaultRebalancer().rebalance(state, target_shares, max_iterations=1)
+
+    assert result.status is RebalanceStatus.MAX_ITERATIONS
+    assert len(result.trades) == 1
+
+
+def test_exhaust_starts_with_same_selection_as_single():
+    state, target_shares = random_state(3)
+    single = DefaultRebalancer().execute_rebalance(state, target_shares, 1)
+    state, target_shares = random_state(3)
+    exhaust = DefaultRebalancer(fill_strategy="exhaust").execute_rebalance(state, target_shares, 1)
+    assert exhaust[0] == single[0]
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_exhaust_keeps_accounts_valid(seed):
+    state, target_shares = random_state(seed)
+    starting_cash = dict(state.cash_matrix)
+    starting_positions = {a: dict(acc.positions) for a, acc in state.accounts.items()}
+
+    trades = DefaultRebalancer(fill_strategy="exhaust").execute_rebalance(state, target_shares, 100)
+
+    for account_id, cash in state.cash_matrix.items():
+        assert cash >= -1e-9
+    for account_id, account in state.accounts.items():
+        assert all(qty >= 0 for qty in account.positions.values())
+        for trade in (t for t in trades if t.account_id == account_id):
+            starting_positions[account_id][trade.symbol] = (
+                starting_positions[account_id].get(trade.symbol, 0) + trade.shares
+            )
+            starting_cash[account_id] -= trade.shares * state.prices[trade.symbol]
+        assert {s: q for s, q in starting_positions[account_id].items() if q} == \
+            {s: q for s, q in account.positions.items() if q}
+        assert state.cash_matrix[account_id] == pytest.approx(starting_cash[account_id])
+
+
+def test_load_with_fill_strategy():
+    rebalancer = RebalancerPlugin.load_rebalancer("default", fill_strategy="exhaust")
+    assert rebalancer.fill_strategy == "exhaust"
+
+
+def test_unknown_fill_strategy():
+    with pytest.raises(ValueError):
+        DefaultRebalancer(fill_strategy="greedy")
@@ -0,0 +1,177 @@
+import random
+import time
+
+import pytest
+
+from realloc import Account, PortfolioModel, PortfolioStateManager
+from realloc.bench import generate_portfolio
+from realloc.plugins.core.base import RebalanceStatus, RebalancerPlugin
+from realloc.plugins.rebalancers.default_rebalancer import DefaultRebalancer
+from realloc.plugins.rebalancers.optimal_rebalancer import OptimalRebalancer
+from realloc.portfolio import (
+    calculate_portfolio_positions,
+    calculate_target_shares,
+    compute_portfolio_trades,
+)
+
+try:
+    import scipy  # noqa: F401
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
+requires_scipy = pytest.mark.skipif(not HAS_SCIPY, reason="SciPy not installed")
+
+MODES = [
+    pytest.param({"use_scipy": True}, marks=requires_scipy, id="solver"),
+    pytest.param({"use_scipy": True, "milp_max_variables": 0}, marks=requires_scipy, id="lp"),
+    pytest.param({"use_scipy": False}, id="greedy"),
+]
+
+
+def random_state(seed):
+    rng = random.Random(seed)
+    symbols = [f"S{i}" for i in range(rng.randint(2, 12))]
+    prices = {sym: round(rng.uniform(5, 500), 2) for sym in symbols}
+    accounts = [
+        Account(f"Acct{i}", f"A{i}", round(rng.uniform(0, 20000), 2),
+                {sym: rng.randint(0, 200) for sym in rng.sample(symbols, rng.randint(0, len(symbols)))})
+        for i in range(rng.randint(1, 8))
+    ]
+    model_symbols = rng.sample(symbols, rng.randint(1, len(symbols)))
+    model = PortfolioModel("Random", {sym: rng.uniform(0.1, 1) for sym in model_symbols})
+
+    combined, total_cash = calculate_portfolio_positions(accounts)
+    target_shares = calculate_target_shares(combined, total_cash, prices, model)
+    portfolio_trades = compute_portfolio_trades(combined, target_shares, prices)
+    return PortfolioStateManager(accounts, prices, portfolio_trades), target_shares
+
+
+def stranded_state():
+    # Filling X from A1 (the first account that can afford it) leaves
+    # nobody able to buy Y; the optimal assignment fills both
+    accounts = [Account("One", "A1", 200, {}), Account("Two", "A2", 150, {})]
+    prices = {"X": 150, "Y": 200}
+    target_shares = {"X": 1, "Y": 1}
+    return PortfolioStateManager(accounts, prices, {"X": 1, "Y": 1}), target_shares
+
+
+def test_name():
+    assert OptimalRebalancer().name == "optimal"
+
+
+def test_load_by_name():
+    assert isinstance(RebalancerPlugin.load_rebalancer("optimal"), OptimalRebalancer)
+
+
+@requires_scipy
+def test_fills_what_greedy_strands():
+    state, target_shares = stranded_state()
+    greedy = DefaultRebalancer().rebalance(state, target_shares)
+    assert greedy.portfolio_trades == {"Y": 1}
+
+    state, target_shares = stranded_state()
+    result = OptimalRebalancer().rebalance(state, target_shares)
+
+    assert result.status is RebalanceStatus.COMPLETE
+    assert sorted((t.account_id, t.symbol, t.shares) for t in result.trades) == [
+        ("A1", "Y", 1), ("A2", "X", 1)
+    ]
+    assert state.cash_matrix == {"A1": 0, "A2": 0}
+
+
+@pytest.mark.parametrize("options", MODES[:2])
+def test_solver_does_not_log_to_stdout(options, capfd):
+    state, target_shares = random_state(3)
+    OptimalRebalancer(**options).rebalance(state, target_shares)
+    assert capfd.readouterr().out == ""
+
+
+@pytest.mark.parametrize("options", MODES)
+def test_sells_fund_buys_in_the_same_account(options):
+    accounts = [Account("One", "A1", 0, {"Z": 2})]
+    state = PortfolioStateManager(accounts, {"Z": 100, "X": 200}, {"Z": -2, "X": 1})
+    result = OptimalRebalancer(**options).rebalance(state, {"X": 1, "Z": 0})
+
+    assert result.status is RebalanceStatus.COMPLETE
+    assert [(t.symbol, t.shares) for t in result.trades] == [("Z", -2), ("X", 1)]
+    assert state.cash_matrix["A1"] == 0
+
+
+@pytest.mark.parametrize("options", MODES)
+@pytest.mark.parametrize("seed", range(25))
+def test_random_portfolios_stay_valid(options, seed):
+    state, target_shares = random_state(seed)
+    starting_cash = dict(state.cash_matrix)
+
+    result = OptimalRebalancer(**options).rebalance(state, target_shares)
+
+    assert result.portfolio_trades == state.portfolio_trades
+    for trade in result.trades:
+        assert isinstance(trade.shares, int) and trade.shares != 0
+        starting_cash[trade.account_id] -= trade.shares * state.prices[trade.symbol]
+    for account_id, account in state.accounts.items():
+        assert state.cash_matrix[account_id] == pytest.approx(starting_cash[account_id])
+        assert state.cash_matrix[account_id] >= -1e-6
+        assert all(qty >= 0 for qty in account.positions.values())
+
+
+def unfilled_value(state, trades):
+    return round(sum(abs(qty) * state.prices[sym] for sym, qty in trades.items()), 2)
+
+
+@pytest.mark.parametrize("options", MODES)
+@pytest.mark.parametrize("seed", range(25))
+def test_no_worse_than_default(options, seed):
+    # Never more value left unfilled, and never more trades for the same value
+    state, target_shares = random_state(seed)
+    default = DefaultRebalancer().rebalance(state, target_shares)
+    default_score = (unfilled_value(state, default.portfolio_trades), len(default.trades))
+    state, target_shares = random_state(seed)
+    optimal = OptimalRebalancer(**options).rebalance(state, target_shares)
+
+    assert (unfilled_value(state, optimal.portfolio_trades), len(optimal.trades)) <= default_score
+
+
+@requires_scipy
+@pytest.mark.parametrize("n_accounts, n_symbols, seed", [(20, 50, 0), (30, 60, 1), (50, 100, 3)])
+def test_fewer_trades_than_default(n_accounts, n_symbols, seed):
+    portfolio = generate_portfolio(n_accounts, n_symbols, seed=seed, cash_skew=2.0)
+    results = []
+    for rebalancer in (DefaultRebalancer(), OptimalRebalancer()):
+        accounts = [
+            Account(a.label, a.account_number, a.cash, dict(a.positions))
+            for a in portfolio.accounts
+        ]
+        combined, total_cash = calculate_portfolio_positions(accounts)
+        target_shares = calculate_target_shares(
+            combined, total_cash, portfolio.prices, portfolio.model
+        )
+        state = PortfolioStateManager(
+            accounts, portfolio.prices, compute_portfolio_trades(combined, target_shares)
+        )
+        results.append(rebalancer.rebalance(state, target_shares))
+
+    default, optimal = results
+    assert optimal.status is RebalanceStatus.COMPLETE
+    assert len(optimal.trades) < len(default.trades)
+
+
+def test_status_without_solving():
+    state, target_shares = random_state(1)
+    assert OptimalRebalancer().rebalance(state, target_shares, max_iterations=0).status \
+        is RebalanceStatus.MAX_ITERATIONS
+    result = OptimalRebalancer().rebalance(state, target_shares, deadline=time.monotonic())
+    assert result.status is RebalanceStatus.DEADLINE
+    assert result.trades == []
+
+
+def test_invalid_options():
+    with pytest.raises(ValueError):
+        OptimalRebalancer(holder_bonus=-1)
+    with pytest.raises(ValueError):
+        OptimalRebalancer(max_candidates=-1)
+    with pytest.raises(ValueError):
+        OptimalRebalancer(trade_cost=1)
+    with pytest.raises(ValueError):
+        OptimalRebalancer(solver_time_limit=0)
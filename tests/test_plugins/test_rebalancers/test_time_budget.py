@@ -0,0 +1,114 @@
+import itertools
+import time
+
+import pytest
+
+from realloc import Account, PortfolioModel, PortfolioStateManager
+from realloc.plugins.core.base import RebalanceStatus, RebalancerPlugin
+from realloc.plugins.rebalancers.default_rebalancer import DefaultRebalancer
+from realloc.plugins.rebalancers.vectorized_rebalancer import VectorizedRebalancer
+from realloc.portfolio import (
+    calculate_portfolio_positions,
+    calculate_target_shares,
+    compute_portfolio_trades,
+)
+
+REBALANCERS = [DefaultRebalancer, VectorizedRebalancer]
+
+
+def build_state():
+    accounts = [
+        Account("IRA", "A1", 5000, {"AAPL": 40}),
+        Account("Taxable", "A2", 3000, {"GOOG": 10, "MSFT": 5}),
+        Account("Roth", "A3", 8000, {}),
+    ]
+    prices = {"AAPL": 100, "GOOG": 200, "MSFT": 300, "BND": 50}
+    model = PortfolioModel("Balanced", {"AAPL": 0.3, "GOOG": 0.3, "BND": 0.4})
+    combined, total_cash = calculate_portfolio_positions(accounts)
+    target_shares = calculate_target_shares(combined, total_cash, prices, model)
+    portfolio_trades = compute_portfolio_trades(combined, target_shares, prices)
+    return PortfolioStateManager(accounts, prices, portfolio_trades), target_shares
+
+
+@pytest.mark.parametrize("plugin_class", REBALANCERS)
+def test_rebalance_matches_execute_rebalance(plugin_class):
+    state, target_shares = build_state()
+    expected = plugin_class().execute_rebalance(state, target_shares, 100)
+
+    state, target_shares = build_state()
+    result = plugin_class().rebalance(state, target_shares)
+
+    assert result.trades == expected
+    assert result.portfolio_trades == state.portfolio_trades
+    assert result.status in (RebalanceStatus.COMPLETE, RebalanceStatus.STALLED)
+    assert not result.stopped_early
+
+
+@pytest.mark.parametrize("plugin_class", REBALANCERS)
+def test_expired_deadline_returns_without_trading(plugin_class):
+    state, target_shares = build_state()
+    initial = dict(state.portfolio_trades)
+
+    result = plugin_class().rebalance(state, target_shares, deadline=time.monotonic())
+
+    assert result.status is RebalanceStatus.DEADLINE
+    assert result.stopped_early
+    assert result.trades == []
+    assert result.portfolio_trades == initial
+
+
+@pytest.mark.parametrize("plugin_class", REBALANCERS)
+def test_plugin_time_budget_option(plugin_class):
+    state, target_shares = build_state()
+    plugin = plugin_class(time_budget=0)
+    assert plugin.rebalance(state, target_shares).status is RebalanceStatus.DEADLINE
+    # Plain execute_rebalance honours the plugin budget too
+    state, target_shares = build_state()
+    assert plugin.execute_rebalance(state, target_shares, 100) == []
+
+
+@pytest.mark.parametrize("plugin_class", REBALANCERS)
+def test_deadline_mid_run_keeps_trades_so_far(plugin_class, monkeypatch):
+    state, target_shares = build_state()
+    full = plugin_class().execute_rebalance(state, target_shares, 100)
+    assert len(full) > 2
+
+    # The clock advances one second per check, so the deadline passes after two fills
+    clock = itertools.count()
+    monkeypatch.setattr(time, "monotonic", lambda: next(clock))
+    state, target_shares = build_state()
+    result = plugin_class().rebalance(state, target_shares, time_budget=3)
+
+    assert result.status is RebalanceStatus.DEADLINE
+    assert result.trades == full[:2]
+    assert result.portfolio_trades == state.portfolio_trades
+    assert result.portfolio_trades
+
+
+@pytest.mark.parametrize("plugin_class", REBALANCERS)
+def test_max_iterations_status(plugin_class):
+    state, target_shares = build_state()
+    result = plugin_class().rebalance(state, target_shares, max_iterations=0)
+    assert result.status is RebalanceStatus.MAX_ITERATIONS
+    assert result.stopped_early
+
+
+def test_negative_time_budget():
+    with pytest.raises(ValueError):
+        DefaultRebalancer(time_budget=-1)
+
+
+def test_base_rebalance_wraps_execute_rebalance():
+    class NoopRebalancer(RebalancerPlugin):
+        @property
+        def name(self):
+            return "noop"
+
+        def execute_rebalance(self, portfolio_state, target_shares, max_iterations):
+            return []
+
+    state, target_shares = build_state()
+    result = NoopRebalancer().rebalance(state, target_shares)
+    assert result.trades == []
+    assert result.status is RebalanceStatus.STALLED
+    assert result.portfolio_trades == state.portfolio_trades
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from realloc import Account, PortfolioModel, PortfolioStateManager
+from realloc.plugins.core.base import RebalancerPlugin
+from realloc.plugins.rebalancers.default_rebalancer import DefaultRebalancer
+from realloc.plugins.rebalancers.vectorized_rebalancer import VectorizedRebalancer
+from realloc.portfolio import (
+    calculate_portfolio_positions,
+    calculate_target_shares,
+    compute_portfolio_trades,
+)
+
+
+def build_state(seed: int):
+    rng = random.Random(seed)
+    symbols = [f"S{i}" for i in range(rng.randint(2, 12))]
+    prices = {sym: round(rng.uniform(5, 500), 2) for sym in symbols}
+    accounts = []
+    for i in range(rng.randint(1, 8)):
+        held = rng.sample(symbols, rng.randint(0, len(symbols)))
+        accounts.append(
+            Account(
+                f"Acct{i}",
+                f"A{i}",
+                round(rng.uniform(0, 20000), 2),
+                {sym: rng.randint(0, 200) for sym in held},
+            )
+        )
+    model_symbols = rng.sample(symbols, rng.randint(1, len(symbols)))
+    model = PortfolioModel("Random", {sym: rng.uniform(0.1, 1) for sym in model_symbols})
+
+    combined, total_cash = calculate_portfolio_positions(accounts)
+    target_shares = calculate_target_shares(combined, total_cash, prices, model)
+    portfolio_trades = compute_portfolio_trades(combined, target_shares, prices)
+    return PortfolioStateManager(accounts, prices, portfolio_trades), target_shares
+
+
+def test_name():
+    assert VectorizedRebalancer().name == "vectorized"
+
+
+def test_load_by_name():
+    assert isinstance(RebalancerPlugin.load_rebalancer("vectorized"), VectorizedRebalancer)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_matches_default_rebalancer(seed):
+    default_state, target_shares = build_state(seed)
+    vectorized_state, _ = build_state(seed)
+
+    expected = DefaultRebalancer().execute_rebalance(default_state, target_shares, 20)
+    actual = VectorizedRebalancer().execute_rebalance(vectorized_state, target_shares, 20)
+
+    assert actual == expected
+    assert vectorized_state.cash_matrix == pytest.approx(default_state.cash_matrix)
+    assert vectorized_state.portfolio_trades == default_state.portfolio_trades
+    for account_id, account in default_state.accounts.items():
+        assert vectorized_state.accounts[account_id].positions == account.positions
+
+
+def test_no_trades_leaves_state_untouched():
+    account = Account("IRA", "A1", 100, {"VTI": 0.1})
+    state = PortfolioStateManager([account], {"VTI": 200}, {})
+
+    trades = VectorizedRebalancer().execute_rebalance(state, {"VTI": 0.6}, 10)
+
+    assert trades == []
+    assert account.positions == {"VTI": 0.1}
+    assert state.cash_matrix == {"A1": 100}
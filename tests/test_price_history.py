@@ -0,0 +1,118 @@
+import math
+from datetime import date, datetime
+
+import pytest
+
+from realloc.price_history import PriceHistory
+
+
+@pytest.fixture
+def history_csv(tmp_path):
+    content = '''Symbol,Price,Date
+AAPL,152.00,2025-08-26
+AAPL,150.50,2025-08-24
+GOOG,2750.25,2025-08-24
+AAPL,151.50,2025-08-25
+GOOG,2760.00,2025-08-26
+AAPL,153.00,2025-08-26'''
+    csv_file = tmp_path / "history.csv"
+    csv_file.write_text(content)
+    return csv_file
+
+
+def test_prices_on(history_csv):
+    history = PriceHistory.from_csv(history_csv)
+
+    assert len(history) == 6
+    assert history.prices_on(datetime(2025, 8, 24)) == {"AAPL": 150.50, "GOOG": 2750.25}
+    assert history.prices_on(date(2025, 8, 25)) == {"AAPL": 151.50}
+    assert history.prices_on("2025-08-27") == {}
+
+
+def test_later_row_wins_within_a_day(history_csv):
+    history = PriceHistory.from_csv(history_csv)
+    assert history.prices_on("2025-08-26") == {"AAPL": 153.00, "GOOG": 2760.00}
+
+
+def test_prices_between(history_csv):
+    history = PriceHistory.from_csv(history_csv)
+
+    result = history.prices_between(date(2025, 8, 25), date(2025, 8, 30))
+
+    assert list(result) == [date(2025, 8, 25), date(2025, 8, 26)]
+    assert result[date(2025, 8, 26)]["GOOG"] == 2760.00
+    assert history.prices_between("2024-01-01", "2024-12-31") == {}
+
+
+def test_dates_and_latest(history_csv):
+    history = PriceHistory.from_csv(history_csv)
+
+    assert history.dates == [date(2025, 8, 24), date(2025, 8, 25), date(2025, 8, 26)]
+    assert history.latest() == {"AAPL": 153.00, "GOOG": 2760.00}
+    assert sorted(history.symbols) == ["AAPL", "GOOG"]
+
+
+def test_invalid_date(tmp_path):
+    csv_file = tmp_path / "history.csv"
+    csv_file.write_text("Symbol,Price,Date\nAAPL,150.50,08/24/2025")
+
+    with pytest.raises(ValueError, match="Invalid date: '08/24/2025'"):
+        PriceHistory.from_csv(csv_file)
+
+
+def test_missing_date_column(tmp_path):
+    csv_file = tmp_path / "history.csv"
+    csv_file.write_text("Symbol,Price\nAAPL,150.50")
+
+    with pytest.raises(ValueError, match="Missing required columns"):
+        PriceHistory.from_csv(csv_file)
+
+
+def test_undated_rows_apply_to_every_date(tmp_path):
+    csv_file = tmp_path / "history.csv"
+    csv_file.write_text(
+        "Symbol,Price,Date\nCASH,1.00,\nAAPL,150.50,2025-08-24\n"
+        "GOOG,2750.25,\nGOOG,2760.00,2025-08-24"
+    )
+    history = PriceHistory.from_csv(csv_file)
+
+    assert len(history) == 4
+    assert history.dates == [date(2025, 8, 24)]
+    assert history.prices_on("2025-08-24") == {"CASH": 1.00, "AAPL": 150.50, "GOOG": 2760.00}
+    assert history.prices_on("2025-08-25") == {"CASH": 1.00, "GOOG": 2750.25}
+    assert history.latest() == {"CASH": 1.00, "GOOG": 2760.00, "AAPL": 150.50}
+
+
+def test_invalid_prices_fail_only_the_lookups_using_them(tmp_path):
+    csv_file = tmp_path / "history.csv"
+    csv_file.write_text(
+        "Symbol,Price,Date\nAAPL,150.50,2025-08-24\nAAPL,-1,2025-08-25\nGOOG,bad,2025-08-26"
+    )
+    history = PriceHistory.from_csv(csv_file)
+
+    assert history.prices_on("2025-08-24") == {"AAPL": 150.50}
+    with pytest.raises(ValueError, match="Price must be positive for AAPL"):
+        history.prices_on("2025-08-25")
+    with pytest.raises(ValueError, match="Invalid price for GOOG: bad"):
+        history.prices_between("2025-08-26", "2025-08-30")
+    with pytest.raises(ValueError, match="Price must be positive for AAPL"):
+        history.latest()
+
+
+def test_dates_without_zero_padding(tmp_path):
+    csv_file = tmp_path / "history.csv"
+    csv_file.write_text("Symbol,Price,Date\nAAPL,150.50,2025-08-24\nAAPL,151.50,2025-8-25")
+    history = PriceHistory.from_csv(csv_file)
+
+    assert history.prices_on("2025-08-24") == {"AAPL": 150.50}
+    assert history.prices_on(date(2025, 8, 25)) == {"AAPL": 151.50}
+
+
+def test_nan_prices_are_returned_as_data(tmp_path):
+    csv_file = tmp_path / "history.csv"
+    csv_file.write_text("Symbol,Price,Date\nAAPL,nan,2025-08-24\nGOOG,10.00,2025-08-24")
+    prices = PriceHistory.from_csv(csv_file).prices_on("2025-08-24")
+
+    assert list(prices) == ["AAPL", "GOOG"]
+    assert math.isnan(prices["AAPL"])
+    assert prices["GOOG"] == 10.00
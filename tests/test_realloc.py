@@ -1,6 +1,7 @@
 import pytest
 from realloc import (
     Account,
+    PortfolioStateManager,
     ScaledPortfolio,
     compute_portfolio_trades,
     split_trades,
@@ -261,3 +262,120 @@ def test_parametrized_selector_behavior(accounts, cash, expected):
     prices = {"GOOG": 100}
     result = select_account_for_buy_trade("GOOG", 5, accounts, prices, cash)
     assert result == expected
+
+
+# ------------------------------------------------------------------------------
+# 🔥 Slots and columnar constructors
+# ------------------------------------------------------------------------------
+
+def test_account_and_model_are_slotted(sample_accounts, sample_portfoliomodel):
+    assert not hasattr(sample_accounts[0], "__dict__")
+    assert not hasattr(sample_portfoliomodel, "__dict__")
+    with pytest.raises(AttributeError):
+        sample_accounts[0].nickname = "x"
+
+
+def test_account_from_columns_matches_constructor(sample_accounts):
+    accounts = Account.from_columns(
+        account_numbers=["A001", "A002"],
+        cash=[10000.0, 5000.0],
+        labels=["Taxable", "IRA"],
+        position_accounts=[0, 0, 1, 1],
+        symbols=["AAPL", "GOOG", "AAPL", "MSFT"],
+        shares=[10, 5, 2, 3],
+    )
+    assert [a.to_dict() for a in accounts] == [a.to_dict() for a in sample_accounts]
+
+
+def test_account_from_columns_without_positions():
+    accounts = Account.from_columns(["X", "Y"], [1.0, 2.0])
+    assert [(a.label, a.positions) for a in accounts] == [("X", {}), ("Y", {})]
+
+
+def test_account_from_columns_validates_whole_batch():
+    with pytest.raises(ValueError, match="Negative position for GOOG not allowed in account B"):
+        Account.from_columns(
+            ["A", "B"], [0, 0], position_accounts=[0, 1], symbols=["AAPL", "GOOG"],
+            shares=[1, -1], enforce_no_negative_positions=True,
+        )
+    with pytest.raises(ValueError, match="outside the accounts"):
+        Account.from_columns(["A"], [0], position_accounts=[1], symbols=["AAPL"], shares=[1])
+    with pytest.raises(ValueError, match="same length"):
+        Account.from_columns(["A", "B"], [0])
+
+
+def test_validate_trade_reads_account_minimum_trade_value(sample_accounts):
+    assert sample_accounts[0].minimum_trade_value is None
+    assert Account.from_columns(["X"], [0.0])[0].minimum_trade_value is None
+
+    sample_accounts[0].minimum_trade_value = 50
+    state = PortfolioStateManager(sample_accounts, {"AAPL": 10.0, "GOOG": 20.0, "MSFT": 30.0})
+    state.add_validator("minimum_value")
+    assert state.validate_trade("A001", "AAPL", 10) == (True, "")
+    assert state.validate_trade("A001", "AAPL", 2) == (
+        False, "Trade value $20.00 below minimum $50.00"
+    )
+    # Accounts without a minimum accept any non-zero trade
+    assert state.validate_trade("A002", "AAPL", 1) == (True, "")
+
+
+def test_portfolio_model_from_columns(sample_portfoliomodel):
+    model = PortfolioModel.from_columns("SampleModel", ["AAPL", "GOOG"], [0.6, 0.4])
+    assert model.to_dict() == sample_portfoliomodel.to_dict()
+    with pytest.raises(ValueError, match="short weight for GOOG"):
+        PortfolioModel.from_columns("Bad", ["AAPL", "GOOG"], [1.0, -0.1])
+
+
+# ------------------------------------------------------------------------------
+# 🔥 Cached normalized weights
+# ------------------------------------------------------------------------------
+
+def test_normalized_weights_are_cached_and_read_only(sample_portfoliomodel):
+    normalized = sample_portfoliomodel.normalized
+    assert normalized is sample_portfoliomodel.normalized
+    assert normalized == {"AAPL": 0.6, "GOOG": 0.4}
+    with pytest.raises(TypeError):
+        normalized["AAPL"] = 1.0
+
+    # normalize() still hands out an independent dict
+    copy = sample_portfoliomodel.normalize()
+    copy["AAPL"] = 1.0
+    assert sample_portfoliomodel.normalized["AAPL"] == 0.6
+
+
+@pytest.mark.parametrize(
+    "change, expected",
+    [
+        (lambda m: m.add_target("MSFT", 1.0), {"AAPL": 0.3, "GOOG": 0.2, "MSFT": 0.5}),
+        (lambda m: m.update_target("GOOG", 1.4), {"AAPL": 0.3, "GOOG": 0.7}),
+        (lambda m: m.remove_target("GOOG"), {"AAPL": 1.0}),
+        (lambda m: setattr(m, "targets", {"X": 2.0}), {"X": 1.0}),
+    ],
+)
+def test_normalized_weights_invalidate_on_change(sample_portfoliomodel, change, expected):
+    sample_portfoliomodel.normalized
+    sample_portfoliomodel.normalized_array()
+    change(sample_portfoliomodel)
+
+    assert dict(sample_portfoliomodel.normalized) == pytest.approx(expected)
+    symbols, weights = sample_portfoliomodel.normalized_array()
+    assert dict(zip(symbols, weights.tolist())) == pytest.approx(expected)
+
+
+def test_normalized_array_is_shared_and_read_only(sample_portfoliomodel):
+    symbols, weights = sample_portfoliomodel.normalized_array()
+    assert symbols == ("AAPL", "GOOG")
+    assert sample_portfoliomodel.normalized_array()[1] is weights
+    with pytest.raises(ValueError):
+        weights[0] = 1.0
+
+
+def test_model_with_cached_weights_can_be_copied(sample_portfoliomodel):
+    import copy
+    import pickle
+
+    sample_portfoliomodel.normalized
+    for clone in (copy.deepcopy(sample_portfoliomodel),
+                  pickle.loads(pickle.dumps(sample_portfoliomodel))):
+        assert clone.to_dict() == sample_portfoliomodel.to_dict()
+        assert clone.normalized == sample_portfoliomodel.normalized
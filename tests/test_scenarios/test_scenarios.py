@@ -1,8 +1,10 @@
+import copy
 import json
 from pathlib import Path
 import pytest
-from realloc import Account, PortfolioModel, Trade, PortfolioStateManager
+from realloc import Account, PortfolioModel, Trade, PortfolioStateManager, ArrayPortfolioStateManager
 from realloc.plugins.rebalancers.default_rebalancer import DefaultRebalancer
+from realloc.plugins.rebalancers.vectorized_rebalancer import VectorizedRebalancer
 from realloc.portfolio import (
     calculate_portfolio_positions,
     calculate_target_shares,
@@ -45,7 +47,7 @@ def load_all_json_scenarios() -> list:
     return scenarios
 
 
-def verify_scenario(scenario, rebalancer):
+def verify_scenario(scenario, rebalancer, state_class=PortfolioStateManager):
     """Execute and verify a single scenario"""
     # Calculate initial portfolio state
     combined_positions, total_cash = calculate_portfolio_positions(scenario["accounts"])
@@ -66,7 +68,7 @@ def verify_scenario(scenario, rebalancer):
     )
 
     # Initialize portfolio state manager with calculated trades
-    tam = PortfolioStateManager(
+    tam = state_class(
         scenario["accounts"],
         scenario["prices"],
         portfolio_level_trades
@@ -98,12 +100,23 @@ def verify_scenario(scenario, rebalancer):
             f"expected {expected.shares}, got {matching_trade.shares}"
 
 
+@pytest.mark.parametrize(
+    "state_class",
+    [PortfolioStateManager, ArrayPortfolioStateManager],
+    ids=lambda c: c.__name__
+)
+@pytest.mark.parametrize(
+    "rebalancer_class",
+    [DefaultRebalancer, VectorizedRebalancer],
+    ids=lambda c: c.__name__
+)
 @pytest.mark.parametrize(
     "scenario",
     load_all_json_scenarios(),
     ids=lambda s: s["name"]
 )
-def test_json_scenarios(scenario):
+def test_json_scenarios(scenario, rebalancer_class, state_class):
     """Test scenarios loaded from JSON files"""
-    rebalancer = DefaultRebalancer()
-    verify_scenario(scenario, rebalancer)
\ No newline at end of file
+    rebalancer = rebalancer_class()
+    # Scenarios are loaded once at collection time; rebalancing mutates accounts
+    verify_scenario(copy.deepcopy(scenario), rebalancer, state_class)
\ No newline at end of file
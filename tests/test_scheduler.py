@@ -0,0 +1,79 @@
+from hypothesis import given, strategies as st
+
+from realloc.scheduler import TradeScheduler
+
+
+def sorted_pass(portfolio_trades):
+    return sorted(portfolio_trades.items(), key=lambda item: (item[1] > 0, abs(item[1])))
+
+
+# --------------------------------------------------------
+# 📋 Ordering
+# --------------------------------------------------------
+
+
+def test_sells_first_then_smallest():
+    trades = {"AAPL": 10, "GOOG": -3, "MSFT": 2, "BND": -7, "VTI": 2}
+    assert TradeScheduler(trades).next_pass() == [
+        ("GOOG", -3), ("BND", -7), ("MSFT", 2), ("VTI", 2), ("AAPL", 10)
+    ]
+
+
+def test_refresh_applies_on_next_pass():
+    trades = {"AAPL": 10, "GOOG": 5}
+    scheduler = TradeScheduler(trades)
+    first = scheduler.next_pass()
+
+    trades["AAPL"] = 1
+    scheduler.refresh(trades, ["AAPL"])
+    assert first == [("GOOG", 5), ("AAPL", 10)]
+    assert scheduler.next_pass() == [("AAPL", 1), ("GOOG", 5)]
+
+
+def test_removed_and_readded_symbol_moves_behind_ties():
+    trades = {"AAPL": 5, "GOOG": 5}
+    scheduler = TradeScheduler(trades)
+    del trades["AAPL"]
+    scheduler.refresh(trades, ["AAPL"])
+    trades["AAPL"] = 5
+    scheduler.refresh(trades, ["AAPL"])
+    assert scheduler.next_pass() == sorted_pass(trades) == [("GOOG", 5), ("AAPL", 5)]
+    assert len(scheduler) == 2
+
+
+def test_replaced_mapping_rebuilds():
+    scheduler = TradeScheduler({"AAPL": 5})
+    replacement = {"GOOG": -1, "MSFT": 3}
+    scheduler.refresh(replacement, ["AAPL"])
+    assert scheduler.next_pass() == [("GOOG", -1), ("MSFT", 3)]
+
+
+# --------------------------------------------------------
+# 🔥 Fuzz: Matches a Full Sort Every Pass
+# --------------------------------------------------------
+
+
+symbols = st.sampled_from([f"S{i}" for i in range(8)])
+operations = st.lists(
+    st.tuples(symbols, st.one_of(st.none(), st.integers(min_value=-5, max_value=5))),
+    max_size=40,
+)
+
+
+@given(
+    initial=st.dictionaries(symbols, st.integers(min_value=-5, max_value=5)),
+    passes=st.lists(operations, max_size=6),
+)
+def test_matches_sorted_after_updates(initial, passes):
+    trades = dict(initial)
+    scheduler = TradeScheduler(trades)
+    assert scheduler.next_pass() == sorted_pass(trades)
+
+    for ops in passes:
+        for symbol, qty in ops:
+            if qty is None:
+                trades.pop(symbol, None)
+            else:
+                trades[symbol] = qty
+            scheduler.refresh(trades, [symbol])
+        assert scheduler.next_pass() == sorted_pass(trades)
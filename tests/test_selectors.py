@@ -1,8 +1,11 @@
 import pytest
+from hypothesis import given, strategies as st
 from realloc import (
     Account,
     select_account_for_buy_trade,
     select_account_for_sell_trade,
+    select_accounts_for_trades,
+    PortfolioStateManager,
     TaxAwareSelector,
 )
 
@@ -131,3 +134,138 @@ def test_select_account_for_buy_trade_no_cash(accounts):
 def test_select_account_for_sell_trade_empty_accounts():
     selected = select_account_for_sell_trade("AAPL", 5, [])
     assert selected is None
+
+
+# --------------------------------------------------------
+# 📦 Batch selection
+# --------------------------------------------------------
+
+
+def test_select_accounts_for_trades_splits_across_accounts():
+    accounts = [
+        Account("IRA", "A1", 1000, {"AAPL": 5}),
+        Account("Taxable", "A2", 2000, {"GOOG": 3}),
+    ]
+    state = PortfolioStateManager(accounts, {"AAPL": 100, "GOOG": 200})
+
+    plan = select_accounts_for_trades({"AAPL": 15, "GOOG": 7}, state)
+
+    assert plan == {"GOOG": [("A2", 7)], "AAPL": [("A1", 10), ("A2", 5)]}
+    # Planning does not touch the state
+    assert state.cash_matrix == {"A1": 1000, "A2": 2000}
+    assert accounts[0].positions == {"AAPL": 5}
+
+
+def test_select_accounts_for_trades_uses_sell_proceeds():
+    accounts = [
+        Account("A", "A1", 0, {"AAPL": 10}),
+        Account("B", "A2", 0, {"AAPL": 4}),
+    ]
+    state = PortfolioStateManager(accounts, {"AAPL": 100, "GOOG": 100})
+
+    plan = select_accounts_for_trades({"GOOG": 12, "AAPL": -12}, state)
+
+    assert plan["AAPL"] == [("A1", -10), ("A2", -2)]
+    assert plan["GOOG"] == [("A1", 10), ("A2", 2)]
+
+
+def test_select_accounts_for_trades_reports_partial_fill():
+    accounts = [Account("A", "A1", 250, {})]
+    state = PortfolioStateManager(accounts, {"AAPL": 100, "GOOG": 100})
+
+    plan = select_accounts_for_trades({"AAPL": 5, "GOOG": -3}, state)
+
+    assert plan == {"GOOG": [], "AAPL": [("A1", 2)]}
+
+
+def test_taxawareselector_batch_prefers_taxable_sells(accounts_with_cash_and_positions):
+    selector = TaxAwareSelector(tax_deferred_accounts=["D001", "D002"])
+    state = PortfolioStateManager(
+        accounts_with_cash_and_positions, {"AAPL": 100, "GOOG": 200, "MSFT": 100}
+    )
+
+    plan = selector.select_accounts_for_trades({"AAPL": -22, "MSFT": 30}, state)
+
+    assert plan["AAPL"] == [("T001", -20), ("D001", -2)]
+    assert sum(shares for _, shares in plan["MSFT"]) == 30
+
+
+# --------------------------------------------------------
+# 🧪 Single-pass selectors match the original multi-pass versions
+# --------------------------------------------------------
+
+
+def reference_select_account_for_buy_trade(symbol, trade_amount, accounts, prices, cash_matrix):
+    price = prices[symbol]
+    holder_full = [
+        a for a in accounts
+        if symbol in a.positions and int(cash_matrix[a.account_number] // price) >= trade_amount
+    ]
+    if holder_full:
+        holder_full.sort(key=lambda a: a.positions.get(symbol, 0), reverse=True)
+        return holder_full[0].account_number
+    holder_partials = [
+        (a, int(cash_matrix[a.account_number] // price)) for a in accounts
+        if symbol in a.positions and int(cash_matrix[a.account_number] // price) > 0
+    ]
+    if holder_partials:
+        return max(holder_partials, key=lambda x: x[1])[0].account_number
+    nonholder_full = [
+        a for a in accounts
+        if symbol not in a.positions and int(cash_matrix[a.account_number] // price) >= trade_amount
+    ]
+    if nonholder_full:
+        return nonholder_full[0].account_number
+    nonholder_partials = [
+        (a, int(cash_matrix[a.account_number] // price)) for a in accounts
+        if symbol not in a.positions and int(cash_matrix[a.account_number] // price) > 0
+    ]
+    if nonholder_partials:
+        return max(nonholder_partials, key=lambda x: x[1])[0].account_number
+    return None
+
+
+def reference_select_account_for_sell_trade(symbol, trade_amount, accounts):
+    candidates = [a for a in accounts if symbol in a.positions and a.positions[symbol] > 0]
+    if not candidates:
+        return None
+    full_liquidations = [a for a in candidates if a.positions[symbol] <= trade_amount]
+    if full_liquidations:
+        full_liquidations.sort(key=lambda a: a.positions[symbol], reverse=True)
+        return full_liquidations[0].account_number
+    full_sellers = [a for a in candidates if a.positions[symbol] >= trade_amount]
+    if full_sellers:
+        return full_sellers[0].account_number
+    candidates.sort(key=lambda a: a.positions[symbol], reverse=True)
+    return candidates[0].account_number
+
+
+account_strategy = st.tuples(
+    st.sampled_from([0.0, 99.99, 100.0, 250.0, 1000.0]) | st.floats(min_value=0, max_value=5000),
+    st.dictionaries(
+        st.sampled_from(["AAPL", "GOOG"]),
+        st.sampled_from([-1.0, 0.0, 0.5, 3.0]) | st.integers(min_value=0, max_value=20),
+    ),
+)
+
+
+@given(
+    accounts_data=st.lists(account_strategy, max_size=8),
+    symbol=st.sampled_from(["AAPL", "GOOG"]),
+    trade_amount=st.integers(min_value=0, max_value=25),
+    price=st.sampled_from([50.0, 100.0]) | st.floats(min_value=1, max_value=1000),
+)
+def test_single_pass_selectors_match_reference(accounts_data, symbol, trade_amount, price):
+    accounts = [
+        Account(f"Acct{i}", f"A{i}", cash, positions)
+        for i, (cash, positions) in enumerate(accounts_data)
+    ]
+    cash_matrix = {a.account_number: a.cash for a in accounts}
+    prices = {symbol: price}
+
+    assert select_account_for_buy_trade(
+        symbol, trade_amount, accounts, prices, cash_matrix
+    ) == reference_select_account_for_buy_trade(symbol, trade_amount, accounts, prices, cash_matrix)
+    assert select_account_for_sell_trade(
+        symbol, trade_amount, accounts
+    ) == reference_select_account_for_sell_trade(symbol, trade_amount, accounts)
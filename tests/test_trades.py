@@ -0,0 +1,91 @@
+import pickle
+import sys
+
+import numpy as np
+import pytest
+
+from realloc import Account, PortfolioStateManager, Trade, TradeBuffer
+
+
+@pytest.fixture
+def trades():
+    return [
+        Trade("A1", "AAPL", 10),
+        Trade("A2", "MSFT", -3),
+        Trade("A1", "GOOG", 2.5),
+        Trade("A2", "AAPL", 1),
+    ]
+
+
+# ------------------------------------------------------------------------------
+# 🔥 Trade
+# ------------------------------------------------------------------------------
+
+def test_trade_is_slotted():
+    trade = Trade("A1", "AAPL", 10)
+    assert not hasattr(trade, "__dict__")
+    with pytest.raises(AttributeError):
+        trade.extra = 1
+
+
+def test_trade_round_trips_and_compares_by_value():
+    trade = Trade("A1", "AAPL", 10)
+    assert trade.to_dict() == {"account_id": "A1", "symbol": "AAPL", "shares": 10}
+    assert Trade.from_dict(trade.to_dict()) == trade
+    assert Trade("A1", "AAPL", 10.0) == trade
+    assert Trade("A1", "AAPL", 11) != trade
+    assert pickle.loads(pickle.dumps(trade)) == trade
+
+
+# ------------------------------------------------------------------------------
+# 🔥 TradeBuffer
+# ------------------------------------------------------------------------------
+
+def test_buffer_iterates_back_into_trades(trades):
+    buffer = TradeBuffer(trades)
+    assert len(buffer) == 4
+    assert list(buffer) == trades
+    assert buffer[2] == Trade("A1", "GOOG", 2.5)
+    assert isinstance(buffer[0].shares, int)
+
+
+def test_buffer_serializes_without_trade_objects(trades):
+    buffer = TradeBuffer()
+    for trade in trades:
+        buffer.append(trade.account_id, trade.symbol, trade.shares)
+
+    assert buffer.to_dicts() == [trade.to_dict() for trade in trades]
+    assert list(buffer.rows())[1] == ("A2", "MSFT", -3)
+
+    account_idx, symbol_idx, shares = buffer.to_arrays()
+    assert account_idx.tolist() == [0, 1, 0, 1]
+    assert [buffer.symbols.key(i) for i in symbol_idx] == ["AAPL", "MSFT", "GOOG", "AAPL"]
+    assert shares.tolist() == [10.0, -3.0, 2.5, 1.0]
+
+    # Exported arrays are copies; the buffer keeps growing
+    buffer.append_trade(Trade("A3", "AAPL", 1))
+    assert len(buffer) == 5 and len(shares) == 4
+
+
+def test_buffer_structured_array_feeds_bulk_update(trades):
+    accounts = [Account("IRA", "A1", 5000.0, {}), Account("Taxable", "A2", 5000.0, {"MSFT": 5})]
+    state = PortfolioStateManager(accounts, {"AAPL": 10.0, "MSFT": 20.0, "GOOG": 30.0})
+
+    state.bulk_update(TradeBuffer(trades).to_structured())
+
+    assert accounts[0].positions == {"AAPL": 10, "GOOG": 2.5}
+    assert accounts[1].positions == {"MSFT": 2, "AAPL": 1}
+
+
+def test_buffer_uses_less_memory_than_trade_list():
+    n = 10000
+    buffer = TradeBuffer()
+    trades = []
+    for i in range(n):
+        buffer.append(f"A{i % 10}", f"S{i % 50}", i)
+        trades.append(Trade(f"A{i % 10}", f"S{i % 50}", i))
+
+    buffer_bytes = sum(sys.getsizeof(column) for column in buffer.to_arrays())
+    trade_bytes = sum(sys.getsizeof(trade) for trade in trades) + sys.getsizeof(trades)
+    assert buffer_bytes < trade_bytes / 2
+    assert np.array_equal(buffer.to_arrays()[2], np.arange(n, dtype=float))
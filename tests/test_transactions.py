@@ -0,0 +1,159 @@
+import random
+
+import pytest
+
+from realloc import Account, ArrayPortfolioStateManager, PortfolioStateManager, Trade
+from realloc.bench import generate_portfolio
+
+
+@pytest.fixture(params=[PortfolioStateManager, ArrayPortfolioStateManager], ids=lambda c: c.__name__)
+def state_class(request):
+    return request.param
+
+
+@pytest.fixture
+def state(state_class):
+    accounts = [
+        Account("IRA", "A1", 1000.0, {"AAPL": 5}),
+        Account("Taxable", "A2", 500.0, {"GOOG": 2}),
+    ]
+    return state_class(accounts, {"AAPL": 100.0, "GOOG": 200.0, "MSFT": 50.0}, {"AAPL": 5})
+
+
+def snapshot(state):
+    # Rounded so that replaying inverse deltas compares equal to the original
+    return {
+        "positions": {a.account_number: dict(a.positions) for a in state.accounts.values()},
+        "cash": {k: round(v, 6) for k, v in state.cash_matrix.items()},
+        "trades": dict(state.portfolio_trades),
+        "combined": dict(state.combined_positions),
+        "total_cash": round(state.total_cash, 6),
+        "value": round(state.get_total_portfolio_value(), 6),
+    }
+
+
+def assert_indexes_match_rebuild(state):
+    symbols = set(state.prices) | set(state.combined_positions)
+    holders = {s: list(state.position_index.holders(s)) for s in symbols}
+    buys = {s: state.cash_index.select_for_buy(s, 3, state.prices[s]) for s in state.prices}
+    state.refresh()
+    assert holders == {s: list(state.position_index.holders(s)) for s in symbols}
+    assert buys == {s: state.cash_index.select_for_buy(s, 3, state.prices[s]) for s in state.prices}
+
+
+# ------------------------------------------------------------------------------
+# 🔥 begin / commit / rollback
+# ------------------------------------------------------------------------------
+
+def test_rollback_restores_positions_cash_and_trades(state):
+    before = snapshot(state)
+    target_shares = {"AAPL": 12, "GOOG": 1, "MSFT": 3}
+
+    state.begin()
+    state.update([Trade("A1", "AAPL", 2), Trade("A2", "MSFT", 3), Trade("A2", "GOOG", -1)])
+    state.update_portfolio_trades(target_shares)
+    state.adjust_cash("A1", 50)
+    assert state.in_transaction
+    state.rollback()
+
+    assert not state.in_transaction
+    assert snapshot(state) == before
+    assert "MSFT" not in state.accounts["A2"].positions
+    assert "MSFT" not in state.combined_positions
+    assert_indexes_match_rebuild(state)
+
+
+def test_commit_keeps_changes(state):
+    state.begin()
+    state.update([Trade("A1", "AAPL", 2)])
+    state.commit()
+
+    assert state.accounts["A1"].positions["AAPL"] == 7
+    assert not state.in_transaction
+    with pytest.raises(RuntimeError):
+        state.rollback()
+
+
+def test_nested_savepoints(state):
+    state.begin()
+    state.update([Trade("A1", "AAPL", 1)])
+    state.begin()
+    state.update([Trade("A1", "AAPL", 1)])
+    state.rollback()
+    assert state.accounts["A1"].positions["AAPL"] == 6
+
+    state.rollback()
+    assert state.accounts["A1"].positions["AAPL"] == 5
+
+
+def test_commit_without_begin_raises(state):
+    with pytest.raises(RuntimeError):
+        state.commit()
+
+
+def test_rollback_undoes_failed_update(state_class):
+    account = Account("Test", "A1", 1000.0, {"AAPL": 5}, enforce_no_negative_positions=True)
+    state = state_class([account], {"AAPL": 100.0})
+
+    state.begin()
+    with pytest.raises(ValueError):
+        state.update([Trade("A1", "AAPL", 3), Trade("A1", "AAPL", -20)])
+    state.rollback()
+
+    assert account.positions == {"AAPL": 5}
+    assert state.cash_matrix["A1"] == 1000.0
+
+
+# ------------------------------------------------------------------------------
+# 🔥 Context manager
+# ------------------------------------------------------------------------------
+
+def test_transaction_commits_on_success(state):
+    with state.transaction():
+        state.update([Trade("A1", "AAPL", 1)])
+    assert state.accounts["A1"].positions["AAPL"] == 6
+    assert not state.in_transaction
+
+
+def test_transaction_rolls_back_on_error(state):
+    before = snapshot(state)
+    with pytest.raises(KeyError):
+        with state.transaction():
+            state.update([Trade("A1", "AAPL", 1)])
+            raise KeyError("boom")
+    assert snapshot(state) == before
+
+
+def test_explicit_rollback_inside_transaction(state):
+    before = snapshot(state)
+    with state.transaction():
+        state.update([Trade("A1", "GOOG", 2)])
+        value = state.get_total_portfolio_value()
+        state.rollback()
+    assert value == pytest.approx(before["value"])
+    assert snapshot(state) == before
+    assert not state.in_transaction
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_what_if_rollback(state_class, seed):
+    portfolio = generate_portfolio(8, 12, seed=seed, holder_density=0.3)
+    state = state_class(portfolio.accounts, portfolio.prices)
+    targets = {sym: 50.0 for sym in portfolio.prices}
+    state.update_portfolio_trades(targets)
+    before = snapshot(state)
+
+    rng = random.Random(seed)
+    ids = list(state.accounts)
+    symbols = list(portfolio.prices)
+    with state.transaction():
+        for _ in range(30):
+            state.update([Trade(rng.choice(ids), rng.choice(symbols), rng.randint(-5, 5))])
+            if rng.random() < 0.3:
+                state.update_portfolio_trades(targets)
+            if rng.random() < 0.1:
+                state.adjust_cash(rng.choice(ids), 10.0)
+        state.rollback()
+
+    assert snapshot(state) == before
+    assert_indexes_match_rebuild(state)